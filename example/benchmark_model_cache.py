@@ -0,0 +1,68 @@
+"""Benchmark single-password predictions with per-call loads and the cache
+
+Before the model cache every prediction unpickled the model and the
+preprocessor; now they are loaded once per process and only re-checked
+with a `stat`.
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from src.components.data_transformation import DataTransformation
+from src.utils.file_manager import load_object, save_object
+from src.utils.model_cache import model_cache
+
+ROWS, REQUESTS = 20_000, 200
+
+rng = np.random.default_rng(0)
+alphabet = list("abcdefghijXYZ0123456789!@#$")
+passwords = [
+    "".join(rng.choice(alphabet, rng.integers(4, 20))) for _ in range(ROWS)
+]
+frame = pd.DataFrame({"password": passwords})
+transformer = DataTransformation().get_data_transformer_object(["password"])
+features = transformer.fit_transform(frame)
+model = RandomForestRegressor(n_estimators=100, max_depth=20, n_jobs=-1)
+model.fit(features, frame["password"].str.len() / 20)
+request = pd.DataFrame({"password": ["Tr0ub4dor&3"]})
+
+
+def measure(label, predict):
+    """Run single-password predictions and print their latency."""
+    latencies = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        predict()
+        latencies.append((time.perf_counter() - start) * 1000)
+    print(
+        f"{label:<16} p50 {np.percentile(latencies, 50):8.2f} ms "
+        f"p99 {np.percentile(latencies, 99):8.2f} ms"
+    )
+
+
+with tempfile.TemporaryDirectory() as directory:
+    model_path = os.path.join(directory, "model.pkl")
+    preprocessor_path = os.path.join(directory, "preprocessor.pkl")
+    save_object(model_path, model)
+    save_object(preprocessor_path, transformer)
+    print(f"model.pkl holds {os.path.getsize(model_path) / 2**20:.1f} MiB\n")
+
+    measure(
+        "load per call",
+        lambda: load_object(model_path).predict(
+            load_object(preprocessor_path).transform(request)
+        ),
+    )
+    cache = model_cache()
+    measure(
+        "model cache",
+        lambda: cache.get(model_path).predict(
+            cache.get(preprocessor_path).transform(request)
+        ),
+    )
+    print(f"\n{cache.stats()}")
@@ -0,0 +1,91 @@
+"""Benchmark the columnar MongoDB export against the DataFrame read
+
+The decoding of raw BSON batches is measured on encoded documents in
+memory first, so it runs without a server. The live export is compared
+when the configured MongoDB server is reachable.
+"""
+
+import time
+import tracemalloc
+
+import bson
+import numpy as np
+import pandas as pd
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from src.components.data_pusher import DataPusher
+from src.utils.bson_columns import decode_password_batches
+
+DOCUMENTS, BATCH_SIZE = 1_000_000, 10_000
+
+# Create an instance of the DataPusher class
+data_pusher = DataPusher()
+
+
+def measure(label, func):
+    """Run func once and print its wall time and peak Python allocations."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:8.3f} s {peak / 2**20:10.1f} MiB peak")
+    return result
+
+
+# The batches find_raw_batches returns for a password/strength projection
+rng = np.random.default_rng(0)
+alphabet = list("abcdefghijXYZ0123456789!@#$")
+batches = [
+    b"".join(
+        bson.encode(
+            {
+                "password": "".join(rng.choice(alphabet, rng.integers(4, 16))),
+                "strength": float(rng.random()),
+            }
+        )
+        for _ in range(BATCH_SIZE)
+    )
+    for _ in range(DOCUMENTS // BATCH_SIZE)
+]
+print(f"Decoding {DOCUMENTS} documents in memory\n")
+measure(
+    "bson.decode_all + DataFrame",
+    lambda: pd.DataFrame(
+        [document for batch in batches for document in bson.decode_all(batch)]
+    ),
+)
+measure("decode_password_batches", lambda: decode_password_batches(batches))
+batches.clear()
+
+try:
+    MongoClient(
+        data_pusher.mongodb_config.mongodb_connection_string,
+        serverSelectionTimeoutMS=2000,
+    ).admin.command("ping")
+except PyMongoError as error:
+    print(f"\nSkipping the live export, MongoDB is unreachable: {error}")
+    raise SystemExit(0) from error
+
+print("\nExporting from MongoDB\n")
+
+# Current path: dicts per document, then a DataFrame
+df = measure("get_data_from_mongodb", data_pusher.get_data_from_mongodb)
+
+# Raw BSON batches decoded into a password column and a float32 array
+passwords, strengths = measure(
+    "export_columns_from_mongodb", data_pusher.export_columns_from_mongodb
+)
+
+# Same export, but materialized as a DataFrame at the end
+frame = measure(
+    "export_columns (as_frame)",
+    lambda: data_pusher.export_columns_from_mongodb(as_frame=True),
+)
+
+print(
+    f"\n{len(df)} documents, column holds {passwords.nbytes / 2**20:.1f} MiB"
+)
+print(f"DataFrame holds {df.memory_usage(deep=True).sum() / 2**20:.1f} MiB")
@@ -0,0 +1,91 @@
+"""Benchmark the memory of a parallel search on in-memory and shared arrays
+
+Peak memory is the proportional set size (PSS) of this process and all its
+worker processes, so pages shared between them are counted once. Linux only.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+from sklearn.model_selection import GridSearchCV
+from sklearn.tree import DecisionTreeRegressor
+
+from src.utils.shared_arrays import shared_arrays
+
+ROWS, FEATURES, N_JOBS = 2_000_000, 15, 4
+PARAMS = {"max_depth": [4, 8], "splitter": ["best", "random"]}
+
+
+def tree_pids(pid):
+    """List a process and all its descendants."""
+    pids = [pid]
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children") as file:
+                children = file.read().split()
+        except OSError:
+            continue
+        for child in children:
+            pids.extend(tree_pids(int(child)))
+    return pids
+
+
+def pss_bytes(pid):
+    """Read the proportional set size of one process."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as file:
+            for line in file:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def measure(label, func):
+    """Run func and print its wall time and peak PSS of the process tree."""
+    peak, stopped = [0], threading.Event()
+
+    def sample():
+        while not stopped.wait(0.05):
+            total = sum(pss_bytes(pid) for pid in tree_pids(os.getpid()))
+            peak[0] = max(peak[0], total)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    baseline = sum(pss_bytes(pid) for pid in tree_pids(os.getpid()))
+    sampler.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    stopped.set()
+    sampler.join()
+    print(
+        f"{label:<24} {elapsed:8.3f} s {baseline / 2**20:10.1f} MiB before "
+        f"{peak[0] / 2**20:10.1f} MiB peak"
+    )
+
+
+def search(X, y):
+    """Run the grid search of one model on the given arrays."""
+    GridSearchCV(DecisionTreeRegressor(), PARAMS, cv=3, n_jobs=N_JOBS).fit(
+        X, y
+    )
+
+
+rng = np.random.default_rng(0)
+X = rng.integers(0, 20, size=(ROWS, FEATURES)).astype(np.float64)
+y = X[:, :3].sum(axis=1) / 60
+print(f"{ROWS} rows, features hold {X.nbytes / 2**20:.1f} MiB\n")
+
+# Every worker is shipped the arrays, which joblib dumps once per search
+measure("in-memory arrays", lambda: search(X, y))
+
+# Workers attach to one memory-mapped copy, written once for all searches
+with shared_arrays(X, y) as (X_shared, y_shared):
+    measure("shared float64 arrays", lambda: search(X_shared, y_shared))
+
+# As the trainer shares them, with the features cast to float32
+with shared_arrays(X, y, dtypes=(np.float32, None)) as (X_shared, y_shared):
+    measure("shared float32 arrays", lambda: search(X_shared, y_shared))
@@ -1,6 +1,7 @@
 """This module defines a FastAPI endpoint for predicting the strength of a given
 password using a trained machine learning model and a data pipeline."""
 
+import secrets
 import sys
 
 from fastapi import HTTPException
@@ -10,6 +11,9 @@ from src.api.schema import (
     GenerateResponse,
     PredictionRequest,
     PredictionResponse,
+    RegistryStats,
+    RetrainRequest,
+    RetrainStatus,
 )
 from src.api.utils import (
     calc_class_strength,
@@ -19,8 +23,11 @@ from src.api.utils import (
     entropy_to_crack_time,
     generate_password,
 )
+from src.api.utils.model_registry import model_registry
+from src.interface.config import RetrainConfig
 from src.middleware.exception import CustomException
 from src.middleware.logger import logger
+from src.pipe.retrain import retrain_status, retrain_supported, start_retrain
 from src.utils.data_validation import is_valid_password
 
 
@@ -70,7 +77,7 @@ def password_strength_component(
                 "allowed.",
             )
 
-        strength = calc_strength(password)
+        strength = calc_strength(password, shadow=True)
         class_strength = calc_class_strength(strength)
         entropy = calc_entropy(password)
         crack_time = entropy_to_crack_time(entropy)
@@ -147,3 +154,99 @@ def generate_strong_password(
     except CustomException as error:
         logger.error(error, sys)
         raise HTTPException(status_code=500, detail=error) from error
+
+
+def check_admin_token(token: str) -> None:
+    """Check the admin token of a request.
+
+    Args:
+        token (str): The token sent with the request.
+
+    Raises:
+        HTTPException: If the admin endpoints are disabled or the token
+        does not match.
+    """
+    admin_token = RetrainConfig().admin_token
+    if not admin_token:
+        logger.error("403 Forbidden: Admin endpoints are disabled")
+        raise HTTPException(
+            status_code=403, detail="Admin endpoints are disabled"
+        )
+    if not secrets.compare_digest(token.encode(), admin_token.encode()):
+        logger.error("401 Unauthorized: Invalid admin token")
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def retrain_component(request: RetrainRequest, token: str) -> RetrainStatus:
+    """Start retraining the model in the background.
+
+    Args:
+        request (RetrainRequest): The request with the optional run id.
+        token (str): The admin token sent with the request.
+
+    Returns:
+        RetrainStatus: The status of the started retrain.
+
+    Raises:
+        HTTPException: If the token is invalid, retraining is not
+        available on this system, a retrain is already running or any
+        other custom exception occurs.
+    """
+    check_admin_token(token)
+    if not retrain_supported():
+        logger.error("501 Not Implemented: Retraining needs a POSIX system")
+        raise HTTPException(
+            status_code=501, detail="Retraining needs a POSIX system"
+        )
+    try:
+        logger.info("Called retrain function")
+        started, status = start_retrain(request.run_id)
+        if not started:
+            logger.error("409 Conflict: A retrain is already running")
+            raise HTTPException(
+                status_code=409,
+                detail=f"A retrain is already running: {status}",
+            )
+        logger.info("202 Accepted: Done retrain function")
+        return RetrainStatus(**status)
+    except CustomException as error:
+        logger.error(error, sys)
+        raise HTTPException(status_code=500, detail=error) from error
+
+
+def retrain_status_component(token: str) -> RetrainStatus:
+    """Get the status of the last background retrain.
+
+    Args:
+        token (str): The admin token sent with the request.
+
+    Returns:
+        RetrainStatus: The status of the last retrain.
+
+    Raises:
+        HTTPException: If the token is invalid or any other custom
+        exception occurs.
+    """
+    check_admin_token(token)
+    try:
+        return RetrainStatus(**retrain_status())
+    except CustomException as error:
+        logger.error(error, sys)
+        raise HTTPException(status_code=500, detail=error) from error
+
+
+def model_stats_component(token: str) -> RegistryStats:
+    """Get the model versions of this server process and their statistics.
+
+    Args:
+        token (str): The admin token sent with the request.
+
+    Returns:
+        RegistryStats: The primary and candidate versions and the request,
+        latency and agreement statistics of every version.
+
+    Raises:
+        HTTPException: If the token is invalid.
+    """
+    check_admin_token(token)
+    return RegistryStats(**model_registry().summary())
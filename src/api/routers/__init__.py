@@ -1,14 +1,23 @@
 """This module defines a FastAPI router for predicting password strength based
 on a given password."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header
 
-from src.api.components import generate_strong_password, password_strength_component
+from src.api.components import (
+    generate_strong_password,
+    model_stats_component,
+    password_strength_component,
+    retrain_component,
+    retrain_status_component,
+)
 from src.api.schema import (
     GenerateRequest,
     GenerateResponse,
     PredictionRequest,
     PredictionResponse,
+    RegistryStats,
+    RetrainRequest,
+    RetrainStatus,
 )
 
 router = APIRouter()
@@ -58,3 +67,71 @@ async def generate_password(
         its strength prediction and other parameters.
     """
     return generate_strong_password(request)
+
+
+@router.post(
+    "/admin/retrain",
+    summary="Retrain the model",
+    description="Retrain the model in a background process and swap it in "
+    "once published. Requires the X-Admin-Token header.",
+    tags=["Admin"],
+    status_code=202,
+    response_model=RetrainStatus,
+)  # type: ignore
+def retrain(
+    request: RetrainRequest, x_admin_token: str = Header("")
+) -> RetrainStatus:
+    """
+    Start retraining the model in the background.
+
+    Args:
+        request (RetrainRequest): The request with the optional run id.
+        x_admin_token (str): The admin token header.
+
+    Returns:
+        RetrainStatus: The status of the started retrain.
+    """
+    return retrain_component(request, x_admin_token)
+
+
+@router.get(
+    "/admin/retrain",
+    summary="Retrain status",
+    description="Get the status of the last background retrain. Requires "
+    "the X-Admin-Token header.",
+    tags=["Admin"],
+    response_model=RetrainStatus,
+)  # type: ignore
+def retrain_status(x_admin_token: str = Header("")) -> RetrainStatus:
+    """
+    Get the status of the last background retrain.
+
+    Args:
+        x_admin_token (str): The admin token header.
+
+    Returns:
+        RetrainStatus: The status of the last retrain.
+    """
+    return retrain_status_component(x_admin_token)
+
+
+@router.get(
+    "/admin/models",
+    summary="Model statistics",
+    description="Get the primary and shadow model versions of the server "
+    "process and their request, latency and agreement statistics. Requires "
+    "the X-Admin-Token header.",
+    tags=["Admin"],
+    response_model=RegistryStats,
+)  # type: ignore
+def model_stats(x_admin_token: str = Header("")) -> RegistryStats:
+    """
+    Get the model versions of the server process and their statistics.
+
+    Args:
+        x_admin_token (str): The admin token header.
+
+    Returns:
+        RegistryStats: The model versions and their statistics.
+    """
+    return model_stats_component(x_admin_token)
@@ -1,5 +1,7 @@
 """This module defines classes for password strength prediction and generation
 requests and responses using Pydantic models."""
+from typing import Dict, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -75,3 +77,105 @@ class GenerateResponse(BaseModel):  # type: ignore
     crack_time: str = Field(
         ..., description="The time taken to crack the password"
     )
+
+
+class RetrainRequest(BaseModel):  # type: ignore
+    """A request model for a background retrain.
+
+    Args:
+        BaseModel (type): The Pydantic BaseModel class.
+    """
+
+    run_id: Optional[str] = Field(
+        None, description="Resume or checkpoint the run with this identifier"
+    )
+
+
+class RetrainStatus(BaseModel):  # type: ignore
+    """A response model for the status of a background retrain.
+
+    Args:
+        BaseModel (type): The Pydantic BaseModel class.
+    """
+
+    state: str = Field(
+        ...,
+        description="idle, running, succeeded or failed",
+    )
+    pid: Optional[int] = Field(None, description="The retrain process id")
+    run_id: Optional[str] = Field(None, description="The run identifier")
+    started: Optional[float] = Field(
+        None, description="The start time as a Unix timestamp"
+    )
+    finished: Optional[float] = Field(
+        None, description="The finish time as a Unix timestamp"
+    )
+    version: Optional[str] = Field(
+        None, description="The published model bundle version"
+    )
+    error: Optional[str] = Field(None, description="The error of a failure")
+
+
+class VersionStats(BaseModel):  # type: ignore
+    """A response model for the serving statistics of a model version.
+
+    Args:
+        BaseModel (type): The Pydantic BaseModel class.
+    """
+
+    requests: int = Field(..., description="The requests served or shadowed")
+    errors: int = Field(..., description="The failed requests")
+    p50_ms: Optional[float] = Field(
+        None, description="The median prediction latency in ms"
+    )
+    p99_ms: Optional[float] = Field(
+        None, description="The 99th percentile prediction latency in ms"
+    )
+    compared: int = Field(
+        ..., description="The shadow predictions compared with the primary"
+    )
+    agreement: Optional[float] = Field(
+        None, description="The share of shadow predictions agreeing"
+    )
+    mean_abs_diff: Optional[float] = Field(
+        None, description="The mean absolute difference to the primary"
+    )
+
+
+class ArtifactStats(BaseModel):  # type: ignore
+    """A response model for the loads of a cached model artifact.
+
+    Args:
+        BaseModel (type): The Pydantic BaseModel class.
+    """
+
+    loads: int = Field(..., description="The times the artifact was loaded")
+    hits: int = Field(..., description="The times it was served from cache")
+    last_load_ms: float = Field(..., description="The last load time in ms")
+    total_load_ms: float = Field(..., description="The total load time in ms")
+
+
+class RegistryStats(BaseModel):  # type: ignore
+    """A response model for the model registry of a server process.
+
+    Args:
+        BaseModel (type): The Pydantic BaseModel class.
+    """
+
+    pid: int = Field(..., description="The server process id")
+    primary: str = Field(..., description="The version serving requests")
+    candidate: Optional[str] = Field(
+        None, description="The version shadow scoring requests"
+    )
+    shadow_fraction: float = Field(
+        ..., description="The share of requests shadow scored"
+    )
+    shadow_skipped: int = Field(
+        ..., description="The shadow requests skipped on a full queue"
+    )
+    versions: Dict[str, VersionStats] = Field(
+        ..., description="The statistics of every version"
+    )
+    artifacts: Dict[str, ArtifactStats] = Field(
+        ..., description="The loads of every cached model artifact"
+    )
@@ -3,8 +3,8 @@ import math
 import secrets
 from typing import Any
 
+from src.api.utils.model_registry import model_registry
 from src.interface.config import CustomData
-from src.pipe.pipeline import Pipeline
 
 CHARS_SET = (
     "qwertyuiopasdfghjklzxcvbnmQWERTYUIOPASDFGHJKLZXCVBNM1234567890!@#$%^&*"
@@ -30,19 +30,20 @@ def generate_password(length: int) -> str:
     return "".join(secrets.choice(CHARS_SET) for _ in range(length))
 
 
-def calc_strength(password: str) -> float | Any:
+def calc_strength(password: str, shadow: bool = False) -> float | Any:
     """Calculate the strength of a given password.
 
     Args:
         password (str): The password to calculate the strength for.
+        shadow (bool, optional): Whether the request may be shadow scored
+        by the candidate model. Defaults to False.
 
     Returns:
         float: The calculated strength of the password.
     """
     custom_data = CustomData()
-    pipeline = Pipeline()
     password_df = custom_data.data2df(password)
-    strength = pipeline.predict(password_df)
+    strength = model_registry().predict(password_df, shadow=shadow)
     return custom_data.array2data(strength)
 
 
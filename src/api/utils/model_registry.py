@@ -0,0 +1,330 @@
+"""
+Module for the model registry of the API.
+
+The registry keeps the model bundle versions loaded in this process and
+serves predictions with the primary, the current published version. A
+fraction of the requests is also scored by a candidate version on a
+background thread, off the request path, and compared with the served
+prediction. Requests, errors, latency and agreement with the primary are
+kept per version in memory.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Set
+
+import numpy as np
+
+from src.interface.config import FilePathConfig, ServingConfig
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+from src.utils.model_bundle import ModelBundle, live_bundle, load_bundle
+from src.utils.model_cache import model_cache
+
+UNVERSIONED = "unversioned"
+
+
+@dataclass
+class VersionStats:
+    """Serving statistics of one model version."""
+
+    latencies: Deque[float] = field(default_factory=deque)
+    requests: int = 0
+    errors: int = 0
+    compared: int = 0
+    agreed: int = 0
+    abs_diff: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the statistics.
+
+        Returns:
+            Dict[str, Any]: The request and error counts, the p50 and p99
+            latency in milliseconds, and the number of predictions
+            compared with the primary, the agreeing share and the mean
+            absolute difference.
+        """
+        latencies = np.array(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "p50_ms": (
+                float(np.percentile(latencies, 50)) if latencies.size else None
+            ),
+            "p99_ms": (
+                float(np.percentile(latencies, 99)) if latencies.size else None
+            ),
+            "compared": self.compared,
+            "agreement": (
+                self.agreed / self.compared if self.compared else None
+            ),
+            "mean_abs_diff": (
+                self.abs_diff / self.compared if self.compared else None
+            ),
+        }
+
+
+class ModelRegistry:
+    """The loaded model versions of the API and their statistics."""
+
+    def __init__(
+        self, root: str, serving_config: Optional[ServingConfig] = None
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            root (str): The root of the bundle versions.
+            serving_config (Optional[ServingConfig], optional): The serving
+            configuration. Defaults to None.
+        """
+        self.root = root
+        self.serving_config = serving_config or ServingConfig()
+        self.filepath_config = FilePathConfig()
+        self.primary = live_bundle(root)
+        self.candidate: Optional[str] = (
+            self.serving_config.shadow_version or None
+        )
+        self.bundles: Dict[str, ModelBundle] = {}
+        self.stats: Dict[str, VersionStats] = {}
+        self.shadow_skipped = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._shadow = ThreadPoolExecutor(1, thread_name_prefix="shadow")
+
+    def _kept_versions(self) -> Set[Optional[str]]:
+        """Get the versions whose loaded bundles are kept.
+
+        Returns:
+            Set[Optional[str]]: The candidate and primary versions.
+        """
+        primary = self.primary.bundle
+        return {
+            self.candidate,
+            primary.manifest["metadata"].get("version")
+            if primary is not None
+            else None,
+        }
+
+    def load(self, version: str) -> ModelBundle:
+        """Get a bundle version, loading it on first use.
+
+        Only the candidate and primary versions stay loaded, other
+        versions are loaded again on every call.
+
+        Args:
+            version (str): The bundle version.
+
+        Returns:
+            ModelBundle: The loaded bundle.
+        """
+        with self._lock:
+            bundle = self.bundles.get(version)
+        if bundle is None:
+            # Load outside the lock, which the request path records under
+            bundle = load_bundle(
+                os.path.join(self.root, version), verify=False
+            )
+            with self._lock:
+                if version in self._kept_versions():
+                    bundle = self.bundles.setdefault(version, bundle)
+        return bundle
+
+    def set_candidate(
+        self, version: Optional[str], fraction: Optional[float] = None
+    ) -> None:
+        """Shadow-score requests on another version, or stop with None.
+
+        Args:
+            version (Optional[str]): The candidate bundle version.
+            fraction (Optional[float], optional): The share of requests to
+            shadow-score, unchanged when None. Defaults to None.
+        """
+        with self._lock:
+            self.candidate = version
+            kept = self._kept_versions()
+            for loaded in list(self.bundles):
+                if loaded not in kept:
+                    del self.bundles[loaded]
+        if fraction is not None:
+            self.serving_config.shadow_fraction = fraction
+
+    def _record(
+        self,
+        version: str,
+        started: float,
+        failed: bool = False,
+        diff: Optional[np.ndarray[np.float64, Any]] = None,
+    ) -> None:
+        """Record a request, and its difference to the primary, of a version.
+
+        Args:
+            version (str): The version that served or shadowed the request.
+            started (float): The `perf_counter` time the request started.
+            failed (bool, optional): Whether it failed. Defaults to False.
+            diff (Optional[np.ndarray], optional): Absolute difference to
+            the primary predictions. Defaults to None.
+        """
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self.stats.setdefault(
+                version,
+                VersionStats(deque(maxlen=self.serving_config.latency_window)),
+            )
+            stats.requests += 1
+            stats.errors += failed
+            if not failed:
+                stats.latencies.append(latency_ms)
+            if diff is not None:
+                stats.compared += diff.size
+                stats.agreed += int(
+                    np.sum(diff <= self.serving_config.shadow_tolerance)
+                )
+                stats.abs_diff += float(diff.sum())
+
+    def predict(
+        self, X: Any, shadow: bool = True
+    ) -> np.ndarray[np.float64, Any]:
+        """Predict with the primary version and maybe shadow-score.
+
+        The separate model and preprocessor pickles serve as the
+        unversioned primary until a bundle is published.
+
+        Args:
+            X (Any): The passwords, a password column, or a data frame
+            with a "password" column.
+            shadow (bool, optional): Whether the request may be shadow
+            scored. Defaults to True.
+
+        Raises:
+            CustomException: If the primary fails to predict.
+
+        Returns:
+            np.ndarray: The predictions of the primary.
+        """
+        started = time.perf_counter()
+        version = UNVERSIONED
+        try:
+            bundle = self.primary.get()
+            if bundle is None:
+                cache = model_cache()
+                model = cache.get(self.filepath_config.model_path)
+                preprocessor = cache.get(
+                    self.filepath_config.preprocessor_path
+                )
+                result: np.ndarray[np.float64, Any] = model.predict(
+                    preprocessor.transform(X)
+                )
+            else:
+                version = bundle.manifest["metadata"].get("version", version)
+                result = bundle.predict(X)
+        except Exception as error:
+            self._record(version, started, failed=True)
+            raise CustomException(error, sys) from error
+        self._record(version, started)
+        if shadow:
+            self._submit_shadow(version, X, result)
+        return result
+
+    def _submit_shadow(self, primary: str, X: Any, served: Any) -> None:
+        """Queue a request for the candidate, if it is picked.
+
+        Args:
+            primary (str): The version that served the request.
+            X (Any): The request features.
+            served (Any): The predictions of the primary.
+        """
+        candidate = self.candidate
+        picked = self._random.random() < self.serving_config.shadow_fraction
+        if candidate in (None, primary) or not picked:
+            return
+        with self._lock:
+            if self._pending >= self.serving_config.shadow_max_pending:
+                self.shadow_skipped += 1
+                return
+            self._pending += 1
+        self._shadow.submit(self._score_shadow, candidate, X, served)
+
+    def _score_shadow(self, candidate: str, X: Any, served: Any) -> None:
+        """Score a request with the candidate and compare the predictions.
+
+        Args:
+            candidate (str): The candidate version.
+            X (Any): The request features.
+            served (Any): The predictions of the primary.
+        """
+        try:
+            started = time.perf_counter()
+            try:
+                bundle = self.load(candidate)
+                # Time the prediction only, not the first load
+                started = time.perf_counter()
+                predicted = bundle.predict(X)
+            except Exception as error:  # pylint: disable=broad-except
+                logger.error("Shadow version %s failed: %s", candidate, error)
+                self._record(candidate, started, failed=True)
+                return
+            diff = np.abs(np.asarray(predicted) - np.asarray(served))
+            self._record(candidate, started, diff=diff)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the versions and their statistics.
+
+        Returns:
+            Dict[str, Any]: The process id, the primary and candidate
+            versions, the shadow fraction, the number of shadow requests
+            skipped while the queue was full, the statistics of every
+            version, and the loads of every artifact in the model cache.
+        """
+        primary = self.primary.bundle
+        with self._lock:
+            versions = {
+                version: stats.summary()
+                for version, stats in self.stats.items()
+            }
+        return {
+            "pid": os.getpid(),
+            "primary": (
+                primary.manifest["metadata"].get("version", UNVERSIONED)
+                if primary is not None
+                else UNVERSIONED
+            ),
+            "candidate": self.candidate,
+            "shadow_fraction": self.serving_config.shadow_fraction,
+            "shadow_skipped": self.shadow_skipped,
+            "versions": versions,
+            "artifacts": model_cache().stats(),
+        }
+
+    def close(self) -> None:
+        """Wait for the queued shadow requests and stop the shadow thread."""
+        self._shadow.shutdown(wait=True)
+
+
+_REGISTRIES: Dict[str, ModelRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def model_registry(root: Optional[str] = None) -> ModelRegistry:
+    """Get the model registry of a bundle root, shared by the process.
+
+    Args:
+        root (Optional[str], optional): The root of the bundle versions,
+        `FilePathConfig.bundle_dir` when None. Defaults to None.
+
+    Returns:
+        ModelRegistry: The model registry.
+    """
+    root = os.path.abspath(root or FilePathConfig().bundle_dir)
+    with _REGISTRIES_LOCK:
+        if root not in _REGISTRIES:
+            _REGISTRIES[root] = ModelRegistry(root)
+        return _REGISTRIES[root]
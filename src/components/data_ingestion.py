@@ -1,19 +1,29 @@
 """
 This module handles the data ingestion process by fetching data from
 MongoDB, performing train-test split, and saving the split data
-as CSV files.
+as columnar files.
 """
-import os
 import sys
-from typing import Any
+from typing import Any, Dict, Iterable, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 
 from src.components.data_pusher import DataPusher
-from src.interface.config import FilePathConfig
+from src.interface.config import DataSplitConfig, FilePathConfig
 from src.middleware.exception import CustomException
 from src.middleware.logger import logger
+from src.utils.data_report import build_report, save_report
+from src.utils.data_split import StrengthBinCounter, hash_split, iter_hash_split
+from src.utils.file_manager import (
+    FrameChunkWriter,
+    append_frame,
+    export_csv,
+    iter_frame_chunks,
+    save_frame,
+)
+from src.utils.string_column import PasswordColumn
 
 
 class DataIngestion:
@@ -23,12 +33,19 @@ class DataIngestion:
     Methods:
         __init__(): Initializes the DataIngestion class.
         initiate_data_ingestion(): Initiates the data ingestion process.
+        split_data(): Splits a DataFrame into train and test sets.
+        save_split(): Saves the train and test sets.
+        append_split(): Appends new rows to the saved sets.
+        ingest_stream(): Splits a stream of chunks by password hash.
+        export_csv(): Exports the train and test data as CSV files.
         data_report(): Generates a report on the ingested data.
         _display_report(): Displays a report.
 
     Attributes:
         filepath_config (FilePathConfig): An instance of FilePathConfig
         class for managing file paths.
+        split_config (DataSplitConfig): An instance of DataSplitConfig
+        class selecting the train/test split.
     """
 
     def __init__(self) -> None:
@@ -36,6 +53,7 @@ class DataIngestion:
         Initializes the DataIngestion class.
         """
         self.filepath_config = FilePathConfig()
+        self.split_config = DataSplitConfig()
 
     def initiate_data_ingestion(self, data_frame: pd.DataFrame) -> Any:
         """Initiates the data ingestion process.
@@ -53,28 +71,74 @@ class DataIngestion:
         """
         try:
             logger.info("Started data ingestion method")
+            train_set, test_set = self.split_data(data_frame)
+            paths = self.save_split(train_set, test_set)
+            logger.info("Data ingestion completed")
+            return paths
+
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def split_data(
+        self, data_frame: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Split a DataFrame into train and test sets in memory.
+
+        Args:
+            data_frame (pd.DataFrame): Rows with "password" and "strength"
+            columns.
+
+        Raises:
+            CustomException: Raised when the data cannot be split.
 
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: The train and test sets.
+        """
+        try:
             logger.info("Train test split initiated")
-            os.makedirs(
-                os.path.dirname(self.filepath_config.train_data_path),
-                exist_ok=True,
-            )
-            train_set, test_set = train_test_split(
-                data_frame, test_size=0.2, random_state=42
-            )
+            if self.split_config.mode == "hash":
+                train_set, test_set = hash_split(
+                    data_frame, self.split_config.test_size
+                )
+            else:
+                (train_x, train_y), (test_x, test_y) = self.split_passwords(
+                    PasswordColumn.from_strings(data_frame["password"]),
+                    data_frame["strength"].to_numpy(),
+                    self.split_config.test_size,
+                    self.split_config.random_state,
+                )
+                train_set = pd.DataFrame(
+                    {"password": train_x.to_list(), "strength": train_y}
+                )
+                test_set = pd.DataFrame(
+                    {"password": test_x.to_list(), "strength": test_y}
+                )
             logger.info("Done Train test split")
+            return train_set, test_set
 
-            logger.info("Saving Train test split")
-            train_set.to_csv(
-                self.filepath_config.train_data_path, index=False, header=True
-            )
-            test_set.to_csv(
-                self.filepath_config.test_data_path, index=False, header=True
-            )
-            logger.info("Finish saving Train test split")
+        except Exception as error:
+            raise CustomException(error, sys) from error
 
-            logger.info("Data ingestion completed")
+    def save_split(
+        self, train_set: pd.DataFrame, test_set: pd.DataFrame
+    ) -> Tuple[str, str]:
+        """Save the train and test sets.
 
+        Args:
+            train_set (pd.DataFrame): The train set.
+            test_set (pd.DataFrame): The test set.
+
+        Raises:
+            CustomException: Raised when the sets cannot be saved.
+
+        Returns:
+            Tuple[str, str]: The file paths of the train and test data.
+        """
+        try:
+            logger.info("Saving Train test split")
+            save_frame(self.filepath_config.train_data_path, train_set)
+            save_frame(self.filepath_config.test_data_path, test_set)
+            logger.info("Finish saving Train test split")
             return (
                 self.filepath_config.train_data_path,
                 self.filepath_config.test_data_path,
@@ -83,37 +147,210 @@ class DataIngestion:
         except Exception as error:
             raise CustomException(error, sys) from error
 
-    def data_report(self) -> None:
+    def append_split(
+        self, data_frame: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Split new rows by password hash and append them to the sets.
+
+        The hash split assigns every row on its own, so new rows never move
+        existing rows between the sets, whatever `split_config.mode` is.
+
+        Args:
+            data_frame (pd.DataFrame): New rows with "password" and
+            "strength" columns.
+
+        Raises:
+            CustomException: Raised when the rows cannot be appended.
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: The appended train and test
+            rows.
         """
-        Generates a report on the ingested data.
+        try:
+            train_set, test_set = hash_split(
+                data_frame, self.split_config.test_size
+            )
+            append_frame(self.filepath_config.train_data_path, train_set)
+            append_frame(self.filepath_config.test_data_path, test_set)
+            logger.info(
+                "Appended %s train and %s test rows",
+                len(train_set),
+                len(test_set),
+            )
+            return train_set, test_set
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def ingest_stream(self, chunks: Iterable[pd.DataFrame]) -> Tuple[str, str]:
+        """Split a stream of chunks by password hash and save the split.
+
+        Only one chunk is held in memory at a time. The train/test share of
+        every strength bin is logged, as the hash split balances bins only
+        in expectation.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Chunks with "password" and
+            "strength" columns, e.g. from `DatasetStore.iter_chunks`.
+
+        Raises:
+            CustomException: Raised when an error occurs
+            during data ingestion.
+
+        Returns:
+            Tuple[str, str]: The file paths of the train and test data.
         """
         try:
-            logger.info("Generating data report")
+            logger.info("Started streaming data ingestion")
+            counter = StrengthBinCounter(self.split_config.num_bins)
+            with FrameChunkWriter(
+                self.filepath_config.train_data_path
+            ) as train_writer, FrameChunkWriter(
+                self.filepath_config.test_data_path
+            ) as test_writer:
+                for train, test in iter_hash_split(
+                    chunks, self.split_config.test_size
+                ):
+                    train_writer.write(train)
+                    test_writer.write(test)
+                    counter.update(train, test)
+            logger.info(
+                "Done streaming data ingestion: %s train, %s test rows",
+                train_writer.rows,
+                test_writer.rows,
+            )
+            logger.info(
+                "Test share by strength bin: %s", counter.test_shares()
+            )
+
+            return (
+                self.filepath_config.train_data_path,
+                self.filepath_config.test_data_path,
+            )
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def split_passwords(
+        self,
+        passwords: PasswordColumn,
+        target: np.ndarray[np.float64, Any],
+        test_size: float = 0.2,
+        random_state: int = 42,
+    ) -> Tuple[
+        Tuple[PasswordColumn, np.ndarray[np.float64, Any]],
+        Tuple[PasswordColumn, np.ndarray[np.float64, Any]],
+    ]:
+        """Split passwords and their target into train and test sets.
+
+        The rows are gathered once, in the same shuffled order as
+        `train_test_split`, and both sets are zero-copy slices of that
+        single permuted column.
 
-            train_df = pd.read_csv(self.filepath_config.train_data_path)
-            test_df = pd.read_csv(self.filepath_config.test_data_path)
+        Args:
+            passwords (PasswordColumn): The passwords.
+            target (np.ndarray): The target of every password.
+            test_size (float, optional): Share of rows in the test set.
+            Defaults to 0.2.
+            random_state (int, optional): Seed of the shuffle.
+            Defaults to 42.
 
-            self._display_report("Train dataset:", train_df.head())
-            self._display_report("Test dataset:", test_df.head())
+        Raises:
+            CustomException: Raised when the data cannot be split.
 
-            self._display_report(
-                "Train dataset statistics:", train_df.describe()
+        Returns:
+            Tuple: The `(passwords, target)` train and test sets.
+        """
+        try:
+            train_index, test_index = train_test_split(
+                np.arange(len(passwords)),
+                test_size=test_size,
+                random_state=random_state,
             )
-            self._display_report(
-                "Test dataset statistics:", test_df.describe()
+            order = np.concatenate([train_index, test_index])
+            permuted = passwords.take(order)
+            target = np.asarray(target)[order]
+            n_train = len(train_index)
+            return (
+                (permuted[:n_train], target[:n_train]),
+                (permuted[n_train:], target[n_train:]),
             )
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def export_csv(self) -> Tuple[str, str]:
+        """Export the train and test data as CSV files on demand.
 
-            self._display_report("Train dataset info:", train_df.info())
-            self._display_report("Test dataset info:", test_df.info())
+        Raises:
+            CustomException: Raised when the data cannot be exported.
 
-            self._display_report(
-                "Train dataset strength destitution:",
-                train_df["strength"].value_counts(bins=5),
+        Returns:
+            Tuple[str, str]: The paths of the train and test CSV files.
+        """
+        try:
+            logger.info("Exporting train and test data as CSV")
+            return (
+                export_csv(self.filepath_config.train_data_path),
+                export_csv(self.filepath_config.test_data_path),
             )
-            self._display_report(
-                "Test dataset strength destitution:",
-                test_df["strength"].value_counts(bins=5),
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def data_report(
+        self,
+        chunk_size: int = 100_000,
+        splits: Optional[Tuple[pd.DataFrame, pd.DataFrame]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generates a report on the ingested data.
+
+        Each split is read once, chunk by chunk, and the report is saved
+        as a JSON artifact at `report_path`.
+
+        Args:
+            chunk_size (int, optional): Rows read per chunk.
+            Defaults to 100_000.
+            splits (Optional[Tuple[pd.DataFrame, pd.DataFrame]], optional):
+            Train and test sets already in memory, reported instead of
+            reading the saved files. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: The train and test reports.
+        """
+        try:
+            logger.info("Generating data report")
+
+            if splits is not None:
+                report = {
+                    "train": build_report([splits[0]]),
+                    "test": build_report([splits[1]]),
+                }
+            else:
+                report = {
+                    "train": build_report(
+                        iter_frame_chunks(
+                            self.filepath_config.train_data_path, chunk_size
+                        )
+                    ),
+                    "test": build_report(
+                        iter_frame_chunks(
+                            self.filepath_config.test_data_path, chunk_size
+                        )
+                    ),
+                }
+            save_report(self.filepath_config.report_path, report)
+
+            for split, split_report in report.items():
+                self._display_report(
+                    f"{split.capitalize()} dataset statistics:",
+                    split_report["strength"],
+                )
+                self._display_report(
+                    f"{split.capitalize()} dataset strength distribution:",
+                    split_report["strength_histogram"],
+                )
+            logger.info(
+                "Saved data report to %s", self.filepath_config.report_path
             )
+            return report
 
         except Exception as error:
             raise CustomException(error, sys) from error
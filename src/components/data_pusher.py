@@ -1,17 +1,28 @@
 """
 Module for data pushing functionality.
 """
+import math
+import os
 import sys
+from typing import Any, List, Optional, Tuple, Union
 
+import numpy as np
 import opendatasets as od
 import pandas as pd
-from pymongo import MongoClient
 
-from src.interface.config import FilePathConfig, MongoDBConfig
+from src.interface.config import DatasetStoreConfig, FilePathConfig, MongoDBConfig
 from src.middleware.exception import CustomException
 from src.middleware.logger import logger
-from src.utils.data_validation import is_valid_password
+from src.store.base import DatasetStore, SyncReport
+from src.store.factory import get_dataset_store
+from src.store.mongodb_store import MongoDBStore
+from src.utils.bson_columns import decode_password_batches
+from src.utils.checkpoint import RunCheckpoint
+from src.utils.data_validation import valid_password_mask
+from src.utils.dataset_cache import BUFFER_FILE, build_password_cache, is_cache_valid
 from src.utils.feature_extraction import calculate_strength
+from src.utils.raw_parser import parse_raw_file
+from src.utils.string_column import PasswordColumn
 
 
 class DataPusher:
@@ -25,15 +36,22 @@ class DataPusher:
         """
         self.mongodb_config = MongoDBConfig()
         self.filepath_config = FilePathConfig()
+        self.store_config = DatasetStoreConfig()
+        self.parse_workers: Optional[int] = None
 
     def initiate_data_push(
-        self, sample_size: int = 2500, num_bins: int = 10
+        self,
+        sample_size: int = 2500,
+        num_bins: int = 10,
+        checkpoint: Optional[RunCheckpoint] = None,
     ) -> pd.DataFrame:
         """Perform the data pushing process.
 
         Args:
             sample_size (int, optional): Size of the sample for each bin. Defaults to 2500.
             num_bins (int, optional): Total number of bins. Defaults to 10.
+            checkpoint (Optional[RunCheckpoint], optional): Run checkpoint
+            used to persist and resume labeled shards. Defaults to None.
 
         Raises:
             CustomException: Catches error
@@ -44,45 +62,36 @@ class DataPusher:
         try:
             logger.info("Started data push method")
 
-            logger.info("Started downloading data")
-            od.download(
-                self.filepath_config.database_url,
-            )
-            logger.info("Done downloading data")
-
-            logger.info("Started fetching data")
-            data_frame = pd.read_csv(
-                self.filepath_config.raw_data_path,
-                header=None,
-                names=["password"],
-                sep="\t",
-                encoding="ISO-8859-1",
-            )
-            logger.info("Done fetching data")
-
-            logger.info("Started removing duplicates")
-            data_frame = data_frame.dropna()
-            logger.info("Done removing duplicates")
-
-            logger.info("Started cleaning data")
-            data_frame["IsValid"] = data_frame["password"].apply(
-                is_valid_password
-            )
-            df1 = data_frame[data_frame["IsValid"] == 1]
-            df1 = df1.drop(["IsValid"], axis=1)
-            logger.info("Done cleaning data")
+            logger.info("Started fetching and cleaning data")
+            passwords = PasswordColumn.concat(self._load_valid_shards())
+            logger.info("Done fetching and cleaning data")
 
             logger.info("Started creating target data")
-            df1["strength"] = df1["password"].apply(calculate_strength)
+            strengths = self.label_strengths(passwords, checkpoint)
             logger.info("Done creating target data")
 
             logger.info("Start balancing data")
-
-            df1["bin"] = pd.cut(df1["strength"], num_bins, labels=False)
-            sample_df = df1.groupby("bin", group_keys=False).apply(
-                lambda x: x.sample(min(len(x), sample_size), random_state=24)
+            # Sample row positions per bin, so only the sampled passwords
+            # are ever decoded into Python strings.
+            bins = pd.DataFrame(
+                {"bin": pd.cut(strengths, num_bins, labels=False)}
+            )
+            picked = (
+                bins.groupby("bin", group_keys=False)
+                .apply(
+                    lambda x: x.sample(
+                        min(len(x), sample_size), random_state=24
+                    )
+                )
+                .index.to_numpy()
+            )
+            sample_df = pd.DataFrame(
+                {
+                    "password": passwords.take(picked).to_list(),
+                    "strength": strengths[picked],
+                },
+                index=picked,
             )
-            sample_df.drop(["bin"], axis=1, inplace=True)
             logger.info("Data balancing data")
 
             logger.info("Done clean & filtered dataset")
@@ -91,54 +100,270 @@ class DataPusher:
         except Exception as error:
             raise CustomException(error, sys) from error
 
-    def push_to_mongodb(
-        self, data_frame: pd.DataFrame, chunk_size: int = 1000
+    def label_data(
+        self,
+        data_frame: Union[pd.DataFrame, PasswordColumn],
+        checkpoint: Optional[RunCheckpoint] = None,
+        shard_size: int = 100_000,
+    ) -> pd.DataFrame:
+        """Label passwords with their strength, shard by shard.
+
+        Args:
+            data_frame (Union[pd.DataFrame, PasswordColumn]): Valid
+            passwords, in a "password" column or as a password column.
+            checkpoint (Optional[RunCheckpoint], optional): Run checkpoint.
+            Defaults to None.
+            shard_size (int, optional): Passwords per shard.
+            Defaults to 100_000.
+
+        Raises:
+            CustomException: If a checkpoint of the run was labeled with
+            different parameters, or labeling fails.
+
+        Returns:
+            pd.DataFrame: The passwords with a "strength" column.
+        """
+        try:
+            if isinstance(data_frame, PasswordColumn):
+                passwords = data_frame
+            else:
+                passwords = PasswordColumn.from_strings(data_frame["password"])
+            strengths = self.label_strengths(passwords, checkpoint, shard_size)
+            return pd.DataFrame(
+                {"password": passwords.to_list(), "strength": strengths}
+            )
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def label_strengths(
+        self,
+        passwords: PasswordColumn,
+        checkpoint: Optional[RunCheckpoint] = None,
+        shard_size: int = 100_000,
+    ) -> np.ndarray[np.float64, Any]:
+        """Compute the strength of every password, shard by shard.
+
+        Shards are zero-copy slices of the column, so only the passwords of
+        the current shard are decoded. With a checkpoint every labeled
+        shard is persisted, and shards labeled by an earlier attempt of the
+        same run are loaded instead of being labeled again.
+
+        Args:
+            passwords (PasswordColumn): Valid passwords.
+            checkpoint (Optional[RunCheckpoint], optional): Run checkpoint.
+            Defaults to None.
+            shard_size (int, optional): Passwords per shard.
+            Defaults to 100_000.
+
+        Raises:
+            CustomException: If a checkpoint of the run was labeled with
+            different parameters, or labeling fails.
+
+        Returns:
+            np.ndarray: The float64 strength of every password.
+        """
+        try:
+            total_rows = len(passwords)
+            num_shards = math.ceil(total_rows / shard_size)
+            if checkpoint is not None:
+                layout = {"total_rows": total_rows, "shard_size": shard_size}
+                state = checkpoint.stage("labeling")
+                if state and state.get("layout") != layout:
+                    raise ValueError(
+                        f"Run {checkpoint.run_id} was labeled with "
+                        f"{state.get('layout')}, not {layout}"
+                    )
+                checkpoint.update("labeling", layout=layout)
+
+            strengths = np.empty(total_rows, dtype=np.float64)
+            for shard in range(num_shards):
+                name = f"labeled_{shard:05d}"
+                start = shard * shard_size
+                stop = min(start + shard_size, total_rows)
+                if checkpoint is not None and checkpoint.has_frame(name):
+                    labeled = checkpoint.load_frame(name)["strength"]
+                    strengths[start:stop] = labeled.to_numpy()
+                else:
+                    texts = passwords[start:stop].to_list()
+                    strengths[start:stop] = [
+                        calculate_strength(text) for text in texts
+                    ]
+                    if checkpoint is not None:
+                        checkpoint.save_frame(
+                            name,
+                            pd.DataFrame(
+                                {
+                                    "password": texts,
+                                    "strength": strengths[start:stop],
+                                }
+                            ),
+                        )
+                        checkpoint.update("labeling", last_shard=shard)
+                logger.info("Labeled shard %s/%s", shard + 1, num_shards)
+            return strengths
+
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def prepare_new_rows(self, data_frame: pd.DataFrame) -> pd.DataFrame:
+        """Validate new dataset rows and label those without a strength.
+
+        Args:
+            data_frame (pd.DataFrame): Rows with a "password" and an
+            optional "strength" column.
+
+        Raises:
+            CustomException: If the rows cannot be validated or labeled.
+
+        Returns:
+            pd.DataFrame: The valid rows with "password" and "strength".
+        """
+        try:
+            rows = data_frame.dropna(subset=["password"])
+            passwords = PasswordColumn.from_strings(rows["password"])
+            rows = rows[valid_password_mask(passwords)]
+            if "strength" in rows:
+                strengths = rows["strength"].to_numpy(dtype=np.float64)
+            else:
+                strengths = np.full(len(rows), np.nan)
+
+            unlabeled = np.isnan(strengths)
+            if unlabeled.any():
+                strengths[unlabeled] = self.label_strengths(
+                    PasswordColumn.from_strings(rows["password"][unlabeled])
+                )
+            logger.info(
+                "Prepared %s of %s new rows, labeled %s",
+                len(rows),
+                len(data_frame),
+                int(unlabeled.sum()),
+            )
+            return pd.DataFrame(
+                {
+                    "password": rows["password"].to_numpy(),
+                    "strength": strengths,
+                }
+            )
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def ensure_password_cache(self) -> str:
+        """Make sure the local password cache is valid.
+
+        The raw file is only downloaded when neither a valid cache nor the
+        raw file exists, and it is only converted when the cache is rebuilt.
+
+        Returns:
+            str: The path of the cached, normalized password buffer.
+        """
+        cache_dir = self.filepath_config.raw_cache_dir
+        raw_path = self.filepath_config.raw_data_path
+        checksum = self.filepath_config.raw_data_checksum
+
+        if is_cache_valid(cache_dir, raw_path, checksum):
+            logger.info("Found valid password cache in %s", cache_dir)
+        else:
+            if not os.path.exists(raw_path):
+                logger.info("Started downloading data")
+                od.download(
+                    self.filepath_config.database_url,
+                )
+                logger.info("Done downloading data")
+            build_password_cache(raw_path, cache_dir, checksum)
+        return os.path.join(cache_dir, BUFFER_FILE)
+
+    def _load_valid_shards(self) -> List[PasswordColumn]:
+        """Load the valid passwords as per-shard columns in file order.
+
+        The cached buffer is split into newline aligned byte ranges which
+        are parsed and validated on `parse_workers` processes.
+
+        Returns:
+            List[PasswordColumn]: The valid passwords of every shard.
+        """
+        return parse_raw_file(
+            self.ensure_password_cache(), num_workers=self.parse_workers
+        )
+
+    @property
+    def dataset_store(self) -> DatasetStore:
+        """The dataset store selected by the current configuration.
+
+        Returns:
+            DatasetStore: The configured dataset store backend.
+        """
+        return get_dataset_store(self.store_config, self.mongodb_config)
+
+    def push_to_store(
+        self,
+        data_frame: pd.DataFrame,
+        chunk_size: int = 1000,
+        checkpoint: Optional[RunCheckpoint] = None,
     ) -> None:
-        """Push the data to MongoDB.
+        """Push the data to the configured dataset store.
 
         Args:
             data_frame (pd.DataFrame): Input DataFrame
-            chunk_size (int, optional): Amount of chunks to send.
-            Defaults to 10_00_000.
+            chunk_size (int, optional): Amount of rows per chunk.
+            Defaults to 1000.
+            checkpoint (Optional[RunCheckpoint], optional): Run checkpoint
+            recording the last written chunk, so an interrupted push
+            resumes after it. Defaults to None.
 
         Raises:
             CustomException: Catches error
         """
         try:
-            logger.info("Started connected to MongoDB")
-            client = MongoClient(self.mongodb_config.mongodb_connection_string)
-            database = client[self.mongodb_config.database_name]
-            collection = database[self.mongodb_config.collection_name]
-            logger.info("Done connected to MongoDB")
-
-            total_rows = data_frame.shape[0]
-            num_chunks = total_rows // chunk_size
-
-            logger.info("Started insert data into MongoDB")
-            for chunk in range(num_chunks):
-                start = chunk * chunk_size
-                end = min(start + chunk_size, total_rows)
-                chunk_data = data_frame.iloc[start:end].to_dict(
-                    orient="records"
+            if checkpoint is None:
+                self.dataset_store.write(data_frame, chunk_size)
+                return
+            state = checkpoint.stage("store")
+            if state.get("chunk_size", chunk_size) != chunk_size:
+                raise ValueError(
+                    f"Run {checkpoint.run_id} was pushed with chunk size "
+                    f"{state['chunk_size']}, not {chunk_size}"
                 )
-                collection.insert_many(chunk_data)
+            self.dataset_store.write(
+                data_frame,
+                chunk_size,
+                start_chunk=state.get("last_chunk", -1) + 1,
+                on_chunk=lambda chunk: checkpoint.update(
+                    "store", chunk_size=chunk_size, last_chunk=chunk
+                ),
+            )
+        except Exception as error:
+            raise CustomException(error, sys) from error
 
-                logger.info(
-                    "Chunk %s/%s inserted into MongoDB",
-                    chunk + 1,
-                    num_chunks,
-                )
+    def sync_to_store(
+        self, data_frame: pd.DataFrame, chunk_size: int = 1000
+    ) -> SyncReport:
+        """Incrementally sync the data into the configured dataset store.
+
+        Only rows whose password is not stored yet, or whose content
+        changed, are transferred.
+
+        Args:
+            data_frame (pd.DataFrame): Input DataFrame
+            chunk_size (int, optional): Amount of rows per chunk.
+            Defaults to 1000.
 
-            self._close_db("Done insert data into MongoDB", client)
+        Raises:
+            CustomException: Catches error
+
+        Returns:
+            SyncReport: How many rows were inserted, updated or skipped.
+        """
+        try:
+            return self.dataset_store.sync(data_frame, chunk_size)
         except Exception as error:
             raise CustomException(error, sys) from error
 
-    def get_data_from_mongodb(self, chunk_size: int = 1000) -> pd.DataFrame:
-        """Retrieve data from MongoDB.
+    def get_data_from_store(self, chunk_size: int = 1000) -> pd.DataFrame:
+        """Retrieve data from the configured dataset store.
 
         Args:
-            chunk_size (int, optional): Amount of chunks to retrieve.
-            Defaults to 10_00_000.
+            chunk_size (int, optional): Amount of rows per chunk.
+            Defaults to 1000.
 
         Raises:
             CustomException: Catches error
@@ -147,61 +372,114 @@ class DataPusher:
             pd.DataFrame: Dataset in df
         """
         try:
-            logger.info("Started connected to MongoDB")
-            client = MongoClient(self.mongodb_config.mongodb_connection_string)
-            database = client[self.mongodb_config.database_name]
-            collection = database[self.mongodb_config.collection_name]
-            logger.info("Done connected to MongoDB")
-
-            total_documents = collection.count_documents({})
-            num_chunks = total_documents // chunk_size
-
-            data_frame = pd.DataFrame()
-
-            logger.info("Started fetch data from MongoDB")
-            for chunk in range(num_chunks):
-                skip_documents = chunk * chunk_size
-                chunk_data = list(
-                    collection.find(
-                        {},
-                        {"_id": 0},  # Exclude the _id field
-                        skip=skip_documents,
-                        limit=chunk_size,
-                    )
-                )
-                chunk_df = pd.DataFrame(chunk_data)
-                data_frame = pd.concat(
-                    [data_frame, chunk_df], ignore_index=True
-                )
+            return self.dataset_store.read(chunk_size)
+        except Exception as error:
+            raise CustomException(error, sys) from error
 
-                logger.info(
-                    "Fetched Chunk %s/%s from MongoDB", chunk + 1, num_chunks
-                )
+    def get_sample_from_store(
+        self, sample_size: int = 2500, num_bins: int = 10
+    ) -> pd.DataFrame:
+        """Retrieve a strength stratified sample from the dataset store.
 
-            self._close_db("Done fetch data from MongoDB", client)
-            logger.info("Data retrieved from MongoDB")
+        Binning and sampling run inside the store where the backend
+        supports it, so only the sampled rows are transferred.
 
-            return data_frame
+        Args:
+            sample_size (int, optional): Size of the sample for each bin.
+            Defaults to 2500.
+            num_bins (int, optional): Total number of bins. Defaults to 10.
+
+        Raises:
+            CustomException: Catches error
+
+        Returns:
+            pd.DataFrame: Sampled dataset in df
+        """
+        try:
+            return self.dataset_store.sample(sample_size, num_bins)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def push_to_mongodb(
+        self, data_frame: pd.DataFrame, chunk_size: int = 1000
+    ) -> None:
+        """Push the data to MongoDB.
+
+        Args:
+            data_frame (pd.DataFrame): Input DataFrame
+            chunk_size (int, optional): Amount of rows per chunk.
+            Defaults to 1000.
 
+        Raises:
+            CustomException: Catches error
+        """
+        try:
+            MongoDBStore(self.mongodb_config).write(data_frame, chunk_size)
         except Exception as error:
             raise CustomException(error, sys) from error
 
-    def _close_db(self, message: str, client: MongoClient) -> None:
-        """Closing MongoDB client
+    def get_data_from_mongodb(self, chunk_size: int = 1000) -> pd.DataFrame:
+        """Retrieve data from MongoDB.
 
         Args:
-            message (str): Log info message
-            client (MongoClient): MongoClient object
+            chunk_size (int, optional): Amount of rows per chunk.
+            Defaults to 1000.
+
+        Raises:
+            CustomException: Catches error
+
+        Returns:
+            pd.DataFrame: Dataset in df
         """
-        logger.info(message)
-        logger.info("Started close MongoDB")
-        client.close()
-        logger.info("Done close MongoDB")
+        try:
+            data_frame = MongoDBStore(self.mongodb_config).read(chunk_size)
+            logger.info("Data retrieved from MongoDB")
+            return data_frame
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def export_columns_from_mongodb(
+        self, batch_size: int = 10_000, as_frame: bool = False
+    ) -> Union[
+        Tuple[PasswordColumn, np.ndarray[np.float32, Any]], pd.DataFrame
+    ]:
+        """Export the dataset from MongoDB as columnar arrays.
+
+        Raw BSON batches are decoded straight into a password column and a
+        float32 strength array, without per-document dicts.
+
+        Args:
+            batch_size (int, optional): Documents per raw batch.
+            Defaults to 10_000.
+            as_frame (bool, optional): Build a DataFrame from the arrays.
+            Defaults to False.
+
+        Raises:
+            CustomException: Catches error
+
+        Returns:
+            Union[Tuple[PasswordColumn, np.ndarray], pd.DataFrame]: The
+            passwords and strengths, or a DataFrame of them.
+        """
+        try:
+            logger.info("Started export columns from MongoDB")
+            batches = MongoDBStore(self.mongodb_config).iter_raw_batches(
+                ["password", "strength"], batch_size
+            )
+            passwords, strengths = decode_password_batches(batches)
+            logger.info("Done export %s rows from MongoDB", len(passwords))
+            if as_frame:
+                return pd.DataFrame(
+                    {"password": passwords.to_list(), "strength": strengths}
+                )
+            return passwords, strengths
+        except Exception as error:
+            raise CustomException(error, sys) from error
 
 
 if __name__ == "__main__":
     data_pusher = DataPusher()
     df = data_pusher.initiate_data_push()
-    data_pusher.push_to_mongodb(df)
-    df2 = data_pusher.get_data_from_mongodb()
+    data_pusher.push_to_store(df)
+    df2 = data_pusher.get_data_from_store()
     logger.debug(df2.info())
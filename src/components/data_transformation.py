@@ -1,15 +1,22 @@
 """This module provides a class for data transformation and preprocessing."""
 
+import os
 import sys
-from typing import Any, List
+from typing import Any, List, Tuple
 
 import numpy as np
 import pandas as pd
+from numpy.lib.format import open_memmap
 from sklearn.compose import ColumnTransformer
 
-from src.interface.config import FilePathConfig
+from src.interface.config import (
+    DataSplitConfig,
+    DataTransformationConfig,
+    FilePathConfig,
+)
 from src.middleware.exception import CustomException
 from src.middleware.logger import logger
+from src.utils.data_split import holdout_mask
 from src.utils.feature_extraction import (
     AlphaLCTransform,
     AlphaUCTransform,
@@ -27,7 +34,16 @@ from src.utils.feature_extraction import (
     SymbolTransform,
     UniqueCharTransform,
 )
-from src.utils.file_manager import save_object
+from src.utils.feature_store import FeatureStore
+from src.utils.file_manager import (
+    count_frame_rows,
+    iter_frame_chunks,
+    load_frame,
+    save_object,
+)
+
+Array = np.ndarray[np.float64, Any]
+FeatureArrays = Tuple[Array, Array]
 
 
 class DataTransformation:
@@ -36,6 +52,7 @@ class DataTransformation:
     def __init__(self) -> None:
         """Initialize the DataTransformation object."""
         self.filepath_config = FilePathConfig()
+        self.transformation_config = DataTransformationConfig()
 
     def get_data_transformer_object(
         self, features: List[str]
@@ -80,7 +97,7 @@ class DataTransformation:
 
     def initiate_data_transformation(
         self, target: str, transformer: ColumnTransformer
-    ) -> tuple[Any, Any, str]:
+    ) -> tuple[Array, Array, str]:
         """Initiate the data transformation process.
 
         Args:
@@ -91,16 +108,59 @@ class DataTransformation:
             CustomException: If there is an error during the data transformation.
 
         Returns:
-            tuple[Any, Any, str]: A tuple containing the transformed training
-            and testing data arrays, the path to the saved preprocessing object.
+            tuple[np.ndarray, np.ndarray, str]: A tuple containing the
+            transformed training and testing data arrays, the path to the
+            saved preprocessing object.
         """
         try:
             logger.info("Fetching train and test data")
-            train_df = pd.read_csv(self.filepath_config.train_data_path)
-            test_df = pd.read_csv(self.filepath_config.test_data_path)
+            train_df = load_frame(self.filepath_config.train_data_path)
+            test_df = load_frame(self.filepath_config.test_data_path)
 
             logger.info("Read train and test data completed")
 
+            train_arr, test_arr = self.transform_frames(
+                train_df, test_df, target, transformer
+            )
+
+            logger.info("Saved preprocessing object.")
+
+            save_object(
+                file_path=self.filepath_config.preprocessor_path,
+                obj=transformer,
+            )
+
+            return (
+                train_arr,
+                test_arr,
+                self.filepath_config.preprocessor_path,
+            )
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def transform_frames(
+        self,
+        train_df: pd.DataFrame,
+        test_df: pd.DataFrame,
+        target: str,
+        transformer: ColumnTransformer,
+    ) -> tuple[Array, Array]:
+        """Fit the transformer and transform train and test sets in memory.
+
+        Args:
+            train_df (pd.DataFrame): The train set.
+            test_df (pd.DataFrame): The test set.
+            target (str): The target variable name.
+            transformer (ColumnTransformer): The preprocessing object.
+
+        Raises:
+            CustomException: If there is an error during the data transformation.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The train and test arrays, with
+            the target as last column.
+        """
+        try:
             logger.info("Splitting data")
 
             X_train = train_df.drop(columns=[target], axis=1)
@@ -113,27 +173,341 @@ class DataTransformation:
                 "Applying preprocessing object on training dataframe and testing dataframe."
             )
 
-            X_train_arr = transformer.fit_transform(X_train)
-            X_test_arr = transformer.transform(X_test)
+            X_train_arr, X_test_arr = self._featurize(
+                transformer, X_train, X_test
+            )
 
             train_arr = np.c_[X_train_arr, np.array(y_train)]
             test_arr = np.c_[X_test_arr, np.array(y_test)]
+            return train_arr, test_arr
+        except Exception as error:
+            raise CustomException(error, sys) from error
 
-            logger.info("Saved preprocessing object.")
+    def _featurize(
+        self,
+        transformer: ColumnTransformer,
+        X_train: Any,
+        X_test: Any,
+    ) -> tuple[Any, Any]:
+        """Fit the transformer and featurize train and test data.
+
+        With the feature store enabled, the transformer is fitted on one
+        row, as its transformers are stateless, and the features are taken
+        from the store wherever it already holds them.
+
+        Args:
+            transformer (ColumnTransformer): The preprocessing object.
+            X_train (Any): The training features.
+            X_test (Any): The testing features.
+
+        Returns:
+            tuple[Any, Any]: The train and test feature arrays.
+        """
+        max_bytes = self.transformation_config.feature_store_max_bytes
+        if max_bytes <= 0:
+            return transformer.fit_transform(X_train), transformer.transform(
+                X_test
+            )
+
+        transformer.fit(X_train.head(1))
+        feature_store = FeatureStore(
+            self.filepath_config.feature_store_dir, max_bytes
+        )
+        return (
+            feature_store.transform(transformer, X_train),
+            feature_store.transform(transformer, X_test),
+        )
+
+    def cache_features(self, target: str, frames: List[pd.DataFrame]) -> int:
+        """Featurize new rows into the feature store ahead of training.
+
+        The next in-memory transformation then finds these rows in the
+        store and only loads their features.
+
+        Args:
+            target (str): The target variable name.
+            frames (List[pd.DataFrame]): New rows, e.g. the appended train
+            and test rows.
+
+        Raises:
+            CustomException: If the features cannot be computed or stored.
+
+        Returns:
+            int: The number of rows featurized.
+        """
+        try:
+            max_bytes = self.transformation_config.feature_store_max_bytes
+            frames = [frame for frame in frames if len(frame)]
+            if max_bytes <= 0 or not frames:
+                return 0
+            transformer = self.get_data_transformer_object(["password"])
+            transformer.fit(frames[0].drop(columns=[target]).head(1))
+            feature_store = FeatureStore(
+                self.filepath_config.feature_store_dir, max_bytes
+            )
+            for frame in frames:
+                feature_store.transform(
+                    transformer, frame.drop(columns=[target])
+                )
+            return feature_store.computed_rows
+        except Exception as error:
+            raise CustomException(error, sys) from error
 
+    def initiate_chunked_transformation(
+        self, target: str, transformer: ColumnTransformer
+    ) -> tuple[FeatureArrays, FeatureArrays, str]:
+        """Transform train and test data chunk by chunk into memmaps.
+
+        Features and targets are written into preallocated memory-mapped
+        `.npy` files under `features_dir`, so at most one chunk of each set
+        is held in memory. Features are stored as float32, the dtype tree
+        models work in, so training does not copy them again.
+
+        Args:
+            target (str): The target variable name.
+            transformer (ColumnTransformer): The preprocessing object. It
+            is fitted on the first train chunk, its transformers are
+            stateless.
+
+        Raises:
+            CustomException: If there is an error during the data transformation.
+
+        Returns:
+            tuple[FeatureArrays, FeatureArrays, str]: Read-only memmaps of
+            the train and test `(features, target)`, and the path to the
+            saved preprocessing object.
+        """
+        try:
+            logger.info("Started chunked data transformation")
+            chunk_size = self.transformation_config.chunk_size
+            os.makedirs(self.filepath_config.features_dir, exist_ok=True)
+
+            first_chunk = next(
+                iter_frame_chunks(self.filepath_config.train_data_path, 1)
+            )
+            first_features = first_chunk.drop(columns=[target], axis=1)
+            num_features = transformer.fit_transform(first_features).shape[1]
             save_object(
                 file_path=self.filepath_config.preprocessor_path,
                 obj=transformer,
             )
 
+            arrays = []
+            for split, data_path in [
+                ("train", self.filepath_config.train_data_path),
+                ("test", self.filepath_config.test_data_path),
+            ]:
+                arrays.append(
+                    self._transform_to_memmap(
+                        split,
+                        data_path,
+                        target,
+                        transformer,
+                        (chunk_size, num_features),
+                    )
+                )
+                logger.info("Transformed %s data into memmaps", split)
+
+            logger.info("Done chunked data transformation")
             return (
-                train_arr,
-                test_arr,
+                arrays[0],
+                arrays[1],
                 self.filepath_config.preprocessor_path,
             )
         except Exception as error:
             raise CustomException(error, sys) from error
 
+    def initiate_shard_transformation(
+        self,
+        target: str,
+        transformer: ColumnTransformer,
+        result_paths: List[str],
+    ) -> tuple[FeatureArrays, FeatureArrays, str]:
+        """Split the prepared shards by password hash into memmaps.
+
+        The shard workers already labeled and featurized the full corpus,
+        so their results are only split and copied into the memory-mapped
+        arrays `initiate_chunked_transformation` writes. One shard is held
+        in memory at a time.
+
+        Args:
+            target (str): The target variable name.
+            transformer (ColumnTransformer): The preprocessing object the
+            shards were featurized with. It is fitted on one password, its
+            transformers are stateless.
+            result_paths (List[str]): The shard results, with "password",
+            the target and one column per feature.
+
+        Raises:
+            CustomException: If there is an error during the data transformation.
+
+        Returns:
+            tuple[FeatureArrays, FeatureArrays, str]: Read-only memmaps of
+            the train and test `(features, target)`, and the path to the
+            saved preprocessing object.
+        """
+        try:
+            logger.info("Started shard transformation")
+            test_size = DataSplitConfig().test_size
+            transformer.fit(pd.DataFrame({"password": ["password"]}))
+            save_object(
+                file_path=self.filepath_config.preprocessor_path,
+                obj=transformer,
+            )
+            columns = [name for name, _, _ in transformer.transformers]
+            os.makedirs(self.filepath_config.features_dir, exist_ok=True)
+
+            num_test = num_rows = 0
+            for path in result_paths:
+                passwords = load_frame(path, columns=["password"])["password"]
+                num_test += int(holdout_mask(passwords, test_size).sum())
+                num_rows += len(passwords)
+
+            arrays = {}
+            for split, split_rows in [
+                ("train", num_rows - num_test),
+                ("test", num_test),
+            ]:
+                features_path, target_path = self._feature_paths(split)
+                arrays[split] = (
+                    open_memmap(  # type: ignore[no-untyped-call]
+                        f"{features_path}.tmp.npy",
+                        mode="w+",
+                        dtype=np.float32,
+                        shape=(split_rows, len(columns)),
+                    ),
+                    open_memmap(  # type: ignore[no-untyped-call]
+                        f"{target_path}.tmp.npy",
+                        mode="w+",
+                        dtype=np.float64,
+                        shape=(split_rows,),
+                    ),
+                )
+
+            starts = {"train": 0, "test": 0}
+            for path in result_paths:
+                shard = load_frame(path)
+                is_test = holdout_mask(shard["password"], test_size)
+                for split, rows in [
+                    ("train", shard[~is_test]),
+                    ("test", shard[is_test]),
+                ]:
+                    start, end = starts[split], starts[split] + len(rows)
+                    arrays[split][0][start:end] = rows[columns].to_numpy()
+                    arrays[split][1][start:end] = rows[target].to_numpy()
+                    starts[split] = end
+            if starts != {"train": num_rows - num_test, "test": num_test}:
+                raise ValueError("The shard results changed while split")
+
+            for split_arrays in arrays.values():
+                for array in split_arrays:
+                    array.flush()
+            del arrays, split_arrays, array
+            for split in ("train", "test"):
+                for path in self._feature_paths(split):
+                    os.replace(f"{path}.tmp.npy", path)
+
+            logger.info(
+                "Done shard transformation of %s rows, %s in test",
+                num_rows,
+                num_test,
+            )
+            return (
+                self.load_features("train"),
+                self.load_features("test"),
+                self.filepath_config.preprocessor_path,
+            )
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def load_features(self, split: str) -> FeatureArrays:
+        """Open the memory-mapped features and target of a split.
+
+        Args:
+            split (str): "train" or "test".
+
+        Raises:
+            CustomException: If the arrays cannot be opened.
+
+        Returns:
+            FeatureArrays: Read-only memmaps of the features and target.
+        """
+        try:
+            features_path, target_path = self._feature_paths(split)
+            return (
+                np.load(features_path, mmap_mode="r"),
+                np.load(target_path, mmap_mode="r"),
+            )
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def _feature_paths(self, split: str) -> tuple[str, str]:
+        """Get the feature and target array paths of a split."""
+        return (
+            os.path.join(self.filepath_config.features_dir, f"{split}_X.npy"),
+            os.path.join(self.filepath_config.features_dir, f"{split}_y.npy"),
+        )
+
+    def _transform_to_memmap(
+        self,
+        split: str,
+        data_path: str,
+        target: str,
+        transformer: ColumnTransformer,
+        chunk_shape: tuple[int, int],
+    ) -> FeatureArrays:
+        """Transform one split into preallocated memmaps.
+
+        The arrays are filled under temporary names and only moved into
+        place once complete.
+
+        Args:
+            split (str): "train" or "test".
+            data_path (str): The path of the split data.
+            target (str): The target variable name.
+            transformer (ColumnTransformer): The fitted preprocessing object.
+            chunk_shape (tuple[int, int]): Rows transformed per chunk and
+            features per row.
+
+        Returns:
+            FeatureArrays: Read-only memmaps of the features and target.
+        """
+        chunk_size, num_features = chunk_shape
+        num_rows = count_frame_rows(data_path)
+        features_path, target_path = self._feature_paths(split)
+
+        features = open_memmap(  # type: ignore[no-untyped-call]
+            f"{features_path}.tmp.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(num_rows, num_features),
+        )
+        targets = open_memmap(  # type: ignore[no-untyped-call]
+            f"{target_path}.tmp.npy",
+            mode="w+",
+            dtype=np.float64,
+            shape=(num_rows,),
+        )
+        start = 0
+        for chunk in iter_frame_chunks(data_path, chunk_size):
+            end = start + len(chunk)
+            features[start:end] = transformer.transform(
+                chunk.drop(columns=[target], axis=1)
+            )
+            targets[start:end] = chunk[target].to_numpy()
+            start = end
+        if start != num_rows:
+            raise ValueError(
+                f"Expected {num_rows} rows in {data_path}, read {start}"
+            )
+        features.flush()
+        targets.flush()
+        del features, targets
+
+        os.replace(f"{features_path}.tmp.npy", features_path)
+        os.replace(f"{target_path}.tmp.npy", target_path)
+        return self.load_features(split)
+
 
 if __name__ == "__main__":
     data_transformation = DataTransformation()
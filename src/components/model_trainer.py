@@ -1,17 +1,48 @@
 """This module provides a class for model training and evaluation."""
 
+import os
 import sys
-from typing import Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
 from sklearn.metrics import r2_score
 from sklearn.model_selection import GridSearchCV
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
 from sklearn.tree import DecisionTreeRegressor
 
-from src.interface.config import FilePathConfig
+from src.coordination.task_server import TaskServer, distributed_search
+from src.interface.config import FilePathConfig, ModelTrainerConfig
 from src.middleware.exception import CustomException
 from src.middleware.logger import logger
-from src.utils.file_manager import save_object
+from src.utils.data_report import save_report
+from src.utils.file_manager import load_object, save_object
+from src.utils.incremental_model import IncrementalRegressor, fit_out_of_core
+from src.utils.model_profile import profile_model
+from src.utils.model_search import successive_halving
+from src.utils.shared_arrays import shared_arrays
+
+Features = np.ndarray[np.float64, Any]
+TrainingData = Union[Features, Tuple[Features, Features]]
+
+
+def split_features(data: TrainingData) -> Tuple[Features, Features]:
+    """Split training data into features and target.
+
+    Args:
+        data (TrainingData): An array with the target as last column, or a
+        `(features, target)` pair that is returned as is.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The features and the target.
+    """
+    if isinstance(data, tuple):
+        return data
+    return data[:, :-1], data[:, -1]
 
 
 class ModelTrainer:
@@ -20,10 +51,18 @@ class ModelTrainer:
     def __init__(self) -> None:
         """Initialize the ModelTrainer object."""
         self.filepath_config = FilePathConfig()
+        self.trainer_config = ModelTrainerConfig()
         self.models = {
             "Decision Tree": DecisionTreeRegressor(),
+            "Hist Gradient Boosting": HistGradientBoostingRegressor(
+                random_state=self.trainer_config.random_state
+            ),
+            "Random Forest": RandomForestRegressor(
+                random_state=self.trainer_config.random_state
+            ),
+            "Ridge": make_pipeline(StandardScaler(), Ridge()),
         }
-        self.params = {
+        self.params: Dict[str, Dict[str, List[Any]]] = {
             "Decision Tree": {
                 "criterion": [
                     "squared_error",
@@ -34,18 +73,44 @@ class ModelTrainer:
                 "splitter": ["best", "random"],
                 "max_features": ["sqrt", "log2"],
             },
+            "Hist Gradient Boosting": {
+                "learning_rate": [0.05, 0.1, 0.2],
+                "max_leaf_nodes": [15, 31],
+                "max_iter": [100, 200],
+            },
+            "Random Forest": {
+                "n_estimators": [50, 100],
+                "max_depth": [10, 20],
+                "max_features": ["sqrt", 1.0],
+            },
+            "Ridge": {
+                "ridge__alpha": [0.1, 1.0, 10.0],
+            },
         }
+        self.model_report: Dict[str, Dict[str, Any]] = {}
 
     def evaluate_models(
         self,
-        train_array: np.ndarray[np.float64, Any],
-        test_array: np.ndarray[np.float64, Any],
+        train_array: TrainingData,
+        test_array: TrainingData,
     ) -> dict[str, Any]:
-        """Evaluate multiple models using GridSearchCV.
+        """Evaluate multiple models, tuned by the configured search.
+
+        The candidates are tuned in parallel, each search using its share
+        of the cores, and the tuned estimators replace the untuned ones in
+        `models`. The training arrays are
+        placed in memory-mapped files first, so the search workers attach
+        to one shared copy instead of each receiving their own. Once all
+        are tuned, the models are profiled one at a time, so the latency
+        of one is not skewed by the training of another, and their metrics
+        are kept in `model_report`. In the incremental training mode
+        `models` holds the single model trained out of core instead.
 
         Args:
-            train_array (np.ndarray): Training data array.
-            test_array (np.ndarray): Testing data array.
+            train_array (TrainingData): Training data array, or a
+            `(features, target)` pair such as memory-mapped arrays.
+            test_array (TrainingData): Testing data array, or a
+            `(features, target)` pair.
 
         Raises:
             CustomException: If there is an error during model evaluation.
@@ -56,61 +121,261 @@ class ModelTrainer:
         """
         try:
             logger.info("Split training and test input data")
-            X_train, y_train, X_test, y_test = (
-                train_array[:, :-1],
-                train_array[:, -1],
-                test_array[:, :-1],
-                test_array[:, -1],
-            )
+            X_train, y_train = split_features(train_array)
+            X_test, y_test = split_features(test_array)
             logger.info("Done split training and test input data")
 
+            logger.info("Started training")
+            training_mode = self.trainer_config.training_mode
+            if training_mode == "incremental":
+                self.models = dict([self._train_incremental(X_train, y_train)])
+            elif training_mode == "search":
+                # Split the cores so the parallel searches do not compete
+                n_jobs = max(1, (os.cpu_count() or 1) // len(self.models))
+                # Features as float32, the dtype trees convert them to
+                with shared_arrays(
+                    X_train, y_train, dtypes=(np.float32, None)
+                ) as (X_shared, y_shared), self._task_server() as server:
+                    with ThreadPoolExecutor(
+                        max_workers=len(self.models)
+                    ) as pool:
+                        futures = {
+                            name: pool.submit(
+                                self._search,
+                                model,
+                                self.params[name],
+                                X_shared,
+                                y_shared,
+                                server,
+                                n_jobs,
+                            )
+                            for name, model in self.models.items()
+                        }
+                        for name, future in futures.items():
+                            self.models[name] = future.result()
+            else:
+                raise ValueError(f"Unknown training mode: {training_mode}")
+            logger.info("Done training")
+
             logger.info("Started evaluate models")
             test_report = {}
+            for name, model in self.models.items():
+                metrics = profile_model(
+                    model,
+                    X_test,
+                    y_test,
+                    block_rows=self.trainer_config.incremental_block_rows,
+                )
+                metrics["params"] = {
+                    param: model.get_params()[param]
+                    for param in self.params.get(name, {})
+                }
+                self.model_report[name] = metrics
+                test_report[name] = metrics["r2"]
+                logger.info(
+                    "%s: r2 %.4f, p99 %.3f ms, %s bytes",
+                    name,
+                    metrics["r2"],
+                    metrics["p99_ms"],
+                    metrics["size_bytes"],
+                )
 
-            for i in range(len(list(self.models))):
-                model = list(self.models.values())[i]
-                para = self.params[list(self.models.keys())[i]]
-                logger.debug("%s Model: %s, parameter: %s", i, model, para)
+            logger.info("Done evaluate models")
+            return test_report
 
-                logger.info("Started training")
-                gs = GridSearchCV(model, para, cv=3, n_jobs=-1, verbose=1)
-                gs.fit(X_train, y_train)
-                logger.info("Done training")
+        except Exception as e:
+            raise CustomException(e, sys) from e
 
-                logger.info("Started training best params")
-                model.set_params(**gs.best_params_)
-                model.fit(X_train, y_train)
-                logger.info("Done training best params")
+    def within_budget(self, name: str) -> bool:
+        """Check a candidate against the latency and size budgets.
 
-                logger.info("Started predicting model")
-                y_test_pred = model.predict(X_test)
-                logger.info("Done predicting model")
+        Candidates that were not profiled are always within budget.
 
-                logger.info("Started score model")
-                test_model_score = r2_score(y_test, y_test_pred)
-                logger.info("Done score model")
+        Args:
+            name (str): The name of the candidate.
 
-                logger.info("Started storing report")
-                test_report[list(self.models.keys())[i]] = test_model_score
-                logger.info("Done storing report")
+        Returns:
+            bool: True if the candidate meets every configured budget.
+        """
+        metrics = self.model_report.get(name)
+        if metrics is None:
+            return True
+        config = self.trainer_config
+        if 0 < config.max_p99_latency_ms < metrics["p99_ms"]:
+            return False
+        return not 0 < config.max_artifact_bytes < metrics["size_bytes"]
 
-            logger.info("Done evaluate models")
-            return test_report
+    def _task_server(self) -> Union[TaskServer, nullcontext[None]]:
+        """Get the task server of a distributed search, if configured.
 
-        except Exception as e:
-            raise CustomException(e, sys) from e
+        Returns:
+            Union[TaskServer, nullcontext[None]]: The task server, to be
+            entered once for the searches of all models.
+        """
+        config = self.trainer_config
+        if config.search_mode != "distributed":
+            return nullcontext()
+        return TaskServer(
+            config.task_server_address, config.task_server_authkey
+        )
+
+    def _search(
+        self,
+        model: Any,
+        params: dict[str, Any],
+        X_train: Features,
+        y_train: Features,
+        server: Optional[TaskServer] = None,
+        n_jobs: int = -1,
+    ) -> Any:
+        """Tune a model with the configured search mode.
+
+        Every mode returns the estimator it already refit on the whole
+        training data, so the best parameters are never fitted twice.
+
+        Args:
+            model (Any): The estimator to tune.
+            params (dict[str, Any]): The parameter grid.
+            X_train (np.ndarray): The training features.
+            y_train (np.ndarray): The training target.
+            server (Optional[TaskServer], optional): The entered task
+            server of the distributed mode. Defaults to None.
+            n_jobs (int, optional): Folds fitted in parallel by the grid
+            and halving searches, -1 for all cores. Defaults to -1.
+
+        Raises:
+            ValueError: If the search mode is unknown.
+
+        Returns:
+            Any: The refit best estimator.
+        """
+        config = self.trainer_config
+        if config.search_mode == "halving":
+            result = successive_halving(
+                model,
+                params,
+                X_train,
+                y_train,
+                cv=config.cv,
+                factor=config.halving_factor,
+                time_budget=config.time_budget,
+                cache_dir=self.filepath_config.search_cache_dir,
+                random_state=config.random_state,
+                n_jobs=n_jobs,
+            )
+            logger.info(
+                "Halving search: %s trials run, %s cached, best %s",
+                result.trials_run,
+                result.trials_cached,
+                result.best_params,
+            )
+            return result.best_estimator
+        if config.search_mode == "distributed" and server is not None:
+            result = distributed_search(
+                model,
+                params,
+                X_train,
+                y_train,
+                server,
+                cv=config.cv,
+                random_state=config.random_state,
+                task_timeout=config.task_timeout,
+            )
+            logger.info(
+                "Distributed search: %s tasks, best %s",
+                result.trials_run,
+                result.best_params,
+            )
+            return result.best_estimator
+        if config.search_mode == "grid":
+            gs = GridSearchCV(
+                model, params, cv=config.cv, n_jobs=n_jobs, verbose=1
+            )
+            gs.fit(X_train, y_train)
+            return gs.best_estimator_
+        raise ValueError(f"Unknown search mode: {config.search_mode}")
+
+    def _train_incremental(
+        self, X_train: Features, y_train: Features
+    ) -> Tuple[str, IncrementalRegressor]:
+        """Train the incremental model out of core.
+
+        A warm-started model only learns from the rows appended to the
+        train set since it was trained. If the train set did not grow, it
+        was rebuilt, and the model continues on all of it.
+
+        Args:
+            X_train (np.ndarray): The training features, typically
+            memory-mapped.
+            y_train (np.ndarray): The training target.
+
+        Returns:
+            Tuple[str, IncrementalRegressor]: The name and fitted model.
+        """
+        config = self.trainer_config
+        name = f"Incremental {config.incremental_estimator.upper()}"
+        model = self._load_warm_start()
+        start = 0
+        if model is None:
+            model = IncrementalRegressor(
+                config.incremental_estimator, config.random_state
+            )
+        elif len(X_train) > model.n_train_rows_:
+            start = model.n_train_rows_
+        logger.info(
+            "Training %s on %s rows from row %s",
+            name,
+            len(X_train) - start,
+            start,
+        )
+        fit_out_of_core(
+            model,
+            X_train[start:],
+            y_train[start:],
+            block_rows=config.incremental_block_rows,
+            epochs=config.incremental_epochs,
+            random_state=config.random_state,
+        )
+        # Rows of the train set the model has learned, for the next warm start
+        model.n_train_rows_ = len(X_train)
+        return name, model
+
+    def _load_warm_start(self) -> IncrementalRegressor | None:
+        """Load the deployed model if it can be warm-started.
+
+        Returns:
+            IncrementalRegressor | None: The deployed model, or None when
+            warm starts are off or it is not a model of the configured
+            incremental estimator.
+        """
+        config = self.trainer_config
+        model_path = self.filepath_config.model_path
+        if not config.warm_start or not os.path.exists(model_path):
+            return None
+        model = load_object(model_path)
+        same_estimator = (
+            getattr(model, "estimator", None) == config.incremental_estimator
+        )
+        if not isinstance(model, IncrementalRegressor) or not same_estimator:
+            logger.info("Deployed model cannot be warm-started")
+            return None
+        return model
 
     def select_best_model(
         self,
         test_report: dict[str, Any],
-        test_array: np.ndarray[np.float64, Any],
+        test_array: TrainingData,
     ) -> Tuple[str, float | Any]:
-        """Select the best model based on the evaluation scores.
+        """Select the most accurate model within the serving budgets.
+
+        The metrics of every candidate, whether it met the budgets and
+        which one was selected are saved at `model_report_path`.
 
         Args:
             test_report (dict): A dictionary containing the model names as
             keys and their evaluation scores as values.
-            test_array (np.ndarray): Testing data array.
+            test_array (TrainingData): Testing data array, or a
+            `(features, target)` pair.
 
         Raises:
             CustomException: If there is an error during model selection.
@@ -122,18 +387,47 @@ class ModelTrainer:
         try:
             logger.info("Started selecting best models")
 
-            # To get best model score from dict
-            best_model_score = max(sorted(test_report.values()))
+            eligible = {
+                name: score
+                for name, score in test_report.items()
+                if self.within_budget(name)
+            }
+            best_model_name = (
+                max(eligible, key=lambda name: eligible[name])
+                if eligible
+                else None
+            )
+
+            logger.info("Started saving model report")
+            save_report(
+                self.filepath_config.model_report_path,
+                {
+                    "budgets": {
+                        "max_p99_latency_ms": (
+                            self.trainer_config.max_p99_latency_ms
+                        ),
+                        "max_artifact_bytes": (
+                            self.trainer_config.max_artifact_bytes
+                        ),
+                    },
+                    "selected": best_model_name,
+                    "candidates": {
+                        name: {
+                            **self.model_report.get(name, {"r2": score}),
+                            "within_budget": name in eligible,
+                        }
+                        for name, score in test_report.items()
+                    },
+                },
+            )
+            logger.info("Done saving model report")
 
-            # To get best model name from dict
-            best_model_name = list(test_report.keys())[
-                list(test_report.values()).index(best_model_score)
-            ]
+            if best_model_name is None:
+                raise ValueError("No model meets the serving budgets")
+            if eligible[best_model_name] < 0.6:
+                raise ValueError("No best model found")
             best_model = self.models[best_model_name]
 
-            if best_model_score < 0.6:
-                raise CustomException("No best model found", sys)
-
             logger.info(
                 "Best found model on both training and testing dataset"
             )
@@ -145,9 +439,10 @@ class ModelTrainer:
             )
             logger.info("Done saving best models")
 
-            predicted = best_model.predict(test_array[:, :-1])
+            X_test, y_test = split_features(test_array)
+            predicted = best_model.predict(X_test)
 
-            return best_model_name, r2_score(test_array[:, -1], predicted)
+            return best_model_name, r2_score(y_test, predicted)
 
         except Exception as e:
             raise CustomException(e, sys) from e
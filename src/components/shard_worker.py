@@ -0,0 +1,243 @@
+"""
+Module for preparing the raw dataset on any number of workers.
+
+The password cache is split into byte range shards recorded by a shard
+coordinator. Every worker leases one shard at a time, validates, labels
+and featurizes its passwords, commits the result to a shared directory and
+leases the next shard until none is left.
+"""
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from src.components.data_pusher import DataPusher
+from src.components.data_transformation import DataTransformation
+from src.coordination.base import LEASED, PENDING, Shard, ShardCoordinator
+from src.coordination.factory import get_shard_coordinator
+from src.interface.config import CoordinationConfig, MongoDBConfig
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+from src.utils.file_manager import load_frame, save_frame
+from src.utils.raw_parser import parse_byte_range, split_byte_ranges
+
+
+class ShardWorker:
+    """A worker that leases shards of the raw dataset and prepares them."""
+
+    def __init__(self, worker_id: Optional[str] = None) -> None:
+        """Initialize the worker.
+
+        Args:
+            worker_id (Optional[str], optional): Identifier of the worker,
+            unique across nodes. Host, process id and a random suffix when
+            None. Defaults to None.
+        """
+        default_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.worker_id = worker_id or f"{default_id}-{uuid.uuid4().hex[:6]}"
+        self.coordination_config = CoordinationConfig()
+        self.mongodb_config = MongoDBConfig()
+        self.data_pusher = DataPusher()
+        self.data_transformation = DataTransformation()
+
+    @cached_property
+    def coordinator(self) -> ShardCoordinator:
+        """The shard coordinator selected by the configuration, built on
+        first use and shared by planning, leasing and the heartbeat.
+
+        Returns:
+            ShardCoordinator: The configured shard coordinator.
+        """
+        return get_shard_coordinator(
+            self.coordination_config, self.mongodb_config
+        )
+
+    def plan_shards(self) -> int:
+        """Split the password cache into shards and record them.
+
+        Planning again resumes the recorded job, so any worker may plan.
+
+        Raises:
+            CustomException: If the coordinator holds the shards of another
+            job.
+
+        Returns:
+            int: The number of newly recorded shards.
+        """
+        try:
+            cache_path = self.data_pusher.ensure_password_cache()
+            ranges = split_byte_ranges(
+                cache_path, self.coordination_config.num_shards
+            )
+            recorded = [
+                (shard.start, shard.end) for shard in self.coordinator.shards()
+            ]
+            if recorded and recorded != ranges:
+                raise ValueError(
+                    "The coordinator holds shards of another job, clear it "
+                    "before planning a new one"
+                )
+            return self.coordinator.create_shards(ranges)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def process_shard(self, shard: Shard, cache_path: str) -> str:
+        """Validate, label and featurize the passwords of one shard.
+
+        The result is written under a name unique to this worker, so a
+        worker that lost its lease never overwrites the result of the
+        worker that took the shard over.
+
+        Args:
+            shard (Shard): The leased shard.
+            cache_path (str): The path of the password cache.
+
+        Raises:
+            CustomException: If the shard cannot be processed.
+
+        Returns:
+            str: The path of the result, with "password", "strength" and
+            one column per feature.
+        """
+        try:
+            passwords = parse_byte_range(cache_path, shard.start, shard.end)
+            data_frame = pd.DataFrame(
+                {
+                    "password": passwords.to_list(),
+                    "strength": self.data_pusher.label_strengths(passwords),
+                }
+            )
+            transformer = self.data_transformation.get_data_transformer_object(
+                ["password"]
+            )
+            if len(data_frame):
+                inputs = data_frame[["password"]]
+                transformer.fit(inputs.head(1))
+                features = transformer.transform(inputs)
+                for position, (name, _, _) in enumerate(
+                    transformer.transformers
+                ):
+                    data_frame[name] = features[:, position]
+
+            result_path = os.path.join(
+                self.coordination_config.results_dir,
+                f"shard-{shard.shard_id:05d}-{self.worker_id}.parquet",
+            )
+            save_frame(result_path, data_frame)
+            return result_path
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    @contextmanager
+    def _heartbeat(self, shard: Shard) -> Iterator[None]:
+        """Renew the lease of a shard in the background while it is held.
+
+        Args:
+            shard (Shard): The leased shard.
+
+        Yields:
+            None: While the lease is renewed.
+        """
+        lease_seconds = self.coordination_config.lease_seconds
+        stopped = threading.Event()
+
+        def renew() -> None:
+            while not stopped.wait(lease_seconds / 3):
+                if not self.coordinator.renew(
+                    shard.shard_id, self.worker_id, lease_seconds
+                ):
+                    return
+
+        thread = threading.Thread(target=renew, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    def run(self, max_shards: Optional[int] = None) -> int:
+        """Lease and process shards until every shard is done.
+
+        While other workers hold the remaining leases, the worker waits
+        `poll_seconds` and tries again, so it takes over the shards of
+        workers whose lease expired.
+
+        Args:
+            max_shards (Optional[int], optional): Stop after this many
+            shards, no limit when None. Defaults to None.
+
+        Raises:
+            CustomException: If a shard cannot be processed.
+
+        Returns:
+            int: The number of shards this worker completed.
+        """
+        try:
+            logger.info("Started shard worker %s", self.worker_id)
+            cache_path = self.data_pusher.ensure_password_cache()
+            completed = 0
+            while max_shards is None or completed < max_shards:
+                shard = self.coordinator.lease(
+                    self.worker_id, self.coordination_config.lease_seconds
+                )
+                if shard is None:
+                    progress = self.coordinator.progress()
+                    if progress[PENDING] == 0 and progress[LEASED] == 0:
+                        break
+                    time.sleep(self.coordination_config.poll_seconds)
+                    continue
+
+                with self._heartbeat(shard):
+                    result_path = self.process_shard(shard, cache_path)
+                if self.coordinator.complete(
+                    shard.shard_id, self.worker_id, result_path
+                ):
+                    completed += 1
+                else:
+                    os.remove(result_path)
+            logger.info(
+                "Done shard worker %s: %s shards", self.worker_id, completed
+            )
+            return completed
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def collect(self) -> pd.DataFrame:
+        """Load the results of all shards in dataset order.
+
+        Raises:
+            CustomException: If a shard is not done yet.
+
+        Returns:
+            pd.DataFrame: The prepared dataset.
+        """
+        try:
+            frames = [
+                load_frame(path) for path in self.coordinator.result_paths()
+            ]
+            if not frames:
+                return pd.DataFrame()
+            return pd.concat(frames, ignore_index=True)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+
+if __name__ == "__main__":
+    worker = ShardWorker()
+    mode = sys.argv[1] if len(sys.argv) > 1 else "work"
+    if mode == "plan":
+        worker.plan_shards()
+    elif mode == "work":
+        worker.run()
+    elif mode == "collect":
+        logger.info(worker.collect().describe())
+    else:
+        raise CustomException("Usage: shard_worker [plan|work|collect]", sys)
@@ -0,0 +1,244 @@
+"""
+Module defining lease-based shard coordination shared by all backends.
+
+The raw dataset is split into shards recorded in a coordination table.
+Workers on any number of processes or nodes lease one shard at a time,
+renew the lease while they work and commit the result path when done.
+A lease that is not renewed expires, and the shard becomes leasable again,
+so the shards of a crashed worker are picked up by the others.
+"""
+import sys
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+
+
+@dataclass
+class Shard:
+    """A byte range of the password cache and its lease."""
+
+    shard_id: int
+    start: int
+    end: int
+    status: str = PENDING
+    owner: str = ""
+    lease_expires: float = 0.0
+    attempts: int = 0
+    result_path: str = ""
+
+
+class ShardCoordinator(ABC):
+    """Interface for leasing shards of work to concurrent workers.
+
+    Backends implement the atomic primitives; logging and error handling
+    live here so every backend behaves the same way.
+    """
+
+    name = "shard coordinator"
+
+    def create_shards(self, ranges: List[Tuple[int, int]]) -> int:
+        """Record the shards of a job, keeping shards already recorded.
+
+        Args:
+            ranges (List[Tuple[int, int]]): The `(start, end)` byte range
+            of every shard, in order.
+
+        Raises:
+            CustomException: If the shards cannot be recorded.
+
+        Returns:
+            int: The number of newly recorded shards.
+        """
+        try:
+            shards = [
+                Shard(shard_id, start, end)
+                for shard_id, (start, end) in enumerate(ranges)
+            ]
+            created = self._insert_shards(shards)
+            logger.info(
+                "Recorded %s of %s shards in %s",
+                created,
+                len(shards),
+                self.name,
+            )
+            return created
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def lease(self, owner: str, lease_seconds: float) -> Optional[Shard]:
+        """Lease the first pending shard or shard with an expired lease.
+
+        Args:
+            owner (str): Identifier of the leasing worker.
+            lease_seconds (float): How long the lease lasts unless renewed.
+
+        Raises:
+            CustomException: If the coordinator cannot be reached.
+
+        Returns:
+            Optional[Shard]: The leased shard, or None if no shard is
+            leasable right now.
+        """
+        try:
+            shard = self._lease(owner, time.time(), lease_seconds)
+            if shard is not None:
+                logger.info(
+                    "Worker %s leased shard %s (attempt %s)",
+                    owner,
+                    shard.shard_id,
+                    shard.attempts,
+                )
+            return shard
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def renew(self, shard_id: int, owner: str, lease_seconds: float) -> bool:
+        """Extend a lease that the worker still holds.
+
+        Args:
+            shard_id (int): The leased shard.
+            owner (str): Identifier of the leasing worker.
+            lease_seconds (float): New lease duration from now.
+
+        Raises:
+            CustomException: If the coordinator cannot be reached.
+
+        Returns:
+            bool: False if the lease was lost to another worker.
+        """
+        try:
+            return self._renew(shard_id, owner, time.time() + lease_seconds)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def complete(self, shard_id: int, owner: str, result_path: str) -> bool:
+        """Mark a leased shard as done with its result.
+
+        Args:
+            shard_id (int): The leased shard.
+            owner (str): Identifier of the leasing worker.
+            result_path (str): Where the worker committed its result.
+
+        Raises:
+            CustomException: If the coordinator cannot be reached.
+
+        Returns:
+            bool: False if the lease was lost to another worker, whose
+            result then counts instead.
+        """
+        try:
+            completed = self._complete(shard_id, owner, result_path)
+            if not completed:
+                logger.info(
+                    "Worker %s lost the lease of shard %s", owner, shard_id
+                )
+            return completed
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def progress(self) -> Dict[str, int]:
+        """Count the shards by status.
+
+        Raises:
+            CustomException: If the coordinator cannot be reached.
+
+        Returns:
+            Dict[str, int]: Shard counts of every status.
+        """
+        try:
+            counts = {PENDING: 0, LEASED: 0, DONE: 0}
+            for shard in self.shards():
+                counts[shard.status] += 1
+            return counts
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def result_paths(self) -> List[str]:
+        """Get the result paths of all shards in shard order.
+
+        Raises:
+            CustomException: If a shard is not done yet.
+
+        Returns:
+            List[str]: The result paths.
+        """
+        try:
+            shards = self.shards()
+            unfinished = [s.shard_id for s in shards if s.status != DONE]
+            if unfinished:
+                raise ValueError(f"Shards {unfinished} are not done yet")
+            return [shard.result_path for shard in shards]
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    @abstractmethod
+    def _insert_shards(self, shards: List[Shard]) -> int:
+        """Insert shards whose id is not recorded yet.
+
+        Args:
+            shards (List[Shard]): The shards of the job.
+
+        Returns:
+            int: The number of inserted shards.
+        """
+
+    @abstractmethod
+    def _lease(
+        self, owner: str, now: float, lease_seconds: float
+    ) -> Optional[Shard]:
+        """Atomically lease the first leasable shard.
+
+        Args:
+            owner (str): Identifier of the leasing worker.
+            now (float): The current epoch time.
+            lease_seconds (float): How long the lease lasts.
+
+        Returns:
+            Optional[Shard]: The leased shard, if any.
+        """
+
+    @abstractmethod
+    def _renew(self, shard_id: int, owner: str, expires: float) -> bool:
+        """Move the lease expiry of a shard held by the owner.
+
+        Args:
+            shard_id (int): The leased shard.
+            owner (str): Identifier of the leasing worker.
+            expires (float): The new epoch expiry.
+
+        Returns:
+            bool: True if the owner still held the lease.
+        """
+
+    @abstractmethod
+    def _complete(self, shard_id: int, owner: str, result_path: str) -> bool:
+        """Mark a shard held by the owner as done.
+
+        Args:
+            shard_id (int): The leased shard.
+            owner (str): Identifier of the leasing worker.
+            result_path (str): Where the result was committed.
+
+        Returns:
+            bool: True if the owner still held the lease.
+        """
+
+    @abstractmethod
+    def shards(self) -> List[Shard]:
+        """List all shards in shard order.
+
+        Returns:
+            List[Shard]: The shards.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every shard."""
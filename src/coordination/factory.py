@@ -0,0 +1,42 @@
+"""
+Module for selecting a shard coordinator backend from configuration.
+"""
+import sys
+
+from src.coordination.base import ShardCoordinator
+from src.coordination.mongodb_coordinator import MongoDBCoordinator
+from src.coordination.sqlite_coordinator import SQLiteCoordinator
+from src.interface.config import CoordinationConfig, MongoDBConfig
+from src.middleware.exception import CustomException
+
+
+def get_shard_coordinator(
+    coordination_config: CoordinationConfig, mongodb_config: MongoDBConfig
+) -> ShardCoordinator:
+    """Create the shard coordinator selected by the configuration.
+
+    Args:
+        coordination_config (CoordinationConfig): Backend selection and
+        local paths.
+        mongodb_config (MongoDBConfig): Settings for the MongoDB backend.
+
+    Raises:
+        CustomException: If the backend name is unknown.
+
+    Returns:
+        ShardCoordinator: The configured shard coordinator.
+    """
+    try:
+        backend = coordination_config.backend.lower()
+        if backend == "mongodb":
+            return MongoDBCoordinator(
+                mongodb_config, coordination_config.table_name
+            )
+        if backend == "sqlite":
+            return SQLiteCoordinator(
+                coordination_config.sqlite_path, coordination_config.table_name
+            )
+        raise ValueError(f"Unknown shard coordinator backend: {backend}")
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
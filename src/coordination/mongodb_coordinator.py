@@ -0,0 +1,112 @@
+"""
+Module for the MongoDB shard coordinator, for workers on several nodes.
+"""
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+
+from src.coordination.base import DONE, LEASED, PENDING, Shard, ShardCoordinator
+from src.interface.config import MongoDBConfig
+
+
+class MongoDBCoordinator(ShardCoordinator):
+    """Shard coordinator backed by a MongoDB collection.
+
+    Every transition is a single-document conditional update, which
+    MongoDB applies atomically, so two workers never lease the same shard.
+    """
+
+    name = "MongoDB coordinator"
+
+    def __init__(
+        self, mongodb_config: MongoDBConfig, collection_name: str = "shards"
+    ) -> None:
+        """Initialize the MongoDB coordinator.
+
+        Args:
+            mongodb_config (MongoDBConfig): Connection settings.
+            collection_name (str, optional): Name of the shard collection.
+            Defaults to "shards".
+        """
+        self.mongodb_config = mongodb_config
+        self.collection_name = collection_name
+        self._client: Optional[MongoClient[Dict[str, Any]]] = None
+
+    def get_collection(self) -> Any:
+        """Get the shard collection, connecting on first use.
+
+        Returns:
+            Any: The pymongo collection.
+        """
+        if self._client is None:
+            self._client = MongoClient(
+                self.mongodb_config.mongodb_connection_string
+            )
+        database = self._client[self.mongodb_config.database_name]
+        return database[self.collection_name]
+
+    def _insert_shards(self, shards: List[Shard]) -> int:
+        if not shards:
+            return 0
+        result = self.get_collection().bulk_write(
+            [
+                UpdateOne(
+                    {"_id": shard.shard_id},
+                    {"$setOnInsert": asdict(shard)},
+                    upsert=True,
+                )
+                for shard in shards
+            ],
+            ordered=False,
+        )
+        return int(result.upserted_count)
+
+    def _lease(
+        self, owner: str, now: float, lease_seconds: float
+    ) -> Optional[Shard]:
+        document = self.get_collection().find_one_and_update(
+            {
+                "$or": [
+                    {"status": PENDING},
+                    {"status": LEASED, "lease_expires": {"$lt": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": LEASED,
+                    "owner": owner,
+                    "lease_expires": now + lease_seconds,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("_id", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if document is None:
+            return None
+        document.pop("_id")
+        return Shard(**document)
+
+    def _renew(self, shard_id: int, owner: str, expires: float) -> bool:
+        result = self.get_collection().update_one(
+            {"_id": shard_id, "owner": owner, "status": LEASED},
+            {"$set": {"lease_expires": expires}},
+        )
+        return bool(result.matched_count == 1)
+
+    def _complete(self, shard_id: int, owner: str, result_path: str) -> bool:
+        result = self.get_collection().update_one(
+            {"_id": shard_id, "owner": owner, "status": LEASED},
+            {"$set": {"status": DONE, "result_path": result_path}},
+        )
+        return bool(result.matched_count == 1)
+
+    def shards(self) -> List[Shard]:
+        documents = self.get_collection().find(
+            {}, {"_id": 0}, sort=[("_id", 1)]
+        )
+        return [Shard(**document) for document in documents]
+
+    def clear(self) -> None:
+        self.get_collection().drop()
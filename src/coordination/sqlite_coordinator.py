@@ -0,0 +1,158 @@
+"""
+Module for the SQLite shard coordinator, for workers on one machine or a
+shared file system.
+"""
+import os
+import sqlite3
+from typing import List, Optional
+
+from src.coordination.base import DONE, LEASED, PENDING, Shard, ShardCoordinator
+
+COLUMNS = [
+    "shard_id",
+    "start",
+    "end",
+    "status",
+    "owner",
+    "lease_expires",
+    "attempts",
+    "result_path",
+]
+
+
+class SQLiteCoordinator(ShardCoordinator):
+    """Shard coordinator backed by a table in a SQLite database.
+
+    Leases are taken inside `BEGIN IMMEDIATE` transactions, which hold the
+    database write lock, so two workers never lease the same shard.
+    """
+
+    name = "SQLite coordinator"
+
+    def __init__(self, database_path: str, table_name: str = "shards") -> None:
+        """Initialize the SQLite coordinator.
+
+        Args:
+            database_path (str): Path of the SQLite database file.
+            table_name (str, optional): Name of the shard table.
+            Defaults to "shards".
+        """
+        self.database_path = database_path
+        self.table_name = table_name
+
+    def connect(self) -> sqlite3.Connection:
+        """Open an autocommit connection and create the shard table.
+
+        Returns:
+            sqlite3.Connection: The open connection.
+        """
+        directory = os.path.dirname(self.database_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(
+            self.database_path, timeout=60, isolation_level=None
+        )
+        connection.execute(
+            f'CREATE TABLE IF NOT EXISTS "{self.table_name}" ('
+            "shard_id INTEGER PRIMARY KEY, start INTEGER, end INTEGER, "
+            "status TEXT, owner TEXT, lease_expires REAL, "
+            "attempts INTEGER, result_path TEXT)"
+        )
+        return connection
+
+    def _insert_shards(self, shards: List[Shard]) -> int:
+        connection = self.connect()
+        try:
+            cursor = connection.executemany(
+                f'INSERT OR IGNORE INTO "{self.table_name}" '
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                [
+                    tuple(getattr(shard, column) for column in COLUMNS)
+                    for shard in shards
+                ],
+            )
+            return int(cursor.rowcount)
+        finally:
+            connection.close()
+
+    def _lease(
+        self, owner: str, now: float, lease_seconds: float
+    ) -> Optional[Shard]:
+        connection = self.connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                f'SELECT {", ".join(COLUMNS)} FROM "{self.table_name}" '
+                "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                "ORDER BY shard_id LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+            shard = Shard(*row)
+            shard.status = LEASED
+            shard.owner = owner
+            shard.lease_expires = now + lease_seconds
+            shard.attempts += 1
+            connection.execute(
+                f'UPDATE "{self.table_name}" SET status = ?, owner = ?, '
+                "lease_expires = ?, attempts = ? WHERE shard_id = ?",
+                (
+                    shard.status,
+                    shard.owner,
+                    shard.lease_expires,
+                    shard.attempts,
+                    shard.shard_id,
+                ),
+            )
+            connection.execute("COMMIT")
+            return shard
+        except Exception:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+    def _renew(self, shard_id: int, owner: str, expires: float) -> bool:
+        connection = self.connect()
+        try:
+            cursor = connection.execute(
+                f'UPDATE "{self.table_name}" SET lease_expires = ? '
+                "WHERE shard_id = ? AND owner = ? AND status = ?",
+                (expires, shard_id, owner, LEASED),
+            )
+            return cursor.rowcount == 1
+        finally:
+            connection.close()
+
+    def _complete(self, shard_id: int, owner: str, result_path: str) -> bool:
+        connection = self.connect()
+        try:
+            cursor = connection.execute(
+                f'UPDATE "{self.table_name}" SET status = ?, result_path = ? '
+                "WHERE shard_id = ? AND owner = ? AND status = ?",
+                (DONE, result_path, shard_id, owner, LEASED),
+            )
+            return cursor.rowcount == 1
+        finally:
+            connection.close()
+
+    def shards(self) -> List[Shard]:
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                f'SELECT {", ".join(COLUMNS)} FROM "{self.table_name}" '
+                "ORDER BY shard_id"
+            ).fetchall()
+            return [Shard(*row) for row in rows]
+        finally:
+            connection.close()
+
+    def clear(self) -> None:
+        connection = self.connect()
+        try:
+            connection.execute(f'DROP TABLE IF EXISTS "{self.table_name}"')
+        finally:
+            connection.close()
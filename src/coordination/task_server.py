@@ -0,0 +1,412 @@
+"""
+Module for distributing hyperparameter search tasks across hosts.
+
+A task server holds a queue of `(params, fold)` tasks and the payload and
+scores of every search job, and serves them over TCP with a
+`multiprocessing` manager. Workers on any host connect with the shared
+auth key, take tasks, fit and score them, and record their scores.
+
+The coordinator, the process running the search, works on the queue too,
+so a search finishes without any worker, and it runs tasks whose worker
+went silent itself. Without an auth key, or when no server can be reached
+or started, the same queues live in process.
+"""
+import itertools
+import pickle
+import queue
+import sys
+import threading
+import time
+import uuid
+from multiprocessing.managers import BaseManager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import KFold, ParameterGrid
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+from src.utils.model_search import Array, SearchResult
+
+Task = Tuple[str, int, Dict[str, Any], int]
+MAX_CACHED_PAYLOADS = 8
+
+
+class JobStore:
+    """Payloads and scores of the search jobs served by a task server."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._lock = threading.Lock()
+        self._payloads: Dict[str, Any] = {}
+        self._results: Dict[str, Dict[int, Tuple[Any, Any]]] = {}
+
+    def put(self, job_id: str, payload: Any) -> None:
+        """Record the payload of a new job."""
+        with self._lock:
+            self._payloads[job_id] = payload
+            self._results[job_id] = {}
+
+    def payload(self, job_id: str) -> Any:
+        """Get the payload of a job, None once it was removed."""
+        with self._lock:
+            return self._payloads.get(job_id)
+
+    def add_result(
+        self,
+        job_id: str,
+        task_id: int,
+        score: Optional[float],
+        error: Optional[str],
+    ) -> None:
+        """Record the score, or error, of a task of a running job."""
+        with self._lock:
+            if job_id in self._results:
+                self._results[job_id].setdefault(task_id, (score, error))
+
+    def results(self, job_id: str) -> Dict[int, Tuple[Any, Any]]:
+        """Get the scores and errors of the finished tasks of a job."""
+        with self._lock:
+            return dict(self._results.get(job_id, {}))
+
+    def remove(self, job_id: str) -> None:
+        """Forget a finished job."""
+        with self._lock:
+            self._payloads.pop(job_id, None)
+            self._results.pop(job_id, None)
+
+
+_STATE: Dict[str, Any] = {}
+
+
+def _shared_tasks() -> queue.Queue[Task]:
+    """Get the task queue of the serving process."""
+    tasks: queue.Queue[Task] = _STATE.setdefault("tasks", queue.Queue())
+    return tasks
+
+
+def _shared_jobs() -> JobStore:
+    """Get the job store of the serving process."""
+    jobs: JobStore = _STATE.setdefault("jobs", JobStore())
+    return jobs
+
+
+class TaskManager(BaseManager):
+    """Manager serving the task queue and job store over TCP."""
+
+    # Set by `register`, they return proxies of the shared objects
+    tasks: Callable[[], Any]
+    jobs: Callable[[], Any]
+
+
+TaskManager.register("tasks", callable=_shared_tasks)
+TaskManager.register("jobs", callable=_shared_jobs)
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """Split a "host:port" address.
+
+    Args:
+        address (str): The address.
+
+    Returns:
+        Tuple[str, int]: The host and port.
+    """
+    host, port = address.rsplit(":", 1)
+    return host, int(port)
+
+
+class TaskServer:
+    """The task queue and job store of a search, remote or in process."""
+
+    def __init__(self, address: str = "", authkey: str = "") -> None:
+        """Initialize the task server.
+
+        Args:
+            address (str, optional): "host:port" of the task server.
+            Defaults to "".
+            authkey (str, optional): Key shared with the workers; the
+            queues stay in process when empty. Defaults to "".
+        """
+        self.address = address
+        self.authkey = authkey
+        self.manager: Optional[TaskManager] = None
+        self.started = False
+        self.tasks: Any = queue.Queue()
+        self.jobs: Any = JobStore()
+
+    @property
+    def remote(self) -> bool:
+        """Whether workers of other processes can reach the queues."""
+        return self.manager is not None
+
+    def __enter__(self) -> "TaskServer":
+        """Connect to a running task server, or start one.
+
+        Returns:
+            TaskServer: The task server, in process if neither worked.
+        """
+        if not self.authkey:
+            logger.info("No task server auth key, searching in process")
+            return self
+        manager = TaskManager(
+            parse_address(self.address), authkey=self.authkey.encode()
+        )
+        try:
+            manager.connect()
+        except ConnectionError:
+            try:
+                manager.start()
+                self.started = True
+            except (OSError, EOFError) as error:
+                logger.info(
+                    "Task server unavailable, searching in process: %s",
+                    error,
+                )
+                return self
+        self.manager = manager
+        self.tasks, self.jobs = manager.tasks(), manager.jobs()
+        logger.info("Serving search tasks at %s", self.address)
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        """Shut down the task server if this process started it."""
+        if self.started and self.manager is not None:
+            self.manager.shutdown()
+        self.manager, self.started = None, False
+
+    def pack(self, payload: Dict[str, Any]) -> Any:
+        """Prepare a payload for the job store.
+
+        Remote payloads are pickled once here rather than by every worker
+        request; in-process workers share the objects.
+        """
+        return pickle.dumps(payload) if self.remote else payload
+
+
+def run_task(
+    payload: Dict[str, Any], params: Dict[str, Any], fold: int
+) -> float:
+    """Fit one candidate on one fold and score it.
+
+    Args:
+        payload (Dict[str, Any]): The estimator, data and folds of the job.
+        params (Dict[str, Any]): The candidate parameters.
+        fold (int): Index of the fold.
+
+    Returns:
+        float: The score on the held-out part of the fold.
+    """
+    train, test = payload["folds"][fold]
+    X, y = payload["X"], payload["y"]
+    model = clone(payload["estimator"]).set_params(**params)
+    model.fit(X[train], y[train])
+    return float(model.score(X[test], y[test]))
+
+
+def work_one(
+    server: TaskServer, payloads: Dict[str, Any], timeout: float
+) -> bool:
+    """Take one task of any job from the queue and record its score.
+
+    Args:
+        server (TaskServer): The task server.
+        payloads (Dict[str, Any]): Payloads this worker already fetched,
+        updated in place.
+        timeout (float): Seconds to wait for a task.
+
+    Returns:
+        bool: False if no task arrived in time.
+    """
+    try:
+        job_id, task_id, params, fold = server.tasks.get(timeout=timeout)
+    except queue.Empty:
+        return False
+    payload = payloads.get(job_id)
+    if payload is None:
+        payload = server.jobs.payload(job_id)
+        if payload is None:
+            # The job finished without this task
+            return True
+        if isinstance(payload, bytes):
+            payload = pickle.loads(payload)
+        while len(payloads) >= MAX_CACHED_PAYLOADS:
+            payloads.pop(next(iter(payloads)))
+        payloads[job_id] = payload
+    try:
+        score, error = run_task(payload, params, fold), None
+    except Exception as task_error:  # pylint: disable=broad-except
+        score, error = None, repr(task_error)
+    server.jobs.add_result(job_id, task_id, score, error)
+    return True
+
+
+def distributed_search(
+    estimator: Any,
+    param_grid: Dict[str, List[Any]],
+    X: Array,
+    y: Array,
+    server: TaskServer,
+    cv: int = 3,
+    random_state: int = 42,
+    task_timeout: float = 300.0,
+    work_locally: bool = True,
+) -> SearchResult:
+    """Cross-validate a parameter grid on the workers of a task server.
+
+    Every candidate and fold is one task. The coordinator takes tasks
+    from the queue as well unless `work_locally` is off, and runs every
+    task still missing once no score arrived for `task_timeout` seconds.
+    The best candidate is refit on all rows in process.
+
+    Args:
+        estimator (Any): The scikit-learn estimator to tune.
+        param_grid (Dict[str, List[Any]]): The parameter grid.
+        X (np.ndarray): The training features.
+        y (np.ndarray): The training target.
+        server (TaskServer): The entered task server.
+        cv (int, optional): Cross-validation folds. Defaults to 3.
+        random_state (int, optional): Seed of the folds. Defaults to 42.
+        task_timeout (float, optional): Seconds without progress before
+        the missing tasks run in process. Defaults to 300.0.
+        work_locally (bool, optional): Take tasks from the queue while
+        waiting. Defaults to True.
+
+    Raises:
+        CustomException: If a task fails or the search cannot run.
+
+    Returns:
+        SearchResult: The best candidate and its refit estimator.
+    """
+    try:
+        candidates = list(ParameterGrid(param_grid))
+        folds = list(
+            KFold(cv, shuffle=True, random_state=random_state).split(X)
+        )
+        payload = {"estimator": estimator, "X": X, "y": y, "folds": folds}
+        tasks: List[Task] = []
+        job_id = uuid.uuid4().hex
+        for task_id, (params, fold) in enumerate(
+            itertools.product(candidates, range(cv))
+        ):
+            tasks.append((job_id, task_id, params, fold))
+
+        server.jobs.put(job_id, server.pack(payload))
+        for task in tasks:
+            server.tasks.put(task)
+        logger.info("Queued %s search tasks of job %s", len(tasks), job_id)
+
+        payloads = {job_id: payload}
+        results: Dict[int, Tuple[Any, Any]] = {}
+        progressed = time.monotonic()
+        while len(results) < len(tasks):
+            if not (work_locally and work_one(server, payloads, 0.05)):
+                time.sleep(0.05)
+            finished = server.jobs.results(job_id)
+            if len(finished) > len(results):
+                progressed = time.monotonic()
+            results = finished
+            if time.monotonic() - progressed > task_timeout:
+                logger.info("Search workers went silent, running the rest")
+                for _, task_id, params, fold in tasks:
+                    if task_id not in results:
+                        server.jobs.add_result(
+                            job_id,
+                            task_id,
+                            run_task(payload, params, fold),
+                            None,
+                        )
+                progressed = time.monotonic()
+        server.jobs.remove(job_id)
+
+        scores = np.zeros((len(candidates), cv))
+        for task_id, (score, error) in results.items():
+            if error is not None:
+                raise ValueError(f"Search task {task_id} failed: {error}")
+            scores[divmod(task_id, cv)] = score
+        best = int(np.argmax(scores.mean(axis=1)))
+        best_estimator = clone(estimator).set_params(**candidates[best])
+        best_estimator.fit(X, y)
+        return SearchResult(
+            candidates[best],
+            float(scores[best].mean()),
+            best_estimator,
+            len(X),
+            trials_run=len(tasks),
+        )
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def run_worker(
+    address: str, authkey: str, idle_seconds: Optional[float] = None
+) -> int:
+    """Work on the tasks of a task server until it goes away.
+
+    Args:
+        address (str): "host:port" of the task server.
+        authkey (str): Key shared with the coordinator.
+        idle_seconds (Optional[float], optional): Stop after this long
+        without a task, never when None. Defaults to None.
+
+    Raises:
+        CustomException: If the server cannot be reached.
+
+    Returns:
+        int: The number of tasks this worker ran.
+    """
+    try:
+        server = TaskServer(address, authkey)
+        manager = TaskManager(parse_address(address), authkey=authkey.encode())
+        manager.connect()
+        server.tasks, server.jobs = manager.tasks(), manager.jobs()
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+    done, idle_since = 0, time.monotonic()
+    payloads: Dict[str, Any] = {}
+    try:
+        while True:
+            if work_one(server, payloads, 1.0):
+                done, idle_since = done + 1, time.monotonic()
+                continue
+            idle = time.monotonic() - idle_since
+            if idle_seconds is not None and idle > idle_seconds:
+                break
+    except (EOFError, ConnectionError):
+        logger.info("Task server at %s went away", address)
+    return done
+
+
+def serve(address: str, authkey: str) -> None:
+    """Run a task server in the foreground, for coordinators to reuse.
+
+    Args:
+        address (str): "host:port" to listen on.
+        authkey (str): Key shared with coordinators and workers.
+    """
+    manager = TaskManager(parse_address(address), authkey=authkey.encode())
+    logger.info("Serving search tasks at %s", address)
+    manager.get_server().serve_forever()
+
+
+if __name__ == "__main__":
+    from src.interface.config import ModelTrainerConfig
+
+    trainer_config = ModelTrainerConfig()
+    if not trainer_config.task_server_authkey:
+        raise CustomException("Set TASK_SERVER_AUTHKEY first", sys)
+    mode = sys.argv[1] if len(sys.argv) > 1 else "work"
+    if mode == "serve":
+        serve(
+            trainer_config.task_server_address,
+            trainer_config.task_server_authkey,
+        )
+    elif mode == "work":
+        run_worker(
+            trainer_config.task_server_address,
+            trainer_config.task_server_authkey,
+        )
+    else:
+        raise CustomException("Usage: task_server [serve|work]", sys)
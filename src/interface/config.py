@@ -1,5 +1,6 @@
 """
-Module for configuration classes related to file paths and MongoDB settings.
+Module for configuration classes related to file paths, MongoDB and
+dataset store settings.
 """
 import os
 import sys
@@ -61,22 +62,199 @@ class CustomData:
 
 @dataclass
 class FilePathConfig:
-    """Configuration class for file paths."""
+    """Configuration class for file paths.
+
+    The extension of the train and test paths picks their format:
+    ".parquet", ".feather" or ".csv".
+    """
 
     database_url: str = "https://www.kaggle.com/datasets/wjburns/common-password-list-rockyoutxt"
     raw_data_path: str = os.path.join(
         "common-password-list-rockyoutxt", "rockyou.txt"
     )
-    train_data_path: str = os.path.join("artifacts", "train.csv")
-    test_data_path: str = os.path.join("artifacts", "test.csv")
+    raw_data_checksum: str = config.get("RAW_DATA_SHA256") or ""
+    raw_cache_dir: str = os.path.join("artifacts", "raw_cache")
+    train_data_path: str = os.path.join("artifacts", "train.parquet")
+    test_data_path: str = os.path.join("artifacts", "test.parquet")
+    report_path: str = os.path.join("artifacts", "data_report.json")
+    features_dir: str = os.path.join("artifacts", "features")
+    feature_store_dir: str = os.path.join("artifacts", "feature_store")
     preprocessor_path: str = os.path.join("artifacts", "preprocessor.pkl")
     model_path: str = os.path.join("artifacts", "model.pkl")
+    checkpoint_dir: str = os.path.join("artifacts", "runs")
+    ingest_cursor_path: str = os.path.join("artifacts", "ingest_cursor.json")
+    search_cache_dir: str = os.path.join("artifacts", "search_cache")
+    model_report_path: str = os.path.join("artifacts", "model_report.json")
+    bundle_dir: str = os.path.join("artifacts", "bundle")
 
 
 @dataclass
 class MongoDBConfig:
     """Configuration class for MongoDB."""
 
-    mongodb_connection_string: str = config["MONGODB_CONN_STRING"]
+    mongodb_connection_string: str = (
+        config.get("MONGODB_CONN_STRING") or "mongodb://localhost:27017/"
+    )
     database_name: str = "passwordometer"
     collection_name: str = "password_dataset"
+
+
+@dataclass
+class DatasetStoreConfig:
+    """Configuration class for the dataset store backend.
+
+    `backend` is one of "mongodb", "parquet" or "sqlite". With
+    `incremental_push`, opted into with `INCREMENTAL_PUSH=true`, the
+    pipeline syncs rows keyed by password hash instead of appending the
+    whole sample on every run. A positive
+    `ingest_sample_per_bin` makes ingestion draw a stratified sample of
+    that many rows per strength bin from the store instead of reading it
+    whole.
+    """
+
+    backend: str = config.get("DATASET_STORE") or "mongodb"
+    incremental_push: bool = (
+        config.get("INCREMENTAL_PUSH") or "false"
+    ).lower() == "true"
+    parquet_dir: str = os.path.join("artifacts", "dataset_store")
+    sqlite_path: str = os.path.join("artifacts", "dataset.sqlite")
+    table_name: str = "password_dataset"
+    ingest_sample_per_bin: int = 0
+    ingest_num_bins: int = 10
+
+
+@dataclass
+class ModelTrainerConfig:
+    """Configuration class for the hyperparameter search and selection.
+
+    `search_mode` is "grid" for an exhaustive `GridSearchCV`, "halving"
+    for successive halving on sample size that starts no trial after
+    `time_budget` seconds (0 for no limit) and caches its trials under
+    `FilePathConfig.search_cache_dir`, or "distributed" for a grid search
+    whose folds run on workers of the task server at `task_server_address`
+    that share `task_server_authkey`. Without a key it runs in process.
+
+    The most accurate candidate whose single-row p99 predict latency is at
+    most `max_p99_latency_ms` and whose pickled size is at most
+    `max_artifact_bytes` is selected, 0 disables a budget.
+
+    With `training_mode` "incremental" the search is replaced by an
+    `incremental_estimator` ("sgd" or "mlp") trained out of core, holding
+    `incremental_block_rows` rows in memory at a time. With `warm_start`
+    it continues the deployed incremental model on the rows appended to
+    the train set since that model was trained.
+    """
+
+    search_mode: str = config.get("SEARCH_MODE") or "grid"
+    cv: int = 3
+    halving_factor: int = 3
+    time_budget: float = float(config.get("SEARCH_TIME_BUDGET") or 0)
+    random_state: int = 42
+    max_p99_latency_ms: float = float(config.get("MAX_P99_LATENCY_MS") or 0)
+    max_artifact_bytes: int = int(config.get("MAX_ARTIFACT_BYTES") or 0)
+    training_mode: str = config.get("TRAINING_MODE") or "search"
+    incremental_estimator: str = config.get("INCREMENTAL_ESTIMATOR") or "sgd"
+    incremental_block_rows: int = 50_000
+    incremental_epochs: int = 5
+    warm_start: bool = (config.get("WARM_START") or "false").lower() == "true"
+    task_server_address: str = (
+        config.get("TASK_SERVER_ADDRESS") or "127.0.0.1:50000"
+    )
+    task_server_authkey: str = config.get("TASK_SERVER_AUTHKEY") or ""
+    task_timeout: float = 300.0
+
+
+@dataclass
+class CoordinationConfig:
+    """Configuration class for distributed data preparation.
+
+    `backend` is "sqlite" for workers sharing a machine or file system, or
+    "mongodb" for workers on several nodes. Workers renew their lease every
+    third of `lease_seconds`; shards whose lease expired are handed to
+    other workers. Shard results are written under `results_dir`, which
+    must be shared by all workers.
+    """
+
+    backend: str = config.get("COORDINATION_BACKEND") or "sqlite"
+    sqlite_path: str = os.path.join("artifacts", "coordination.sqlite")
+    table_name: str = "shards"
+    num_shards: int = 64
+    lease_seconds: float = 300.0
+    poll_seconds: float = 5.0
+    results_dir: str = os.path.join("artifacts", "shards")
+
+
+@dataclass
+class DataSplitConfig:
+    """Configuration class for the train/test split.
+
+    `mode` is "random" for a shuffled `train_test_split`, or "hash" for a
+    deterministic split by password hash that streams over the dataset
+    store and keeps every row on its side as the dataset grows.
+    """
+
+    mode: str = config.get("SPLIT_MODE") or "random"
+    test_size: float = 0.2
+    random_state: int = 42
+    chunk_size: int = 100_000
+    num_bins: int = 10
+
+
+@dataclass
+class DataTransformationConfig:
+    """Configuration class for the feature transformation.
+
+    `mode` is "memory" to transform the whole train and test sets at once,
+    or "chunked" to transform them chunk by chunk into memory-mapped
+    feature and target arrays under `FilePathConfig.features_dir`.
+    "shards" builds the same arrays from the full corpus the shard workers
+    prepared, split by password hash, instead of the ingested sample. In
+    memory mode, features are looked up in the feature store under
+    `FilePathConfig.feature_store_dir`, bounded by
+    `feature_store_max_bytes`; 0 disables it.
+    """
+
+    mode: str = config.get("TRANSFORM_MODE") or "memory"
+    chunk_size: int = 100_000
+    feature_store_max_bytes: int = int(
+        config.get("FEATURE_STORE_MAX_BYTES") or (1 << 30)
+    )
+
+
+@dataclass
+class RetrainConfig:
+    """Configuration class for retraining in the background of the API.
+
+    The admin endpoints are disabled unless `admin_token` is set. The
+    retrain process runs at niceness `nice`, on the comma-separated `cpus`
+    (all when empty) with `threads` threads for the numeric libraries and
+    joblib, and is killed after `max_cpu_seconds` of CPU time (0 for no
+    limit).
+    """
+
+    admin_token: str = config.get("ADMIN_TOKEN") or ""
+    nice: int = int(config.get("RETRAIN_NICE") or 10)
+    cpus: str = config.get("RETRAIN_CPUS") or ""
+    threads: int = int(config.get("RETRAIN_THREADS") or 1)
+    max_cpu_seconds: int = int(config.get("RETRAIN_MAX_CPU_SECONDS") or 0)
+    status_path: str = os.path.join("artifacts", "retrain_status.json")
+    lock_path: str = os.path.join("artifacts", "retrain.lock")
+
+
+@dataclass
+class ServingConfig:
+    """Configuration class for the model registry of the API.
+
+    `/predict` is served by the current bundle version. A `shadow_fraction`
+    of the requests is also scored by the `shadow_version` bundle on a
+    background thread, with at most `shadow_max_pending` requests queued
+    and the rest skipped. Shadow predictions within `shadow_tolerance` of
+    the served strength count as agreeing. Latency percentiles are taken
+    over the last `latency_window` requests of every version.
+    """
+
+    shadow_version: str = config.get("SHADOW_VERSION") or ""
+    shadow_fraction: float = float(config.get("SHADOW_FRACTION") or 0.1)
+    shadow_tolerance: float = 0.05
+    shadow_max_pending: int = 100
+    latency_window: int = 1000
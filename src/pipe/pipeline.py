@@ -3,19 +3,32 @@ A pipeline for data ingestion, transformation, model training,
 and prediction.
 """
 
+import json
+import os
 import sys
-from typing import Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
 
 import pandas as pd
 
 from src.components.data_ingestion import DataIngestion
 from src.components.data_pusher import DataPusher
 from src.components.data_transformation import DataTransformation
-from src.components.model_trainer import ModelTrainer
-from src.interface.config import CustomData, FilePathConfig
+from src.components.model_trainer import ModelTrainer, TrainingData
+from src.coordination.factory import get_shard_coordinator
+from src.interface.config import (
+    CoordinationConfig,
+    CustomData,
+    FilePathConfig,
+    MongoDBConfig,
+    ServingConfig,
+)
 from src.middleware.exception import CustomException
 from src.middleware.logger import logger
-from src.utils.file_manager import load_object
+from src.utils.checkpoint import RunCheckpoint
+from src.utils.file_manager import load_object, save_object
+from src.utils.model_bundle import live_bundle, load_bundle, publish_bundle
+from src.utils.model_cache import model_cache
 
 
 class Pipeline:
@@ -31,57 +44,369 @@ class Pipeline:
         self.model_trainer = ModelTrainer()
         self.filepath_config = FilePathConfig()
 
-    def push_data(self) -> None:
-        """Push data to MongoDB, perform data ingestion, and generate
+    def _get_checkpoint(
+        self, run_id: Optional[str]
+    ) -> Optional[RunCheckpoint]:
+        """Open the checkpoint of a run.
+
+        Args:
+            run_id (Optional[str]): Identifier of the run, or None to run
+            without checkpoints.
+
+        Returns:
+            Optional[RunCheckpoint]: The run checkpoint, if any.
+        """
+        if run_id is None:
+            return None
+        return RunCheckpoint(run_id, self.filepath_config.checkpoint_dir)
+
+    def _persist_to_store(
+        self, df: pd.DataFrame, checkpoint: Optional[RunCheckpoint] = None
+    ) -> None:
+        """Sync or push the labeled sample to the dataset store.
+
+        Args:
+            df (pd.DataFrame): The labeled sample.
+            checkpoint (Optional[RunCheckpoint], optional): Checkpoint of
+            the run, for resumable pushes. Defaults to None.
+        """
+        if self.data_pusher.store_config.incremental_push:
+            # Syncs only transfer missing rows, so they resume as is
+            self.data_pusher.sync_to_store(df)
+        else:
+            self.data_pusher.push_to_store(df, checkpoint=checkpoint)
+
+    def push_data(self, run_id: Optional[str] = None) -> None:
+        """Push data to the dataset store, perform data ingestion, and generate
         data report.
 
+        Args:
+            run_id (Optional[str], optional): Identifier of a resumable run.
+            Re-invoking the same run continues from its last checkpoint.
+            Defaults to None.
+
         Raises:
             CustomException: If there is an error during the data push,
             data ingestion, or data report generation.
         """
         try:
-            df = self.data_pusher.initiate_data_push()
-            self.data_pusher.push_to_mongodb(df)
-            dataframe = self.data_pusher.get_data_from_mongodb()
-            self.data_ingestion.initiate_data_ingestion(dataframe)
-            self.data_ingestion.data_report()
+            checkpoint = self._get_checkpoint(run_id)
+
+            if checkpoint is not None and checkpoint.is_done("data_push"):
+                df = checkpoint.load_frame("sample")
+            else:
+                df = self.data_pusher.initiate_data_push(checkpoint=checkpoint)
+                if checkpoint is not None:
+                    checkpoint.save_frame("sample", df)
+                    checkpoint.mark_done("data_push", rows=len(df))
+
+            if checkpoint is None or not checkpoint.is_done("store"):
+                self._persist_to_store(df, checkpoint)
+                if checkpoint is not None:
+                    checkpoint.mark_done("store")
 
+            if checkpoint is None or not checkpoint.is_done("ingestion"):
+                # Rows added from here on are left to `ingest_changes`
+                cursor = self.data_pusher.dataset_store.changes_cursor()
+                store_config = self.data_pusher.store_config
+                split_config = self.data_ingestion.split_config
+                if store_config.ingest_sample_per_bin > 0:
+                    dataframe = self.data_pusher.get_sample_from_store(
+                        store_config.ingest_sample_per_bin,
+                        store_config.ingest_num_bins,
+                    )
+                    self.data_ingestion.initiate_data_ingestion(dataframe)
+                elif split_config.mode == "hash":
+                    self.data_ingestion.ingest_stream(
+                        self.data_pusher.dataset_store.iter_chunks(
+                            split_config.chunk_size
+                        )
+                    )
+                else:
+                    dataframe = self.data_pusher.get_data_from_store()
+                    self.data_ingestion.initiate_data_ingestion(dataframe)
+                self.data_ingestion.data_report()
+                self._save_ingest_cursor(cursor)
+                if checkpoint is not None:
+                    checkpoint.mark_done("ingestion")
         except Exception as error:
             raise CustomException(error, sys) from error
 
-    def train(self) -> None:
+    def train(self, run_id: Optional[str] = None) -> None:
         """Perform data transformation, model training, and select the
         best model.
 
+        Args:
+            run_id (Optional[str], optional): Identifier of a resumable run.
+            Transformed arrays of an earlier attempt of the same run are
+            reused. Defaults to None.
+
         Raises:
             CustomException: If there is an error during the data
             transformation or model training.
         """
         try:
-            transformer_obj = (
-                self.data_transformation.get_data_transformer_object(
-                    features=["password"]
+            checkpoint = self._get_checkpoint(run_id)
+            if checkpoint is not None and checkpoint.is_done("training"):
+                logger.info("Run %s is already trained", run_id)
+                return
+
+            mode = self.data_transformation.transformation_config.mode
+            transformer_obj = None
+            train_arr: TrainingData
+            test_arr: TrainingData
+            if checkpoint is not None and checkpoint.is_done("transformation"):
+                # Resume with the arrays of the mode the run was started in
+                state = checkpoint.stage("transformation")
+                if state.get("mode", "memory") in ("chunked", "shards"):
+                    train_arr = self.data_transformation.load_features("train")
+                    test_arr = self.data_transformation.load_features("test")
+                else:
+                    train_arr = checkpoint.load_array("train_arr")
+                    test_arr = checkpoint.load_array("test_arr")
+            else:
+                transformer_obj = (
+                    self.data_transformation.get_data_transformer_object(
+                        features=["password"]
+                    )
                 )
-            )
-            (
-                train_arr,
-                test_arr,
-                _,
-            ) = self.data_transformation.initiate_data_transformation(
-                target="strength", transformer=transformer_obj
-            )
+                if mode == "shards":
+                    (
+                        train_arr,
+                        test_arr,
+                        _,
+                    ) = self.data_transformation.initiate_shard_transformation(
+                        target="strength",
+                        transformer=transformer_obj,
+                        result_paths=get_shard_coordinator(
+                            CoordinationConfig(), MongoDBConfig()
+                        ).result_paths(),
+                    )
+                elif mode == "chunked":
+                    (
+                        train_arr,
+                        test_arr,
+                        _,
+                    ) = self.data_transformation.initiate_chunked_transformation(
+                        target="strength", transformer=transformer_obj
+                    )
+                else:
+                    (
+                        train_arr,
+                        test_arr,
+                        _,
+                    ) = self.data_transformation.initiate_data_transformation(
+                        target="strength", transformer=transformer_obj
+                    )
+                    if checkpoint is not None:
+                        checkpoint.save_array("train_arr", train_arr)
+                        checkpoint.save_array("test_arr", test_arr)
+                if checkpoint is not None:
+                    checkpoint.mark_done("transformation", mode=mode)
+
             report = self.model_trainer.evaluate_models(train_arr, test_arr)
             name_model, score = self.model_trainer.select_best_model(
                 report, test_arr
             )
             logger.info("Best model: %s Score: %s", name_model, score)
+            self._save_bundle(name_model, score, transformer_obj)
+            if checkpoint is not None:
+                checkpoint.mark_done("training", model=name_model, score=score)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def run(self, persist: bool = True) -> Tuple[str, float]:
+        """Run push, ingestion, transformation and training end to end.
 
+        Every stage hands its output to the next one in memory instead of
+        reading back what the previous stage wrote. Writing the sample to
+        the dataset store, the train/test files, the data report and the
+        preprocessor runs on background threads while the next stages
+        compute, and the run only returns once those writes finished.
+
+        Args:
+            persist (bool, optional): Write the sample to the dataset
+            store, and the split and its report to disk. The preprocessor
+            and model are always saved. Defaults to True.
+
+        Raises:
+            CustomException: If a stage or a background write fails.
+
+        Returns:
+            Tuple[str, float]: The name and test score of the best model.
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                writes: List[Future[Any]] = []
+                df = self.data_pusher.initiate_data_push()
+                if persist:
+                    writes.append(executor.submit(self._persist_to_store, df))
+
+                train_set, test_set = self.data_ingestion.split_data(df)
+                if persist:
+                    writes.append(
+                        executor.submit(
+                            self.data_ingestion.save_split,
+                            train_set,
+                            test_set,
+                        )
+                    )
+                    writes.append(
+                        executor.submit(
+                            self.data_ingestion.data_report,
+                            splits=(train_set, test_set),
+                        )
+                    )
+
+                transformer_obj = (
+                    self.data_transformation.get_data_transformer_object(
+                        features=["password"]
+                    )
+                )
+                (
+                    train_arr,
+                    test_arr,
+                ) = self.data_transformation.transform_frames(
+                    train_set, test_set, "strength", transformer_obj
+                )
+                writes.append(
+                    executor.submit(
+                        save_object,
+                        self.filepath_config.preprocessor_path,
+                        transformer_obj,
+                    )
+                )
+
+                report = self.model_trainer.evaluate_models(
+                    train_arr, test_arr
+                )
+                name_model, score = self.model_trainer.select_best_model(
+                    report, test_arr
+                )
+                logger.info("Best model: %s Score: %s", name_model, score)
+                self._save_bundle(name_model, score, transformer_obj)
+
+                # Surface the first failed write
+                for write in writes:
+                    write.result()
+            if persist:
+                self._save_ingest_cursor(
+                    self.data_pusher.dataset_store.changes_cursor()
+                )
+            return name_model, score
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def _save_bundle(
+        self, name: str, score: float, transformer: Optional[Any] = None
+    ) -> float:
+        """Publish the selected model with its preprocessor as a new bundle
+        version and validate it.
+
+        Args:
+            name (str): The name of the selected model.
+            score (float): Its test score.
+            transformer (Optional[Any], optional): The fitted preprocessor,
+            loaded from `preprocessor_path` when None. Defaults to None.
+
+        Returns:
+            float: The cold-load time of the bundle in milliseconds.
+        """
+        if transformer is None:
+            transformer = load_object(self.filepath_config.preprocessor_path)
+        trainer_config = self.model_trainer.trainer_config
+        shadow_version = ServingConfig().shadow_version
+        version, _ = publish_bundle(
+            self.filepath_config.bundle_dir,
+            self.model_trainer.models[name],
+            transformer,
+            metadata={
+                "model": name,
+                "score": score,
+                "training_mode": trainer_config.training_mode,
+                "search_mode": trainer_config.search_mode,
+            },
+            # The configured candidate must outlive the pruning
+            pinned=[shadow_version] if shadow_version else [],
+        )
+        bundle = load_bundle(
+            os.path.join(self.filepath_config.bundle_dir, version)
+        )
+        logger.info("Bundle cold load: %.1f ms", bundle.load_ms)
+        return bundle.load_ms
+
+    def ingest_changes(self, chunk_size: int = 10_000) -> int:
+        """Ingest the rows added to the dataset store since the last run.
+
+        New rows are validated, labeled where they lack a strength, split
+        by password hash, appended to the train and test sets and
+        featurized into the feature store, so the work is proportional to
+        the new rows. The cursor is saved after every chunk; a chunk
+        interrupted before that is ingested again on the next call.
+
+        Args:
+            chunk_size (int, optional): Rows handled per chunk.
+            Defaults to 10_000.
+
+        Raises:
+            CustomException: If no full ingestion ran before, or a chunk
+            cannot be ingested.
+
+        Returns:
+            int: The number of rows ingested.
+        """
+        try:
+            cursor_path = self.filepath_config.ingest_cursor_path
+            if not os.path.exists(cursor_path):
+                raise ValueError(
+                    f"No ingest cursor at {cursor_path}, run push_data first"
+                )
+            with open(cursor_path, encoding="utf-8") as file:
+                cursor = json.load(file)["cursor"]
+
+            logger.info("Started incremental ingestion")
+            total_rows = 0
+            for (
+                chunk,
+                next_cursor,
+            ) in self.data_pusher.dataset_store.iter_changes(
+                cursor, chunk_size
+            ):
+                rows = self.data_pusher.prepare_new_rows(chunk)
+                train_set, test_set = self.data_ingestion.append_split(rows)
+                self.data_transformation.cache_features(
+                    "strength", [train_set, test_set]
+                )
+                self._save_ingest_cursor(next_cursor)
+                total_rows += len(rows)
+            logger.info("Done incremental ingestion of %s rows", total_rows)
+            return total_rows
         except Exception as error:
             raise CustomException(error, sys) from error
 
+    def _save_ingest_cursor(self, cursor: str) -> None:
+        """Atomically save the change cursor of the ingested data.
+
+        Args:
+            cursor (str): Cursor of the dataset store.
+        """
+        cursor_path = self.filepath_config.ingest_cursor_path
+        dir_path = os.path.dirname(cursor_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        with open(f"{cursor_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump({"cursor": cursor}, file)
+        os.replace(f"{cursor_path}.tmp", cursor_path)
+
     def predict(self, features: pd.DataFrame) -> Any:
         """Perform prediction on the given features.
 
+        The current model bundle is used when one was published, the
+        separate model and preprocessor pickles otherwise. Either is loaded
+        once per process through the model cache and reloaded when a new
+        version is published or the pickles change; a prediction runs to
+        the end on the artifacts it started with.
+
         Args:
             features (pd.DataFrame): The features to be predicted.
 
@@ -92,12 +417,16 @@ class Pipeline:
             np.ndarray[np.float64, Any]: The predicted values.
         """
         try:
-            logger.info("Initiated load files")
-            model = load_object(file_path=self.filepath_config.model_path)
-            preprocessor = load_object(
-                file_path=self.filepath_config.preprocessor_path
-            )
-            logger.info("Done load files")
+            bundle = live_bundle(self.filepath_config.bundle_dir).get()
+            if bundle is not None:
+                logger.info("Initiated prediction")
+                result = bundle.predict(features)
+                logger.info("Done prediction")
+                return result
+
+            cache = model_cache()
+            model = cache.get(self.filepath_config.model_path)
+            preprocessor = cache.get(self.filepath_config.preprocessor_path)
 
             logger.info("Initiated data transformation")
             data_scaled = preprocessor.transform(features)
@@ -116,6 +445,7 @@ class Pipeline:
 if __name__ == "__main__":
     logger.info(
         "\nMain menu\n1. Push data\n2. Train pipeline\n3. Predict pipeline\n"
+        "4. Run pipeline end to end\n5. Ingest new data\n"
     )
     choice = int(input("Enter the choice: "))
 
@@ -130,5 +460,9 @@ if __name__ == "__main__":
         strength = Pipeline().predict(password)
         value = custom_data.array2data(strength)
         logger.info("\nPassword: %s Strength: %f", input_data, value)
+    elif choice == 4:
+        Pipeline().run()
+    elif choice == 5:
+        Pipeline().ingest_changes()
     else:
         raise CustomException("Invalid input", sys)
@@ -0,0 +1,229 @@
+"""
+Module for retraining the model in the background of the serving API.
+
+`start_retrain` runs `Pipeline.train` in a separate process at a lower
+priority, on limited CPUs and threads, so serving latency is unaffected.
+The process holds a file lock for its whole run, so at most one retrain
+runs across all API workers, and records its process id in the status,
+which tells a running retrain from a crashed one. Training publishes a
+new bundle version, which every API worker swaps to on its next
+prediction.
+
+The lock and the resource limits need a POSIX system; their modules are
+imported on use, so the API still starts elsewhere with retraining
+disabled.
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.interface.config import FilePathConfig, RetrainConfig
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+from src.pipe.pipeline import Pipeline
+from src.utils.data_report import save_report
+from src.utils.model_bundle import current_bundle_dir
+
+THREAD_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "LOKY_MAX_CPU_COUNT",
+)
+
+
+def retrain_supported() -> bool:
+    """Check whether background retraining is available on this system.
+
+    Returns:
+        bool: True on POSIX systems.
+    """
+    return os.name == "posix"
+
+
+def _limit_resources(retrain_config: RetrainConfig) -> None:
+    """Lower the priority and CPU share of this process.
+
+    Args:
+        retrain_config (RetrainConfig): The retrain configuration.
+    """
+    import resource  # pylint: disable=import-outside-toplevel
+
+    os.nice(retrain_config.nice)
+    # CPU affinity is only available on Linux
+    if retrain_config.cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(
+            0, {int(cpu) for cpu in retrain_config.cpus.split(",")}
+        )
+    if retrain_config.max_cpu_seconds > 0:
+        resource.setrlimit(
+            resource.RLIMIT_CPU,
+            (retrain_config.max_cpu_seconds, retrain_config.max_cpu_seconds),
+        )
+
+
+def _is_running(pid: Optional[int]) -> bool:
+    """Check whether the retrain process of a status still runs.
+
+    The process id is probed rather than the lock, which a probe would
+    briefly hold and so refuse a retrain starting at the same time.
+
+    Args:
+        pid (Optional[int]): The process id the status records.
+
+    Returns:
+        bool: True while the process runs.
+    """
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists but belongs to another user
+        return True
+    return True
+
+
+def retrain_status(
+    retrain_config: Optional[RetrainConfig] = None,
+) -> Dict[str, Any]:
+    """Get the status of the last retrain.
+
+    Args:
+        retrain_config (Optional[RetrainConfig], optional): The retrain
+        configuration. Defaults to None.
+
+    Raises:
+        CustomException: If the status cannot be read.
+
+    Returns:
+        Dict[str, Any]: The state ("idle", "running", "succeeded" or
+        "failed"), the process id, run id, start and finish time, the
+        published version and the error of a failed retrain.
+    """
+    try:
+        retrain_config = retrain_config or RetrainConfig()
+        if not os.path.exists(retrain_config.status_path):
+            return {"state": "idle"}
+        with open(retrain_config.status_path, encoding="utf-8") as file:
+            status: Dict[str, Any] = json.load(file)
+        if status["state"] == "running" and not _is_running(status.get("pid")):
+            status["state"] = "failed"
+            status["error"] = "Retrain process exited unexpectedly"
+        return status
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def start_retrain(
+    run_id: Optional[str] = None,
+    retrain_config: Optional[RetrainConfig] = None,
+) -> Tuple[bool, Dict[str, Any]]:
+    """Start a retrain in a background process, unless one is running.
+
+    The process reads its configuration from the environment, with the
+    thread counts limited to `RetrainConfig.threads`.
+
+    Args:
+        run_id (Optional[str], optional): Identifier of a resumable run.
+        Defaults to None.
+        retrain_config (Optional[RetrainConfig], optional): The retrain
+        configuration. Defaults to None.
+
+    Raises:
+        CustomException: If the retrain process cannot be started.
+
+    Returns:
+        Tuple[bool, Dict[str, Any]]: Whether a retrain was started, and
+        the status of the started or running retrain.
+    """
+    try:
+        if not retrain_supported():
+            raise NotImplementedError(
+                "Background retraining needs a POSIX system"
+            )
+        import fcntl  # pylint: disable=import-outside-toplevel
+
+        retrain_config = retrain_config or RetrainConfig()
+        dir_path = os.path.dirname(retrain_config.lock_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        lock_fd = os.open(retrain_config.lock_path, os.O_CREAT | os.O_RDWR)
+        try:
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False, retrain_status(retrain_config)
+
+            started = time.time()
+            env = dict(os.environ)
+            for variable in THREAD_VARIABLES:
+                env[variable] = str(retrain_config.threads)
+            command = [sys.executable, "-m", "src.pipe.retrain"]
+            # The process inherits the locked file and holds it until exit
+            process = subprocess.Popen(  # pylint: disable=consider-using-with
+                command + ([run_id] if run_id else []),
+                env=env,
+                pass_fds=(lock_fd,),
+            )
+            status: Dict[str, Any] = {
+                "state": "running",
+                "pid": process.pid,
+                "run_id": run_id,
+                "started": started,
+            }
+            save_report(retrain_config.status_path, status)
+        finally:
+            os.close(lock_fd)
+        threading.Thread(target=process.wait, daemon=True).start()
+        logger.info("Started retrain process %s", process.pid)
+        return True, status
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def run_retrain(run_id: Optional[str] = None) -> Dict[str, Any]:
+    """Train and publish a new model in this process, within the CPU
+    limits, recording the retrain status.
+
+    Args:
+        run_id (Optional[str], optional): Identifier of a resumable run.
+        Defaults to None.
+
+    Returns:
+        Dict[str, Any]: The final status.
+    """
+    retrain_config = RetrainConfig()
+    _limit_resources(retrain_config)
+    # Not read back, the status may still be the one of the last retrain
+    status: Dict[str, Any] = {
+        "state": "running",
+        "pid": os.getpid(),
+        "run_id": run_id,
+        "started": time.time(),
+    }
+    save_report(retrain_config.status_path, status)
+    try:
+        Pipeline().train(run_id)
+        version = current_bundle_dir(FilePathConfig().bundle_dir)
+        status.update(
+            state="succeeded",
+            version=os.path.basename(version) if version else None,
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        logger.error("Retrain failed: %s", error)
+        status.update(state="failed", error=str(error))
+    status["finished"] = time.time()
+    save_report(retrain_config.status_path, status)
+    return status
+
+
+if __name__ == "__main__":
+    final_status = run_retrain(sys.argv[1] if len(sys.argv) > 1 else None)
+    sys.exit(0 if final_status["state"] == "succeeded" else 1)
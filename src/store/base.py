@@ -0,0 +1,459 @@
+"""
+Module defining the dataset store interface shared by all storage backends.
+"""
+import math
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+from src.utils.hashing import password_key, row_digest
+
+KEY_FIELD = "key"
+HASH_FIELD = "row_hash"
+SYNC_FIELDS = [KEY_FIELD, HASH_FIELD]
+
+
+@dataclass
+class SyncReport:
+    """Counts of rows handled by an incremental sync."""
+
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+
+def add_content_keys(
+    data_frame: pd.DataFrame, key_column: str = "password"
+) -> pd.DataFrame:
+    """Add the key and row hash columns used by incremental syncs.
+
+    Rows sharing a key are collapsed to the last occurrence.
+
+    Args:
+        data_frame (pd.DataFrame): Input DataFrame.
+        key_column (str, optional): Column identifying a row.
+        Defaults to "password".
+
+    Returns:
+        pd.DataFrame: A copy with `key` and `row_hash` columns.
+    """
+    keyed = data_frame.drop(columns=SYNC_FIELDS, errors="ignore")
+    keyed[KEY_FIELD] = keyed[key_column].map(password_key)
+    values = keyed.drop(columns=[KEY_FIELD]).astype(str)
+    keyed[HASH_FIELD] = [
+        row_digest(row) for row in values.itertuples(index=False)
+    ]
+    return keyed.drop_duplicates(KEY_FIELD, keep="last").reset_index(drop=True)
+
+
+def bin_ranges(
+    low: float, high: float, num_bins: int
+) -> List[Tuple[float, float]]:
+    """Split a value range into equal-width bins like `pd.cut`.
+
+    Bins are closed on the right, the first one on both sides.
+
+    Args:
+        low (float): The smallest value.
+        high (float): The largest value.
+        num_bins (int): Number of bins.
+
+    Returns:
+        List[Tuple[float, float]]: The `(lower, upper)` edges of every bin.
+    """
+    if low == high:
+        return [(low, high)]
+    edges = np.linspace(low, high, num_bins + 1).tolist()
+    return list(zip(edges, edges[1:]))
+
+
+class DatasetStore(ABC):
+    """Interface for reading and writing the labeled password dataset.
+
+    Backends implement chunk level primitives; chunking, logging and error
+    handling live here so every backend behaves the same way.
+    """
+
+    name = "dataset store"
+
+    def write(
+        self,
+        data_frame: pd.DataFrame,
+        chunk_size: int = 1000,
+        start_chunk: int = 0,
+        on_chunk: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """Append a DataFrame to the store in chunks.
+
+        Args:
+            data_frame (pd.DataFrame): Input DataFrame.
+            chunk_size (int, optional): Rows written per chunk.
+            Defaults to 1000.
+            start_chunk (int, optional): First chunk to write, used to
+            resume an interrupted write. Defaults to 0.
+            on_chunk (Optional[Callable[[int], None]], optional): Called
+            with the index of every chunk once it is stored, which
+            backends that buffer chunks may do only a few chunks later.
+            Defaults to None.
+
+        Raises:
+            CustomException: If a chunk cannot be written.
+        """
+        try:
+            total_rows = data_frame.shape[0]
+            num_chunks = math.ceil(total_rows / chunk_size)
+
+            logger.info("Started insert data into %s", self.name)
+            written: List[int] = []
+            self._open()
+            try:
+                for chunk in range(start_chunk, num_chunks):
+                    start = chunk * chunk_size
+                    end = min(start + chunk_size, total_rows)
+                    self._write_chunk(data_frame.iloc[start:end])
+                    written.append(chunk)
+                    logger.info(
+                        "Chunk %s/%s inserted into %s",
+                        chunk + 1,
+                        num_chunks,
+                        self.name,
+                    )
+                    if not self._buffered():
+                        self._report_chunks(written, on_chunk)
+                self._flush()
+                self._report_chunks(written, on_chunk)
+            finally:
+                self._close()
+            logger.info("Done insert data into %s", self.name)
+
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def read(self, chunk_size: int = 1000) -> pd.DataFrame:
+        """Read the whole dataset into a DataFrame.
+
+        Args:
+            chunk_size (int, optional): Rows fetched per chunk.
+            Defaults to 1000.
+
+        Raises:
+            CustomException: If the dataset cannot be read.
+
+        Returns:
+            pd.DataFrame: Dataset in df
+        """
+        try:
+            logger.info("Started fetch data from %s", self.name)
+            chunks = list(self.iter_chunks(chunk_size))
+            data_frame = (
+                pd.concat(chunks, ignore_index=True)
+                if chunks
+                else pd.DataFrame()
+            )
+            logger.info("Done fetch data from %s", self.name)
+            return data_frame
+
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def sync(
+        self, data_frame: pd.DataFrame, chunk_size: int = 1000
+    ) -> SyncReport:
+        """Idempotently upsert a DataFrame keyed by password hash.
+
+        The keys already stored are fetched first, and only new rows or
+        rows whose content hash changed are transferred.
+
+        Args:
+            data_frame (pd.DataFrame): Input DataFrame.
+            chunk_size (int, optional): Rows upserted per chunk.
+            Defaults to 1000.
+
+        Raises:
+            CustomException: If the sync fails.
+
+        Returns:
+            SyncReport: How many rows were inserted, updated or skipped.
+        """
+        try:
+            logger.info("Started sync data into %s", self.name)
+            keyed = add_content_keys(data_frame)
+            stored = keyed[KEY_FIELD].map(self.fetch_keys())
+            is_new = stored.isna()
+            is_changed = ~is_new & (stored != keyed[HASH_FIELD])
+            report = SyncReport(
+                inserted=int(is_new.sum()),
+                updated=int(is_changed.sum()),
+                skipped=int((~is_new & ~is_changed).sum()),
+            )
+
+            pending = keyed[is_new | is_changed]
+            num_chunks = math.ceil(pending.shape[0] / chunk_size)
+            self._open()
+            try:
+                self._prepare_sync(keyed.loc[is_changed, KEY_FIELD].tolist())
+                for chunk in range(num_chunks):
+                    start = chunk * chunk_size
+                    self._upsert_chunk(
+                        pending.iloc[start : start + chunk_size]
+                    )
+                    logger.info(
+                        "Chunk %s/%s synced into %s",
+                        chunk + 1,
+                        num_chunks,
+                        self.name,
+                    )
+                self._flush()
+            finally:
+                self._close()
+            logger.info(
+                "Done sync data into %s: %s inserted, %s updated, "
+                "%s skipped",
+                self.name,
+                report.inserted,
+                report.updated,
+                report.skipped,
+            )
+            return report
+
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def sample(
+        self,
+        per_bin: int = 2500,
+        num_bins: int = 10,
+        column: str = "strength",
+        seed: int = 24,
+    ) -> pd.DataFrame:
+        """Draw a stratified sample of equal-width bins of a column.
+
+        Every bin contributes up to `per_bin` random rows. Backends that
+        can sample server-side only transfer the sampled rows.
+
+        Args:
+            per_bin (int, optional): Rows sampled per bin. Defaults to 2500.
+            num_bins (int, optional): Number of bins. Defaults to 10.
+            column (str, optional): The numeric column to bin.
+            Defaults to "strength".
+            seed (int, optional): Seed of backends with seedable sampling.
+            Defaults to 24.
+
+        Raises:
+            CustomException: If the sample cannot be drawn.
+
+        Returns:
+            pd.DataFrame: The sampled rows, without sync fields.
+        """
+        try:
+            logger.info("Started sample data from %s", self.name)
+            data_frame = self._sample(per_bin, num_bins, column, seed)
+            logger.info(
+                "Done sample %s rows from %s", len(data_frame), self.name
+            )
+            return data_frame.drop(columns=SYNC_FIELDS, errors="ignore")
+
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def iter_chunks(self, chunk_size: int = 1000) -> Iterator[pd.DataFrame]:
+        """Iterate over the stored rows in chunks, without sync fields.
+
+        Args:
+            chunk_size (int, optional): Rows per chunk. Defaults to 1000.
+
+        Yields:
+            pd.DataFrame: The next chunk of rows.
+        """
+        for chunk in self._iter_chunks(chunk_size):
+            yield chunk.drop(columns=SYNC_FIELDS, errors="ignore")
+
+    def changes_cursor(self) -> str:
+        """Get a cursor at the current end of the store.
+
+        Rows added after this call are yielded by `iter_changes`.
+
+        Raises:
+            CustomException: If the position cannot be read.
+
+        Returns:
+            str: An opaque, JSON serializable cursor.
+        """
+        try:
+            return self._end_cursor()
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def iter_changes(
+        self, cursor: str, chunk_size: int = 1000
+    ) -> Iterator[Tuple[pd.DataFrame, str]]:
+        """Iterate over rows added after a cursor, without sync fields.
+
+        Upserted rows count as added. Iteration stops once the rows
+        present at the time of the call are drained, so the work is
+        proportional to the new rows only.
+
+        Args:
+            cursor (str): A cursor of `changes_cursor` or of an earlier
+            chunk.
+            chunk_size (int, optional): Rows per chunk. Defaults to 1000.
+
+        Yields:
+            Tuple[pd.DataFrame, str]: The next chunk of rows and the cursor
+            after it.
+        """
+        for chunk, next_cursor in self._iter_changes(cursor, chunk_size):
+            yield chunk.drop(columns=SYNC_FIELDS, errors="ignore"), next_cursor
+
+    def _prepare_sync(self, changed_keys: List[str]) -> None:
+        """Prepare the store for upserting rows.
+
+        Backends without native upserts delete the changed rows here so
+        the following appends replace them.
+
+        Args:
+            changed_keys (List[str]): Keys of rows whose content changed.
+        """
+        self._delete_keys(changed_keys)
+
+    def _upsert_chunk(self, chunk: pd.DataFrame) -> None:
+        """Upsert one chunk of keyed rows.
+
+        Args:
+            chunk (pd.DataFrame): The keyed rows to upsert.
+        """
+        self._write_chunk(chunk)
+
+    def _sample(
+        self, per_bin: int, num_bins: int, column: str, seed: int
+    ) -> pd.DataFrame:
+        """Sample every bin client-side, after reading the whole store.
+
+        Args:
+            per_bin (int): Rows sampled per bin.
+            num_bins (int): Number of bins.
+            column (str): The numeric column to bin.
+            seed (int): Seed of the sampling.
+
+        Returns:
+            pd.DataFrame: The sampled rows.
+        """
+        data_frame = self.read()
+        if data_frame.empty:
+            return data_frame
+        bins = pd.cut(data_frame[column], num_bins, labels=False)
+        return data_frame.groupby(bins, group_keys=False).apply(
+            lambda x: x.sample(min(len(x), per_bin), random_state=seed)
+        )
+
+    @staticmethod
+    def _report_chunks(
+        written: List[int], on_chunk: Optional[Callable[[int], None]]
+    ) -> None:
+        """Report the stored chunks of a write and forget them.
+
+        Args:
+            written (List[int]): Indexes of the chunks stored so far.
+            on_chunk (Optional[Callable[[int], None]]): The callback of
+            the write.
+        """
+        if on_chunk is not None:
+            for chunk in written:
+                on_chunk(chunk)
+        written.clear()
+
+    def _open(self) -> None:
+        """Acquire the resources needed for a batch of chunk writes."""
+
+    def _buffered(self) -> bool:
+        """Check whether written chunks are held back from the store.
+
+        Returns:
+            bool: True until `_flush` stores them.
+        """
+        return False
+
+    def _flush(self) -> None:
+        """Store the chunks held back, at the end of a successful batch."""
+
+    def _close(self) -> None:
+        """Release the resources acquired by `_open`.
+
+        Chunks still held back belong to a failed batch and are dropped.
+        """
+
+    @abstractmethod
+    def _write_chunk(self, chunk: pd.DataFrame) -> None:
+        """Append one chunk of rows.
+
+        Args:
+            chunk (pd.DataFrame): The rows to append.
+        """
+
+    @abstractmethod
+    def fetch_keys(self) -> Dict[str, str]:
+        """Fetch the key and row hash of every synced row.
+
+        Returns:
+            Dict[str, str]: Row hashes by key.
+        """
+
+    @abstractmethod
+    def _delete_keys(self, keys: List[str]) -> None:
+        """Delete the synced rows with the given keys.
+
+        Args:
+            keys (List[str]): Keys of the rows to delete.
+        """
+
+    @abstractmethod
+    def _iter_chunks(self, chunk_size: int = 1000) -> Iterator[pd.DataFrame]:
+        """Iterate over the stored rows in chunks.
+
+        Args:
+            chunk_size (int, optional): Rows per chunk. Defaults to 1000.
+
+        Yields:
+            pd.DataFrame: The next chunk of rows.
+        """
+
+    @abstractmethod
+    def _end_cursor(self) -> str:
+        """Get a cursor at the current end of the store.
+
+        Returns:
+            str: The cursor.
+        """
+
+    @abstractmethod
+    def _iter_changes(
+        self, cursor: str, chunk_size: int = 1000
+    ) -> Iterator[Tuple[pd.DataFrame, str]]:
+        """Iterate over rows added after a cursor.
+
+        Args:
+            cursor (str): The cursor to start after.
+            chunk_size (int, optional): Rows per chunk. Defaults to 1000.
+
+        Yields:
+            Tuple[pd.DataFrame, str]: The next chunk of rows and the cursor
+            after it.
+        """
+
+    @abstractmethod
+    def count(self) -> int:
+        """Count the stored rows.
+
+        Returns:
+            int: The number of stored rows.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every stored row."""
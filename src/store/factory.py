@@ -0,0 +1,42 @@
+"""
+Module for selecting a dataset store backend from configuration.
+"""
+import sys
+
+from src.interface.config import DatasetStoreConfig, MongoDBConfig
+from src.middleware.exception import CustomException
+from src.store.base import DatasetStore
+from src.store.mongodb_store import MongoDBStore
+from src.store.parquet_store import ParquetStore
+from src.store.sqlite_store import SQLiteStore
+
+
+def get_dataset_store(
+    store_config: DatasetStoreConfig, mongodb_config: MongoDBConfig
+) -> DatasetStore:
+    """Create the dataset store selected by the configuration.
+
+    Args:
+        store_config (DatasetStoreConfig): Backend selection and local paths.
+        mongodb_config (MongoDBConfig): Settings for the MongoDB backend.
+
+    Raises:
+        CustomException: If the backend name is unknown.
+
+    Returns:
+        DatasetStore: The configured dataset store.
+    """
+    try:
+        backend = store_config.backend.lower()
+        if backend == "mongodb":
+            return MongoDBStore(mongodb_config)
+        if backend == "parquet":
+            return ParquetStore(store_config.parquet_dir)
+        if backend == "sqlite":
+            return SQLiteStore(
+                store_config.sqlite_path, store_config.table_name
+            )
+        raise ValueError(f"Unknown dataset store backend: {backend}")
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
@@ -0,0 +1,429 @@
+"""
+Module for the MongoDB dataset store backend.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from bson import json_util
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import OperationFailure
+
+from src.interface.config import MongoDBConfig
+from src.middleware.logger import logger
+from src.store.base import HASH_FIELD, KEY_FIELD, DatasetStore, bin_ranges
+
+STREAM_CURSOR = "stream"
+POLL_CURSOR = "poll"
+# Server timestamp set on every write, the position of the polling cursor
+CHANGED_FIELD = "_changed"
+CHANGED_AT = {"$currentDate": {CHANGED_FIELD: {"$type": "timestamp"}}}
+POLL_ORDER = [(CHANGED_FIELD, 1), ("_id", 1)]
+CHANGE_OPERATIONS = ["insert", "replace", "update"]
+
+
+class MongoDBStore(DatasetStore):
+    """Dataset store backed by a MongoDB collection.
+
+    Changes are tailed with a change stream where the server supports it
+    (replica sets and sharded clusters). Standalone servers fall back to
+    polling on a server timestamp that every insert and upsert sets, so
+    replaced rows are found as well as new ones.
+    """
+
+    name = "MongoDB"
+
+    def __init__(self, mongodb_config: MongoDBConfig) -> None:
+        """Initialize the MongoDB store.
+
+        Args:
+            mongodb_config (MongoDBConfig): Connection settings.
+        """
+        self.mongodb_config = mongodb_config
+        self._client: Optional[MongoClient[Dict[str, Any]]] = None
+
+    def connect(self) -> MongoClient[Dict[str, Any]]:
+        """Open a client to the configured MongoDB server.
+
+        Returns:
+            MongoClient: The connected client.
+        """
+        logger.info("Started connected to MongoDB")
+        client: MongoClient[Dict[str, Any]] = MongoClient(
+            self.mongodb_config.mongodb_connection_string
+        )
+        logger.info("Done connected to MongoDB")
+        return client
+
+    def get_collection(self, client: MongoClient[Dict[str, Any]]) -> Any:
+        """Get the configured collection.
+
+        Args:
+            client (MongoClient): MongoClient object
+
+        Returns:
+            Any: The pymongo collection.
+        """
+        database = client[self.mongodb_config.database_name]
+        return database[self.mongodb_config.collection_name]
+
+    def close(self, client: MongoClient[Dict[str, Any]]) -> None:
+        """Closing MongoDB client
+
+        Args:
+            client (MongoClient): MongoClient object
+        """
+        logger.info("Started close MongoDB")
+        client.close()
+        logger.info("Done close MongoDB")
+
+    def _open(self) -> None:
+        self._client = self.connect()
+
+    def _collection(self) -> Any:
+        """Get the collection through the client of the open write.
+
+        Raises:
+            ValueError: If the store is not open.
+
+        Returns:
+            Any: The pymongo collection.
+        """
+        if self._client is None:
+            raise ValueError("The MongoDB store is not open")
+        return self.get_collection(self._client)
+
+    def _close(self) -> None:
+        if self._client is not None:
+            self.close(self._client)
+            self._client = None
+
+    def _write_chunk(self, chunk: pd.DataFrame) -> None:
+        collection = self._collection()
+        result = collection.insert_many(chunk.to_dict(orient="records"))
+        collection.update_many(
+            {"_id": {"$in": result.inserted_ids}}, CHANGED_AT
+        )
+
+    def _prepare_sync(self, changed_keys: List[str]) -> None:
+        # Partial so documents pushed without a key do not collide
+        self._collection().create_index(
+            KEY_FIELD,
+            unique=True,
+            partialFilterExpression={KEY_FIELD: {"$type": "string"}},
+        )
+
+    def _upsert_chunk(self, chunk: pd.DataFrame) -> None:
+        # Rows share one schema, so setting every field replaces the row
+        requests = [
+            UpdateOne(
+                {KEY_FIELD: record[KEY_FIELD]},
+                {"$set": record, **CHANGED_AT},
+                upsert=True,
+            )
+            for record in chunk.to_dict(orient="records")
+        ]
+        self._collection().bulk_write(requests, ordered=False)
+
+    def fetch_keys(self) -> Dict[str, str]:
+        client = self.connect()
+        try:
+            cursor = self.get_collection(client).find(
+                {KEY_FIELD: {"$exists": True}},
+                {"_id": 0, KEY_FIELD: 1, HASH_FIELD: 1},
+            )
+            return {
+                document[KEY_FIELD]: document.get(HASH_FIELD, "")
+                for document in cursor
+            }
+        finally:
+            self.close(client)
+
+    def _delete_keys(self, keys: List[str]) -> None:
+        if keys:
+            self._collection().delete_many({KEY_FIELD: {"$in": keys}})
+
+    def _iter_chunks(self, chunk_size: int = 1000) -> Iterator[pd.DataFrame]:
+        """Iterate over the collection with a single batched cursor.
+
+        Args:
+            chunk_size (int, optional): Documents per chunk.
+            Defaults to 1000.
+
+        Yields:
+            pd.DataFrame: The next chunk of documents.
+        """
+        client = self.connect()
+        try:
+            cursor = self.get_collection(client).find(
+                {},
+                # Exclude the _id field and the sync bookkeeping fields
+                {"_id": 0, KEY_FIELD: 0, HASH_FIELD: 0, CHANGED_FIELD: 0},
+                batch_size=chunk_size,
+            )
+            records = []
+            for document in cursor:
+                records.append(document)
+                if len(records) == chunk_size:
+                    yield pd.DataFrame(records)
+                    records = []
+            if records:
+                yield pd.DataFrame(records)
+        finally:
+            self.close(client)
+
+    def _sample(
+        self, per_bin: int, num_bins: int, column: str, seed: int
+    ) -> pd.DataFrame:
+        """Sample every bin server-side with one aggregation per bin.
+
+        An index on the binned column, created on demand, serves the range
+        lookup and the `$match` of every bin, and `$sample` picks the rows
+        on the server, so only the sampled documents are transferred.
+        `$sample` is not seedable, so `seed` is ignored.
+        """
+        client = self.connect()
+        try:
+            collection = self.get_collection(client)
+            collection.create_index(column)
+            projection = {"_id": 0, column: 1}
+            lowest = collection.find_one(
+                {column: {"$type": "number"}}, projection, sort=[(column, 1)]
+            )
+            if lowest is None:
+                return pd.DataFrame()
+            highest = collection.find_one(
+                {column: {"$type": "number"}}, projection, sort=[(column, -1)]
+            )
+
+            records: List[Dict[str, Any]] = []
+            ranges = bin_ranges(lowest[column], highest[column], num_bins)
+            for position, (lower, upper) in enumerate(ranges):
+                bounds = {"$gte" if position == 0 else "$gt": lower}
+                bounds["$lte"] = upper
+                records.extend(
+                    collection.aggregate(
+                        [
+                            {"$match": {column: bounds}},
+                            {"$sample": {"size": per_bin}},
+                            {
+                                "$project": {
+                                    "_id": 0,
+                                    KEY_FIELD: 0,
+                                    HASH_FIELD: 0,
+                                    CHANGED_FIELD: 0,
+                                }
+                            },
+                        ]
+                    )
+                )
+            return pd.DataFrame(records)
+        finally:
+            self.close(client)
+
+    def iter_raw_batches(
+        self, fields: List[str], batch_size: int = 10_000
+    ) -> Iterator[bytes]:
+        """Iterate over the undecoded BSON batches of a projection.
+
+        Args:
+            fields (List[str]): Fields to fetch, `_id` is left out.
+            batch_size (int, optional): Documents per batch.
+            Defaults to 10_000.
+
+        Yields:
+            bytes: The concatenated BSON documents of the next batch.
+        """
+        client = self.connect()
+        try:
+            projection = {"_id": 0, **{field: 1 for field in fields}}
+            yield from self.get_collection(client).find_raw_batches(
+                {}, projection, batch_size=batch_size
+            )
+        finally:
+            self.close(client)
+
+    def _end_cursor(self) -> str:
+        client = self.connect()
+        try:
+            collection = self.get_collection(client)
+            try:
+                with collection.watch() as stream:
+                    token = json_util.dumps(stream.resume_token)
+                return f"{STREAM_CURSOR}:{token}"
+            except OperationFailure:
+                logger.info("Change streams unavailable, polling for writes")
+                collection.create_index(POLL_ORDER)
+                last = collection.find_one(
+                    {},
+                    {CHANGED_FIELD: 1},
+                    sort=[(field, -1) for field, _ in POLL_ORDER],
+                )
+                return self._poll_cursor(last)
+        finally:
+            self.close(client)
+
+    def _iter_changes(
+        self, cursor: str, chunk_size: int = 1000
+    ) -> Iterator[Tuple[pd.DataFrame, str]]:
+        kind, _, position = cursor.partition(":")
+        client = self.connect()
+        try:
+            collection = self.get_collection(client)
+            if kind == STREAM_CURSOR:
+                yield from self._drain_stream(
+                    collection, json_util.loads(position), chunk_size
+                )
+                return
+
+            collection.create_index(POLL_ORDER)
+            documents = collection.find(
+                self._poll_query(position),
+                {KEY_FIELD: 0, HASH_FIELD: 0},
+                sort=POLL_ORDER,
+                batch_size=chunk_size,
+            )
+            records: List[Dict[str, Any]] = []
+            for document in documents:
+                records.append(document)
+                if len(records) == chunk_size:
+                    yield self._change_chunk(records)
+                    records = []
+            if records:
+                yield self._change_chunk(records)
+        finally:
+            self.close(client)
+
+    def _drain_stream(
+        self, collection: Any, resume_token: Any, chunk_size: int
+    ) -> Iterator[Tuple[pd.DataFrame, str]]:
+        """Read a change stream until no further change is waiting.
+
+        Args:
+            collection (Any): The pymongo collection.
+            resume_token (Any): Token of the last change already handled.
+            chunk_size (int): Documents per chunk.
+
+        Yields:
+            Tuple[pd.DataFrame, str]: The next chunk of documents and the
+            cursor after it.
+        """
+        pipeline = [{"$match": {"operationType": {"$in": CHANGE_OPERATIONS}}}]
+        with collection.watch(
+            pipeline,
+            full_document="updateLookup",
+            resume_after=resume_token,
+            max_await_time_ms=1000,
+        ) as stream:
+            records: List[Dict[str, Any]] = []
+            while stream.alive:
+                change = stream.try_next()
+                if change is None:
+                    break
+                if self._only_stamped(change):
+                    continue
+                document = change.get("fullDocument")
+                if document is not None:
+                    document.pop("_id", None)
+                    document.pop(CHANGED_FIELD, None)
+                    records.append(document)
+                if len(records) == chunk_size:
+                    token = json_util.dumps(stream.resume_token)
+                    yield pd.DataFrame(records), f"{STREAM_CURSOR}:{token}"
+                    records = []
+            if records:
+                token = json_util.dumps(stream.resume_token)
+                yield pd.DataFrame(records), f"{STREAM_CURSOR}:{token}"
+
+    @staticmethod
+    def _only_stamped(change: Dict[str, Any]) -> bool:
+        """Check whether a change only stamps the write time of a row.
+
+        Appended rows are stamped after their insert, which must not
+        report them a second time.
+
+        Args:
+            change (Dict[str, Any]): A change stream event.
+
+        Returns:
+            bool: True if the change only sets the write time.
+        """
+        if change["operationType"] != "update":
+            return False
+        description = change.get("updateDescription", {})
+        updated = set(description.get("updatedFields", {}))
+        return updated == {CHANGED_FIELD}
+
+    @staticmethod
+    def _poll_cursor(document: Optional[Dict[str, Any]]) -> str:
+        """Build the polling cursor after a document.
+
+        Args:
+            document (Optional[Dict[str, Any]]): The last document read,
+            None for a cursor before every document.
+
+        Returns:
+            str: The polling cursor.
+        """
+        if document is None:
+            return f"{POLL_CURSOR}:"
+        position = {
+            CHANGED_FIELD: document.get(CHANGED_FIELD),
+            "_id": document["_id"],
+        }
+        return f"{POLL_CURSOR}:{json_util.dumps(position)}"
+
+    @staticmethod
+    def _poll_query(position: str) -> Dict[str, Any]:
+        """Match the documents written after a polling cursor position.
+
+        Documents written by one request share a timestamp, so `_id`
+        breaks the ties.
+
+        Args:
+            position (str): The position part of a polling cursor.
+
+        Returns:
+            Dict[str, Any]: The query filter.
+        """
+        if not position:
+            return {}
+        last = json_util.loads(position)
+        # Rows pushed before the field existed sort first, as nulls
+        later = (
+            {"$type": "timestamp"}
+            if last[CHANGED_FIELD] is None
+            else {"$gt": last[CHANGED_FIELD]}
+        )
+        return {
+            "$or": [
+                {CHANGED_FIELD: later},
+                {
+                    CHANGED_FIELD: last[CHANGED_FIELD],
+                    "_id": {"$gt": last["_id"]},
+                },
+            ]
+        }
+
+    def _change_chunk(
+        self, records: List[Dict[str, Any]]
+    ) -> Tuple[pd.DataFrame, str]:
+        """Turn polled documents into a chunk and the cursor after it."""
+        cursor = self._poll_cursor(records[-1])
+        chunk = pd.DataFrame(records).drop(
+            columns=["_id", CHANGED_FIELD], errors="ignore"
+        )
+        return chunk, cursor
+
+    def count(self) -> int:
+        client = self.connect()
+        try:
+            return int(self.get_collection(client).count_documents({}))
+        finally:
+            self.close(client)
+
+    def clear(self) -> None:
+        client = self.connect()
+        try:
+            self.get_collection(client).drop()
+        finally:
+            self.close(client)
@@ -0,0 +1,156 @@
+"""
+Module for the local Parquet dataset store backend.
+"""
+import glob
+import os
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.store.base import HASH_FIELD, KEY_FIELD, DatasetStore
+
+
+def part_number(part_path: str) -> int:
+    """Get the sequence number of a part file.
+
+    Args:
+        part_path (str): Path of a "part-NNNNNNNN.parquet" file.
+
+    Returns:
+        int: The sequence number.
+    """
+    return int(os.path.basename(part_path)[5:-8])
+
+
+class ParquetStore(DatasetStore):
+    """Dataset store backed by a directory of Parquet part files.
+
+    Written chunks are gathered into parts of at least `rows_per_part`
+    rows. Every part file, new or rewritten, is written to a temporary
+    file and renamed into place once complete, so an interrupted write
+    never leaves a truncated file behind, and chunks are only reported as
+    written once their part is in place, so resumed writes line up with
+    the chunks already stored. Part numbers only grow, so the last one
+    read is the change cursor.
+    """
+
+    name = "Parquet store"
+
+    def __init__(self, directory: str, rows_per_part: int = 100_000) -> None:
+        """Initialize the Parquet store.
+
+        Args:
+            directory (str): Directory holding the part files.
+            rows_per_part (int, optional): Rows gathered into a part file
+            before it is written. Defaults to 100_000.
+        """
+        self.directory = directory
+        self.rows_per_part = rows_per_part
+        self._next_part = 0
+        self._pending: List[pa.Table] = []
+
+    def part_files(self) -> List[str]:
+        """List the part files in write order.
+
+        Returns:
+            List[str]: The sorted part file paths.
+        """
+        return sorted(
+            glob.glob(os.path.join(self.directory, "part-*.parquet"))
+        )
+
+    def _open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        part_files = self.part_files()
+        self._next_part = part_number(part_files[-1]) + 1 if part_files else 0
+        self._pending = []
+
+    def _close(self) -> None:
+        self._pending = []
+
+    def _buffered(self) -> bool:
+        return bool(self._pending)
+
+    def _write_chunk(self, chunk: pd.DataFrame) -> None:
+        self._pending.append(pa.Table.from_pandas(chunk, preserve_index=False))
+        pending_rows = sum(table.num_rows for table in self._pending)
+        if pending_rows >= self.rows_per_part:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        part_path = os.path.join(
+            self.directory, f"part-{self._next_part:08d}.parquet"
+        )
+        table = pa.concat_tables(self._pending)
+        pq.write_table(table, f"{part_path}.tmp")
+        os.replace(f"{part_path}.tmp", part_path)
+        self._next_part += 1
+        self._pending = []
+
+    def fetch_keys(self) -> Dict[str, str]:
+        stored: Dict[str, str] = {}
+        for part_path in self.part_files():
+            if KEY_FIELD not in pq.read_schema(part_path).names:
+                continue
+            table = pq.read_table(part_path, columns=[KEY_FIELD, HASH_FIELD])
+            stored.update(
+                zip(
+                    table.column(KEY_FIELD).to_pylist(),
+                    table.column(HASH_FIELD).to_pylist(),
+                )
+            )
+        return stored
+
+    def _delete_keys(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        key_set = pa.array(keys)
+        for part_path in self.part_files():
+            if KEY_FIELD not in pq.read_schema(part_path).names:
+                continue
+            table = pq.read_table(part_path)
+            stale = pc.is_in(table.column(KEY_FIELD), value_set=key_set)
+            if pc.any(stale).as_py():
+                pq.write_table(
+                    table.filter(pc.invert(stale)), f"{part_path}.tmp"
+                )
+                os.replace(f"{part_path}.tmp", part_path)
+
+    def _iter_chunks(self, chunk_size: int = 1000) -> Iterator[pd.DataFrame]:
+        for part_path in self.part_files():
+            for batch in pq.ParquetFile(part_path).iter_batches(
+                batch_size=chunk_size
+            ):
+                yield batch.to_pandas()
+
+    def _end_cursor(self) -> str:
+        part_files = self.part_files()
+        return str(part_number(part_files[-1]) if part_files else -1)
+
+    def _iter_changes(
+        self, cursor: str, chunk_size: int = 1000
+    ) -> Iterator[Tuple[pd.DataFrame, str]]:
+        """Yield every part written after the cursor as one chunk.
+
+        Parts are yielded whole, so a cursor never points into the middle
+        of a part; `chunk_size` is bounded by `rows_per_part` instead.
+        """
+        for part_path in self.part_files():
+            number = part_number(part_path)
+            if number > int(cursor):
+                yield pq.read_table(part_path).to_pandas(), str(number)
+
+    def count(self) -> int:
+        return sum(
+            pq.ParquetFile(part_path).metadata.num_rows
+            for part_path in self.part_files()
+        )
+
+    def clear(self) -> None:
+        for part_path in self.part_files():
+            os.remove(part_path)
@@ -0,0 +1,240 @@
+"""
+Module for the local SQLite dataset store backend.
+"""
+import os
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from src.store.base import HASH_FIELD, KEY_FIELD, DatasetStore, bin_ranges
+
+ROWID_COLUMN = "_rowid"
+
+
+class SQLiteStore(DatasetStore):
+    """Dataset store backed by a table in a local SQLite database.
+
+    Appended rows get increasing rowids, which serve as change cursor.
+    SQLite may reuse the rowid of a deleted last row, so an upsert of the
+    most recently added row can be missed by `iter_changes`.
+    """
+
+    name = "SQLite store"
+
+    def __init__(self, database_path: str, table_name: str) -> None:
+        """Initialize the SQLite store.
+
+        Args:
+            database_path (str): Path of the SQLite database file.
+            table_name (str): Name of the dataset table.
+        """
+        self.database_path = database_path
+        self.table_name = table_name
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection to the database file.
+
+        Returns:
+            sqlite3.Connection: The open connection.
+        """
+        directory = os.path.dirname(self.database_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return sqlite3.connect(self.database_path)
+
+    def table_exists(self, connection: sqlite3.Connection) -> bool:
+        """Check whether the dataset table exists.
+
+        Args:
+            connection (sqlite3.Connection): An open connection.
+
+        Returns:
+            bool: True if the table exists.
+        """
+        row = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+            (self.table_name,),
+        ).fetchone()
+        return row is not None
+
+    def table_columns(self, connection: sqlite3.Connection) -> List[str]:
+        """List the columns of the dataset table.
+
+        Args:
+            connection (sqlite3.Connection): An open connection.
+
+        Returns:
+            List[str]: The column names, empty if the table does not exist.
+        """
+        rows = connection.execute(
+            f'PRAGMA table_info("{self.table_name}")'
+        ).fetchall()
+        return [row[1] for row in rows]
+
+    def _open(self) -> None:
+        self._connection = self.connect()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Get the connection of the open write.
+
+        Raises:
+            ValueError: If the store is not open.
+
+        Returns:
+            sqlite3.Connection: The open connection.
+        """
+        if self._connection is None:
+            raise ValueError("The SQLite store is not open")
+        return self._connection
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+    def _write_chunk(self, chunk: pd.DataFrame) -> None:
+        connection = self._open_connection()
+        columns = self.table_columns(connection)
+        for column in chunk.columns:
+            if columns and column not in columns:
+                connection.execute(
+                    f'ALTER TABLE "{self.table_name}" ADD COLUMN "{column}"'
+                )
+        chunk.to_sql(
+            self.table_name, connection, if_exists="append", index=False
+        )
+
+    def fetch_keys(self) -> Dict[str, str]:
+        connection = self.connect()
+        try:
+            if KEY_FIELD not in self.table_columns(connection):
+                return {}
+            rows = connection.execute(
+                f'SELECT "{KEY_FIELD}", "{HASH_FIELD}" '
+                f'FROM "{self.table_name}" WHERE "{KEY_FIELD}" IS NOT NULL'
+            )
+            return dict(rows.fetchall())
+        finally:
+            connection.close()
+
+    def _delete_keys(self, keys: List[str]) -> None:
+        connection = self._open_connection()
+        if not keys or KEY_FIELD not in self.table_columns(connection):
+            return
+        connection.execute(
+            f'CREATE INDEX IF NOT EXISTS "{self.table_name}_{KEY_FIELD}" '
+            f'ON "{self.table_name}" ("{KEY_FIELD}")'
+        )
+        connection.executemany(
+            f'DELETE FROM "{self.table_name}" WHERE "{KEY_FIELD}" = ?',
+            [(key,) for key in keys],
+        )
+
+    def _iter_chunks(self, chunk_size: int = 1000) -> Iterator[pd.DataFrame]:
+        connection = self.connect()
+        try:
+            if not self.table_exists(connection):
+                return
+            yield from pd.read_sql_query(
+                f'SELECT * FROM "{self.table_name}"',
+                connection,
+                chunksize=chunk_size,
+            )
+        finally:
+            connection.close()
+
+    def _sample(
+        self, per_bin: int, num_bins: int, column: str, seed: int
+    ) -> pd.DataFrame:
+        """Sample every bin in SQL, backed by an index on the column.
+
+        SQLite's `RANDOM()` is not seedable, so `seed` is ignored.
+        """
+        connection = self.connect()
+        try:
+            if column not in self.table_columns(connection):
+                return pd.DataFrame()
+            connection.execute(
+                f'CREATE INDEX IF NOT EXISTS "{self.table_name}_{column}" '
+                f'ON "{self.table_name}" ("{column}")'
+            )
+            low, high = connection.execute(
+                f'SELECT MIN("{column}"), MAX("{column}") '
+                f'FROM "{self.table_name}"'
+            ).fetchone()
+            if low is None:
+                return pd.DataFrame()
+
+            chunks = []
+            ranges = bin_ranges(low, high, num_bins)
+            for position, (lower, upper) in enumerate(ranges):
+                operator = ">=" if position == 0 else ">"
+                chunks.append(
+                    pd.read_sql_query(
+                        f'SELECT * FROM "{self.table_name}" '
+                        f'WHERE "{column}" {operator} ? AND "{column}" <= ? '
+                        "ORDER BY RANDOM() LIMIT ?",
+                        connection,
+                        params=(lower, upper, per_bin),
+                    )
+                )
+            return pd.concat(chunks, ignore_index=True)
+        finally:
+            connection.commit()
+            connection.close()
+
+    def _end_cursor(self) -> str:
+        connection = self.connect()
+        try:
+            if not self.table_exists(connection):
+                return "0"
+            (last,) = connection.execute(
+                f'SELECT MAX(rowid) FROM "{self.table_name}"'
+            ).fetchone()
+            return str(last or 0)
+        finally:
+            connection.close()
+
+    def _iter_changes(
+        self, cursor: str, chunk_size: int = 1000
+    ) -> Iterator[Tuple[pd.DataFrame, str]]:
+        connection = self.connect()
+        try:
+            if not self.table_exists(connection):
+                return
+            for chunk in pd.read_sql_query(
+                f'SELECT rowid AS "{ROWID_COLUMN}", * '
+                f'FROM "{self.table_name}" WHERE rowid > ? ORDER BY rowid',
+                connection,
+                params=(int(cursor),),
+                chunksize=chunk_size,
+            ):
+                if chunk.empty:
+                    continue
+                last = int(chunk[ROWID_COLUMN].iloc[-1])
+                yield chunk.drop(columns=[ROWID_COLUMN]), str(last)
+        finally:
+            connection.close()
+
+    def count(self) -> int:
+        connection = self.connect()
+        try:
+            if not self.table_exists(connection):
+                return 0
+            (total,) = connection.execute(
+                f'SELECT COUNT(*) FROM "{self.table_name}"'
+            ).fetchone()
+            return int(total)
+        finally:
+            connection.close()
+
+    def clear(self) -> None:
+        connection = self.connect()
+        try:
+            connection.execute(f'DROP TABLE IF EXISTS "{self.table_name}"')
+            connection.commit()
+        finally:
+            connection.close()
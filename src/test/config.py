@@ -5,7 +5,7 @@ settings, used for testing purposes.
 import os
 from dataclasses import dataclass
 
-from src.interface.config import FilePathConfig, MongoDBConfig
+from src.interface.config import DatasetStoreConfig, FilePathConfig, MongoDBConfig
 
 
 # Mock the necessary dependencies
@@ -26,9 +26,32 @@ class MockFilePathConfig(FilePathConfig):
     raw_data_path: str = os.path.join(
         "common-password-list-rockyoutxt", "rockyou.txt"
     )
-    train_data_path: str = os.path.join("sample_artifacts", "train.csv")
-    test_data_path: str = os.path.join("sample_artifacts", "test.csv")
+    raw_cache_dir: str = os.path.join("sample_artifacts", "raw_cache")
+    train_data_path: str = os.path.join("sample_artifacts", "train.parquet")
+    test_data_path: str = os.path.join("sample_artifacts", "test.parquet")
+    report_path: str = os.path.join("sample_artifacts", "data_report.json")
+    features_dir: str = os.path.join("sample_artifacts", "features")
+    feature_store_dir: str = os.path.join("sample_artifacts", "feature_store")
     preprocessor_path: str = os.path.join(
         "sample_artifacts", "preprocessor.pkl"
     )
     model_path: str = os.path.join("sample_artifacts", "model.pkl")
+    checkpoint_dir: str = os.path.join("sample_artifacts", "runs")
+    ingest_cursor_path: str = os.path.join(
+        "sample_artifacts", "ingest_cursor.json"
+    )
+    search_cache_dir: str = os.path.join("sample_artifacts", "search_cache")
+    model_report_path: str = os.path.join(
+        "sample_artifacts", "model_report.json"
+    )
+    bundle_dir: str = os.path.join("sample_artifacts", "bundle")
+
+
+@dataclass
+class MockDatasetStoreConfig(DatasetStoreConfig):
+    """Mock configuration class for the dataset store."""
+
+    backend: str = "mongodb"
+    parquet_dir: str = os.path.join("sample_artifacts", "dataset_store")
+    sqlite_path: str = os.path.join("sample_artifacts", "dataset.sqlite")
+    table_name: str = "sample"
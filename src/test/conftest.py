@@ -1,8 +1,12 @@
 """
-This module contains test fixtures for the unit tests of the data ingestion
-and data pusher components.
+This module contains test fixtures shared by the unit tests.
 """
+from typing import Any, List, Tuple
+
+import numpy as np
+import pandas as pd
 import pytest
+from sklearn.compose import ColumnTransformer
 
 from src.components.data_ingestion import DataIngestion
 from src.components.data_pusher import DataPusher
@@ -10,7 +14,11 @@ from src.components.data_transformation import DataTransformation
 from src.components.model_trainer import ModelTrainer
 from src.interface.config import CustomData
 from src.pipe.pipeline import Pipeline
-from src.test.config import MockFilePathConfig, MockMongoDBConfig
+from src.test.config import (
+    MockDatasetStoreConfig,
+    MockFilePathConfig,
+    MockMongoDBConfig,
+)
 
 
 @pytest.fixture(scope="session", name="data_pusher")  # type: ignore
@@ -23,6 +31,7 @@ def data_pusher_fixture() -> DataPusher:
     data_pusher = DataPusher()
     data_pusher.mongodb_config = MockMongoDBConfig()
     data_pusher.filepath_config = MockFilePathConfig()
+    data_pusher.store_config = MockDatasetStoreConfig()
     return data_pusher
 
 
@@ -74,6 +83,7 @@ def pipeline_fixture() -> Pipeline:
     pipeline.filepath_config = MockFilePathConfig()
     pipeline.data_pusher.mongodb_config = MockMongoDBConfig()
     pipeline.data_pusher.mongodb_config.collection_name = "test_sample"
+    pipeline.data_pusher.store_config = MockDatasetStoreConfig()
     return pipeline
 
 
@@ -125,3 +135,48 @@ def invalid_long_password_fixture() -> str:
         str: An instance of the invalid_long_password string.
     """
     return "ux$zzSj4r66Wd4&2%PC^SgFI5@ghY1NWvD**LC72AJt!4G^$epIq6TxKgbMJLPmfJ3@2la"
+
+
+@pytest.fixture(name="passwords")  # type: ignore
+def passwords_fixture() -> List[str]:
+    """Fixture to create a few passwords of mixed strength.
+
+    Returns:
+        List[str]: The passwords.
+    """
+    return ["password", "Tr0ub4dor&3", "qwerty123", "x", "aB3$aB3$zz"]
+
+
+@pytest.fixture(name="fitted")  # type: ignore
+def fitted_fixture(
+    passwords: List[str],
+) -> Tuple[ColumnTransformer, np.ndarray[np.float64, Any], pd.DataFrame]:
+    """Fixture to fit a preprocessor and its features on a few passwords.
+
+    Args:
+        passwords (List[str]): The passwords.
+
+    Returns:
+        Tuple[ColumnTransformer, np.ndarray, pd.DataFrame]: The
+        preprocessor, the features and the password frame.
+    """
+    frame = pd.DataFrame({"password": passwords * 20})
+    transformer = DataTransformation().get_data_transformer_object(
+        ["password"]
+    )
+    return transformer, transformer.fit_transform(frame), frame
+
+
+@pytest.fixture(name="regression_data")  # type: ignore
+def regression_data_fixture() -> (
+    Tuple[np.ndarray[np.float64, Any], np.ndarray[np.float64, Any]]
+):
+    """Fixture to create a small regression problem.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The features and target.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 10, size=(900, 4)).astype(np.float32)
+    y = (X[:, 0] * 3 + X[:, 1] ** 2 + rng.normal(0, 0.1, 900)) / 100
+    return X, y
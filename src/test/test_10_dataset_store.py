@@ -0,0 +1,191 @@
+"""
+This module contains test cases for the local dataset store backends.
+"""
+import glob
+import os
+from typing import List
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.interface.config import DatasetStoreConfig, MongoDBConfig
+from src.middleware.exception import CustomException
+from src.store.base import DatasetStore, SyncReport
+from src.store.factory import get_dataset_store
+from src.store.parquet_store import ParquetStore
+from src.store.sqlite_store import SQLiteStore
+
+
+@pytest.fixture(name="sample_df")  # type: ignore
+def sample_df_fixture() -> pd.DataFrame:
+    """Fixture to create a small labeled dataset.
+
+    Returns:
+        pd.DataFrame: The labeled dataset.
+    """
+    return pd.DataFrame(
+        {
+            "password": [f"password{i}" for i in range(25)],
+            "strength": [i / 25 for i in range(25)],
+        }
+    )
+
+
+@pytest.fixture(name="store", params=["parquet", "sqlite"])  # type: ignore
+def store_fixture(
+    request: pytest.FixtureRequest, tmp_path: str
+) -> DatasetStore:
+    """Fixture to create each local dataset store backend.
+
+    Args:
+        request (pytest.FixtureRequest): The parametrized request.
+        tmp_path (str): Pytest temporary directory.
+
+    Returns:
+        DatasetStore: A local dataset store.
+    """
+    store_config = DatasetStoreConfig(
+        backend=request.param,
+        parquet_dir=os.path.join(tmp_path, "dataset_store"),
+        sqlite_path=os.path.join(tmp_path, "dataset.sqlite"),
+    )
+    return get_dataset_store(store_config, MongoDBConfig())
+
+
+def test_get_dataset_store(tmp_path: str) -> None:
+    """Test that the factory picks the configured backend.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+    """
+    store_config = DatasetStoreConfig(
+        backend="sqlite", sqlite_path=os.path.join(tmp_path, "db.sqlite")
+    )
+    assert isinstance(
+        get_dataset_store(store_config, MongoDBConfig()), SQLiteStore
+    )
+    store_config.backend = "parquet"
+    assert isinstance(
+        get_dataset_store(store_config, MongoDBConfig()), ParquetStore
+    )
+    store_config.backend = "unknown"
+    with pytest.raises(CustomException):
+        get_dataset_store(store_config, MongoDBConfig())
+
+
+def test_write_and_read(store: DatasetStore, sample_df: pd.DataFrame) -> None:
+    """Test that chunked writes are read back completely and in order.
+
+    Args:
+        store (DatasetStore): The dataset store.
+        sample_df (pd.DataFrame): The labeled dataset.
+    """
+    assert store.count() == 0
+    store.write(sample_df, chunk_size=10)
+    assert store.count() == 25
+    pd.testing.assert_frame_equal(store.read(chunk_size=7), sample_df)
+    chunk_sizes = [len(chunk) for chunk in store.iter_chunks(chunk_size=10)]
+    assert chunk_sizes == [10, 10, 5]
+
+
+def test_append_and_clear(
+    store: DatasetStore, sample_df: pd.DataFrame
+) -> None:
+    """Test that writes append and clear empties the store.
+
+    Args:
+        store (DatasetStore): The dataset store.
+        sample_df (pd.DataFrame): The labeled dataset.
+    """
+    store.write(sample_df)
+    store.write(sample_df)
+    assert store.count() == 50
+    store.clear()
+    assert store.count() == 0
+    assert store.read().empty
+
+
+def test_incremental_sync(
+    store: DatasetStore, sample_df: pd.DataFrame
+) -> None:
+    """Test that syncs are idempotent and only transfer changed rows.
+
+    Args:
+        store (DatasetStore): The dataset store.
+        sample_df (pd.DataFrame): The labeled dataset.
+    """
+    report = store.sync(sample_df, chunk_size=10)
+    assert report == SyncReport(inserted=25, updated=0, skipped=0)
+    assert store.sync(sample_df) == SyncReport(
+        inserted=0, updated=0, skipped=25
+    )
+
+    changed = sample_df.copy()
+    changed.loc[0, "strength"] = 0.99
+    changed.loc[25] = ["new_password", 0.5]
+    report = store.sync(changed, chunk_size=10)
+    assert report == SyncReport(inserted=1, updated=1, skipped=24)
+
+    stored = store.read().set_index("password")
+    assert len(stored) == 26
+    assert list(stored.columns) == ["strength"]
+    assert stored.loc[sample_df.loc[0, "password"], "strength"] == 0.99
+
+
+def test_parquet_parts_gather_chunks(
+    sample_df: pd.DataFrame, tmp_path: str
+) -> None:
+    """Test that chunks are gathered into parts and reported once stored.
+
+    Args:
+        sample_df (pd.DataFrame): The labeled dataset.
+        tmp_path (str): Pytest temporary directory.
+    """
+    store = ParquetStore(os.path.join(tmp_path, "store"), rows_per_part=10)
+    reported: List[int] = []
+    store.write(sample_df, chunk_size=4, on_chunk=reported.append)
+    assert reported == list(range(7))
+    assert [
+        pq.ParquetFile(part_path).metadata.num_rows
+        for part_path in store.part_files()
+    ] == [12, 12, 1]
+
+    store.sync(sample_df.iloc[:5])
+    assert len(store.part_files()) == 4
+    assert not glob.glob(os.path.join(store.directory, "*.tmp"))
+
+    # The second chunk cannot be converted, the buffered first one is lost
+    broken = sample_df.iloc[:8].astype({"strength": object})
+    broken.loc[5, "strength"] = "unknown"
+    reported.clear()
+    with pytest.raises(CustomException):
+        store.write(broken, chunk_size=4, on_chunk=reported.append)
+    assert not reported
+    assert len(store.part_files()) == 4
+    assert store.count() == 30
+
+
+def test_stratified_sample(
+    store: DatasetStore, sample_df: pd.DataFrame
+) -> None:
+    """Test that every strength bin contributes at most `per_bin` rows.
+
+    Args:
+        store (DatasetStore): The dataset store.
+        sample_df (pd.DataFrame): The labeled dataset.
+    """
+    assert store.sample(per_bin=2).empty
+    store.sync(sample_df)
+    sample = store.sample(per_bin=2, num_bins=5)
+
+    assert list(sample.columns) == ["password", "strength"]
+    assert len(sample) == 10
+    assert sample["password"].is_unique
+    assert set(sample["password"]) <= set(sample_df["password"])
+    bins = (sample["strength"] * 25 // 5).clip(upper=4)
+    assert bins.value_counts().to_dict() == {0: 2, 1: 2, 2: 2, 3: 2, 4: 2}
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,81 @@
+"""
+This module contains test cases for resumable run checkpoints.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.data_pusher import DataPusher
+from src.interface.config import DatasetStoreConfig
+from src.utils.checkpoint import RunCheckpoint
+
+
+def test_checkpoint_persists_progress(tmp_path: str) -> None:
+    """Test that stage progress and results survive reopening a run.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+    """
+    checkpoint = RunCheckpoint("run", str(tmp_path))
+    checkpoint.update("store", last_chunk=3)
+    checkpoint.save_array("train_arr", np.arange(6).reshape(3, 2))
+    checkpoint.mark_done("transformation")
+
+    resumed = RunCheckpoint("run", str(tmp_path))
+    assert resumed.stage("store")["last_chunk"] == 3
+    assert not resumed.is_done("store")
+    assert resumed.is_done("transformation")
+    np.testing.assert_array_equal(
+        resumed.load_array("train_arr"), np.arange(6).reshape(3, 2)
+    )
+
+
+def test_label_data_resumes_from_shards(
+    tmp_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that labeled shards of an earlier attempt are not relabeled.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Pytest monkeypatch fixture.
+    """
+    data_frame = pd.DataFrame({"password": [f"pass{i}word" for i in range(5)]})
+    checkpoint = RunCheckpoint("run", str(tmp_path))
+    labeled = DataPusher().label_data(data_frame, checkpoint, shard_size=2)
+    assert checkpoint.stage("labeling")["last_shard"] == 2
+
+    def fail(_: str) -> float:
+        raise AssertionError("shard was labeled again")
+
+    monkeypatch.setattr("src.components.data_pusher.calculate_strength", fail)
+    resumed = DataPusher().label_data(
+        data_frame, RunCheckpoint("run", str(tmp_path)), shard_size=2
+    )
+    pd.testing.assert_frame_equal(resumed, labeled)
+
+
+def test_push_resumes_after_last_chunk(tmp_path: str) -> None:
+    """Test that a checkpointed push skips chunks already written.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+    """
+    data_pusher = DataPusher()
+    data_pusher.store_config = DatasetStoreConfig(
+        backend="parquet", parquet_dir=os.path.join(tmp_path, "store")
+    )
+    data_frame = pd.DataFrame(
+        {"password": [f"pass{i}word" for i in range(25)], "strength": 0.5}
+    )
+    checkpoint = RunCheckpoint("run", str(tmp_path))
+    checkpoint.update("store", chunk_size=10, last_chunk=0)
+    data_pusher.push_to_store(data_frame, chunk_size=10, checkpoint=checkpoint)
+
+    assert data_pusher.dataset_store.count() == 15
+    assert checkpoint.stage("store")["last_chunk"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
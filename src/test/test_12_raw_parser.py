@@ -0,0 +1,65 @@
+"""
+This module contains test cases for the sharded wordlist parser.
+"""
+import os
+
+import pytest
+
+from src.utils.data_validation import is_valid_password
+from src.utils.raw_parser import parse_raw_file, split_byte_ranges
+
+
+@pytest.fixture(name="wordlist")  # type: ignore
+def wordlist_fixture(tmp_path: str) -> str:
+    """Fixture to create a wordlist with valid and invalid passwords.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+
+    Returns:
+        str: The path of the wordlist.
+    """
+    lines = [f"pass{i}word" if i % 3 else f"bad pass {i}" for i in range(500)]
+    raw_path = os.path.join(tmp_path, "rockyou.txt")
+    with open(raw_path, "w", encoding="ISO-8859-1", newline="") as file:
+        file.write("\r\n".join(lines[:250]) + "\n\n" + "\n".join(lines[250:]))
+    return raw_path
+
+
+def test_split_byte_ranges(wordlist: str) -> None:
+    """Test that byte ranges cover the file and start at line boundaries.
+
+    Args:
+        wordlist (str): The wordlist path.
+    """
+    ranges = split_byte_ranges(wordlist, 7)
+    with open(wordlist, "rb") as file:
+        data = file.read()
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[start - 1 : start] == b"\n"
+
+
+def test_parse_raw_file_is_deterministic(wordlist: str) -> None:
+    """Test that parallel parsing keeps the original line order.
+
+    Args:
+        wordlist (str): The wordlist path.
+    """
+    with open(wordlist, encoding="ISO-8859-1") as file:
+        expected = [
+            line.rstrip("\r\n")
+            for line in file
+            if line.strip() and is_valid_password(line.rstrip("\r\n"))
+        ]
+    sequential = parse_raw_file(wordlist, num_workers=1, num_shards=5)
+    parallel = parse_raw_file(wordlist, num_workers=3, num_shards=5)
+    parsed = [shard.to_list() for shard in parallel]
+    assert [shard.to_list() for shard in sequential] == parsed
+    assert sum(parsed, []) == expected
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,85 @@
+"""
+This module contains test cases for the compact password column.
+"""
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.data_ingestion import DataIngestion
+from src.components.data_transformation import DataTransformation
+from src.utils.data_validation import is_valid_password, valid_password_mask
+from src.utils.string_column import PasswordColumn
+
+PASSWORDS = ["", "abc", "Passw0rd!", "zz", "ÄÖü12", "aaAA11!!", "qwe rty"]
+
+
+def test_slices_share_the_buffer() -> None:
+    """Test that slices are zero-copy views and take gathers copies."""
+    column = PasswordColumn.from_strings(PASSWORDS)
+    assert len(column) == len(PASSWORDS)
+    assert column.to_list() == PASSWORDS
+    assert column[4] == "ÄÖü12"
+
+    view = column[2:5]
+    assert np.shares_memory(view.buffer, column.buffer)
+    assert view.to_list() == PASSWORDS[2:5]
+    assert view[1:].to_list() == PASSWORDS[3:5]
+
+    taken = column.take([5, 0, 2])
+    assert not np.shares_memory(taken.buffer, column.buffer)
+    assert taken.to_list() == [PASSWORDS[5], PASSWORDS[0], PASSWORDS[2]]
+    assert PasswordColumn.concat([view, taken]).to_list() == (
+        view.to_list() + taken.to_list()
+    )
+
+
+def test_valid_password_mask() -> None:
+    """Test that vectorized validation matches the per-string check."""
+    column = PasswordColumn.from_strings(PASSWORDS)
+    expected = [bool(is_valid_password(text)) for text in PASSWORDS]
+    assert valid_password_mask(column).tolist() == expected
+    assert valid_password_mask(column[1:4]).tolist() == expected[1:4]
+
+
+@pytest.mark.parametrize("passwords", [PASSWORDS, PASSWORDS[:4]])  # type: ignore
+def test_transformers_accept_columns(passwords: List[str]) -> None:
+    """Test that transformers give equal features for columns and frames.
+
+    Args:
+        passwords (list): Passwords, with and without non ASCII ones.
+    """
+    data_frame = pd.DataFrame({"password": passwords})
+    column = PasswordColumn.from_strings(passwords)
+    preprocessor = DataTransformation().get_data_transformer_object(
+        ["password"]
+    )
+    for _, transformer, _ in preprocessor.transformers:
+        feature = next(
+            getattr(transformer, name)
+            for name in dir(transformer)
+            if name.startswith("_") and name.endswith("Transform")
+        )
+        expected = np.array([[feature(text)] for text in passwords])
+        np.testing.assert_array_equal(
+            transformer.transform(data_frame.copy()), expected
+        )
+        np.testing.assert_array_equal(transformer.transform(column), expected)
+
+
+def test_split_passwords_matches_train_test_split() -> None:
+    """Test that the column split keeps the rows of `train_test_split`."""
+    passwords = [f"pass{i}word" for i in range(50)]
+    target = np.arange(50, dtype=float)
+    (train_x, train_y), (test_x, test_y) = DataIngestion().split_passwords(
+        PasswordColumn.from_strings(passwords), target
+    )
+    assert np.shares_memory(train_x.buffer, test_x.buffer)
+    assert len(train_x) == 40 and len(test_x) == 10
+    assert train_x.to_list() == [passwords[int(i)] for i in train_y]
+    assert test_x.to_list() == [passwords[int(i)] for i in test_y]
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,65 @@
+"""
+This module contains test cases for decoding raw BSON batches.
+"""
+import math
+from typing import Any, Dict, List
+
+import bson
+import numpy as np
+import pytest
+from bson import ObjectId
+
+from src.utils.bson_columns import decode_password_batches
+
+
+def test_decode_password_batches() -> None:
+    """Test that only the wanted fields are decoded, from any batch layout."""
+    documents: List[Dict[str, Any]] = [
+        {"_id": ObjectId(), "password": "pass1word", "strength": 0.25},
+        {"password": "Päss2wörd", "strength": 1, "meta": {"a": [1, 2]}},
+        {"strength": 0.5, "password": "pass3word", "key": "abc"},
+        {"password": None, "strength": 0.75},
+        {"password": "pass4word", "flag": True, "count": 2**40},
+    ]
+    batches = [
+        b"".join(bson.encode(document) for document in documents[:2]),
+        b"".join(bson.encode(document) for document in documents[2:]),
+    ]
+    passwords, strengths = decode_password_batches(batches)
+
+    assert passwords.to_list() == [
+        "pass1word",
+        "Päss2wörd",
+        "pass3word",
+        "pass4word",
+    ]
+    assert strengths.dtype == np.float32
+    assert strengths[:3].tolist() == [0.25, 1.0, 0.5]
+    assert math.isnan(strengths[3])
+
+
+def test_uniform_batches_match_walked_batches() -> None:
+    """Test that projected batches decode like batches of any layout."""
+    passwords = [f"pass{i}word" for i in range(20)] + ["\x02password\x00"]
+    documents = [
+        {"password": password, "strength": index / 8}
+        for index, password in enumerate(passwords)
+    ]
+    uniform = b"".join(bson.encode(document) for document in documents[:20])
+    mixed = b"".join(bson.encode(document) for document in documents)
+    column, strengths = decode_password_batches([uniform, mixed])
+
+    assert column.to_list() == passwords[:20] + passwords
+    expected = np.concatenate([np.arange(20), np.arange(21)]) / 8
+    np.testing.assert_array_equal(strengths, expected.astype(np.float32))
+
+
+def test_decode_empty_batches() -> None:
+    """Test that no batches give empty arrays."""
+    passwords, strengths = decode_password_batches([])
+    assert len(passwords) == 0
+    assert len(strengths) == 0
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,113 @@
+"""
+This module contains test cases for saving and loading artifacts.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import src.utils.file_manager as file_manager
+from src.middleware.exception import CustomException
+from src.utils.file_manager import (
+    FrameChunkWriter,
+    append_frame,
+    count_frame_rows,
+    export_csv,
+    frame_paths,
+    iter_frame_chunks,
+    load_frame,
+    save_frame,
+)
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather", ".csv"])  # type: ignore
+def test_frame_round_trip(tmp_path: str, extension: str) -> None:
+    """Test that frames load back with their values and dtypes.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+        extension (str): The artifact format.
+    """
+    data_frame = pd.DataFrame(
+        {"password": ["pass1word", "Päss2wörd"], "strength": [0.25, 0.5]}
+    )
+    file_path = os.path.join(tmp_path, "artifacts", f"train{extension}")
+    save_frame(file_path, data_frame)
+
+    pd.testing.assert_frame_equal(load_frame(file_path), data_frame)
+    pd.testing.assert_frame_equal(
+        load_frame(file_path, columns=["strength"]), data_frame[["strength"]]
+    )
+    if extension != ".csv":
+        csv_path = export_csv(file_path)
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), data_frame)
+
+
+def test_unsupported_format(tmp_path: str) -> None:
+    """Test that unknown extensions are rejected.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+    """
+    with pytest.raises(CustomException):
+        save_frame(os.path.join(tmp_path, "train.txt"), pd.DataFrame())
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".csv"])  # type: ignore
+def test_failed_chunk_write_publishes_nothing(
+    tmp_path: str, extension: str
+) -> None:
+    """Test that an error while writing chunks leaves no file behind.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+        extension (str): The artifact format.
+    """
+    file_path = os.path.join(tmp_path, f"train{extension}")
+    chunk = pd.DataFrame({"password": ["pass1word"], "strength": [0.25]})
+    with pytest.raises(RuntimeError):
+        with FrameChunkWriter(file_path) as writer:
+            writer.write(chunk)
+            raise RuntimeError("stream failed")
+    assert not os.listdir(tmp_path)
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather"])  # type: ignore
+def test_append_writes_parts(
+    tmp_path: str, extension: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that appends leave the stored file alone and are read back.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+        extension (str): The artifact format.
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(file_manager, "MAX_FRAME_PARTS", 2)
+    file_path = os.path.join(tmp_path, f"train{extension}")
+    frames = [
+        pd.DataFrame({"password": [f"pass{i}word"], "strength": [i / 10]})
+        for i in range(5)
+    ]
+    save_frame(file_path, frames[0])
+    stored = os.stat(file_path).st_mtime_ns
+    for frame in frames[1:]:
+        append_frame(file_path, frame)
+    assert os.stat(file_path).st_mtime_ns == stored
+    # The third append merged the first two parts
+    assert len(frame_paths(file_path)) == 3
+
+    expected = pd.concat(frames, ignore_index=True)
+    pd.testing.assert_frame_equal(load_frame(file_path), expected)
+    assert count_frame_rows(file_path) == 5
+    pd.testing.assert_frame_equal(
+        pd.concat(iter_frame_chunks(file_path, 2), ignore_index=True),
+        expected,
+    )
+
+    save_frame(file_path, frames[0])
+    assert frame_paths(file_path) == [file_path]
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,85 @@
+"""
+This module contains test cases for the hash-based train/test split.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from src.components.data_ingestion import DataIngestion
+from src.utils.data_split import StrengthBinCounter, hash_split
+from src.utils.file_manager import load_frame
+
+
+@pytest.fixture(name="dataset")  # type: ignore
+def dataset_fixture() -> pd.DataFrame:
+    """Fixture to create a labeled dataset.
+
+    Returns:
+        pd.DataFrame: The labeled dataset.
+    """
+    return pd.DataFrame(
+        {
+            "password": [f"pass{i}word" for i in range(5000)],
+            "strength": [i / 5000 for i in range(5000)],
+        }
+    )
+
+
+def test_hash_split_is_stable(dataset: pd.DataFrame) -> None:
+    """Test that rows keep their side when the dataset grows.
+
+    Args:
+        dataset (pd.DataFrame): The labeled dataset.
+    """
+    _, test = hash_split(dataset.iloc[:3000])
+    _, grown_test = hash_split(dataset.sample(frac=1, random_state=0))
+
+    assert set(test["password"]) <= set(grown_test["password"])
+    assert set(grown_test["password"]) & set(dataset["password"][:3000]) == (
+        set(test["password"])
+    )
+    assert len(grown_test) / len(dataset) == pytest.approx(0.2, abs=0.02)
+
+
+def test_strength_bin_counter(dataset: pd.DataFrame) -> None:
+    """Test that every strength bin gets about the test share.
+
+    Args:
+        dataset (pd.DataFrame): The labeled dataset.
+    """
+    counter = StrengthBinCounter(num_bins=5)
+    counter.update(*hash_split(dataset))
+    assert counter.train.sum() + counter.test.sum() == len(dataset)
+    for share in counter.test_shares().values():
+        assert share == pytest.approx(0.2, abs=0.05)
+
+
+def test_ingest_stream(tmp_path: str, dataset: pd.DataFrame) -> None:
+    """Test that streaming ingestion saves the in-memory hash split.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+        dataset (pd.DataFrame): The labeled dataset.
+    """
+    data_ingestion = DataIngestion()
+    data_ingestion.filepath_config.train_data_path = os.path.join(
+        tmp_path, "train.parquet"
+    )
+    data_ingestion.filepath_config.test_data_path = os.path.join(
+        tmp_path, "test.parquet"
+    )
+    chunks = (dataset.iloc[i : i + 700] for i in range(0, 5000, 700))
+    train_path, test_path = data_ingestion.ingest_stream(chunks)
+
+    train, test = hash_split(dataset)
+    pd.testing.assert_frame_equal(
+        load_frame(train_path), train.reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(
+        load_frame(test_path), test.reset_index(drop=True)
+    )
+
+
+if __name__ == "__main__":
+    pytest.main()
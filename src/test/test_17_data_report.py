@@ -0,0 +1,80 @@
+"""
+This module contains test cases for the streaming data report.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.data_ingestion import DataIngestion
+from src.utils.data_report import build_report
+
+
+@pytest.fixture(name="dataset")  # type: ignore
+def dataset_fixture() -> pd.DataFrame:
+    """Fixture to create a labeled dataset.
+
+    Returns:
+        pd.DataFrame: The labeled dataset.
+    """
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "password": [f"pass{i}" + "x" * (i % 7) for i in range(1000)],
+            "strength": rng.random(1000),
+        }
+    )
+
+
+def test_build_report_matches_pandas(dataset: pd.DataFrame) -> None:
+    """Test that chunked statistics equal the whole-frame statistics.
+
+    Args:
+        dataset (pd.DataFrame): The labeled dataset.
+    """
+    chunks = (dataset.iloc[i : i + 130] for i in range(0, 1000, 130))
+    report = build_report(chunks)
+    described = dataset["strength"].describe()
+
+    assert report["rows"] == 1000
+    assert len(report["head"]) == 5
+    assert report["head"][0]["password"] == dataset.loc[0, "password"]
+    for key in ["count", "min", "max", "mean", "std"]:
+        assert report["strength"][key] == pytest.approx(described[key])
+    histogram = dataset["strength"].value_counts(bins=np.linspace(0, 1, 6))
+    assert [row["count"] for row in report["strength_histogram"]] == (
+        histogram.sort_index().tolist()
+    )
+    lengths = dataset["password"].str.len().value_counts()
+    assert report["length_counts"] == {
+        str(length): count for length, count in lengths.items()
+    }
+
+
+def test_data_report_writes_artifact(
+    tmp_path: str, dataset: pd.DataFrame
+) -> None:
+    """Test that the report of both splits is saved as JSON.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+        dataset (pd.DataFrame): The labeled dataset.
+    """
+    data_ingestion = DataIngestion()
+    config = data_ingestion.filepath_config
+    config.train_data_path = os.path.join(tmp_path, "train.parquet")
+    config.test_data_path = os.path.join(tmp_path, "test.parquet")
+    config.report_path = os.path.join(tmp_path, "data_report.json")
+    data_ingestion.initiate_data_ingestion(dataset)
+
+    report = data_ingestion.data_report(chunk_size=100)
+    with open(config.report_path, encoding="utf-8") as file:
+        assert json.load(file) == report
+    assert report["train"]["rows"] == 800
+    assert report["test"]["rows"] == 200
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,103 @@
+"""
+This module contains test cases for the chunked feature transformation.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.data_transformation import DataTransformation
+from src.components.model_trainer import ModelTrainer, split_features
+from src.utils.file_manager import save_frame
+
+
+@pytest.fixture(name="data_transformation")  # type: ignore
+def data_transformation_fixture(tmp_path: str) -> DataTransformation:
+    """Fixture to create a DataTransformation over small saved splits.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+
+    Returns:
+        DataTransformation: The DataTransformation instance.
+    """
+    data_transformation = DataTransformation()
+    config = data_transformation.filepath_config
+    config.train_data_path = os.path.join(tmp_path, "train.parquet")
+    config.test_data_path = os.path.join(tmp_path, "test.parquet")
+    config.preprocessor_path = os.path.join(tmp_path, "preprocessor.pkl")
+    config.features_dir = os.path.join(tmp_path, "features")
+    config.feature_store_dir = os.path.join(tmp_path, "feature_store")
+    data_transformation.transformation_config.chunk_size = 64
+
+    passwords = [f"Pass{i}w@rd" + "abc" * (i % 4) for i in range(250)]
+    data_frame = pd.DataFrame(
+        {"password": passwords, "strength": [len(p) / 30 for p in passwords]}
+    )
+    save_frame(config.train_data_path, data_frame.iloc[:200])
+    save_frame(config.test_data_path, data_frame.iloc[200:])
+    return data_transformation
+
+
+def test_chunked_matches_in_memory(
+    data_transformation: DataTransformation,
+) -> None:
+    """Test that chunked memmaps hold the in-memory transformation.
+
+    Args:
+        data_transformation (DataTransformation): The DataTransformation instance.
+    """
+    train_arr, test_arr, _ = data_transformation.initiate_data_transformation(
+        "strength",
+        data_transformation.get_data_transformer_object(["password"]),
+    )
+    train, test, _ = data_transformation.initiate_chunked_transformation(
+        "strength",
+        data_transformation.get_data_transformer_object(["password"]),
+    )
+
+    for memmaps, array in [(train, train_arr), (test, test_arr)]:
+        features, target = memmaps
+        assert isinstance(features, np.memmap)
+        assert features.dtype == np.float32
+        np.testing.assert_array_equal(features, array[:, :-1])
+        np.testing.assert_array_equal(target, array[:, -1])
+    assert not [
+        name
+        for name in os.listdir(
+            data_transformation.filepath_config.features_dir
+        )
+        if name.endswith(".tmp.npy")
+    ]
+
+
+def test_model_trainer_accepts_memmaps(
+    data_transformation: DataTransformation,
+) -> None:
+    """Test that models train on memory-mapped features directly.
+
+    Args:
+        data_transformation (DataTransformation): The DataTransformation instance.
+    """
+    train, test, _ = data_transformation.initiate_chunked_transformation(
+        "strength",
+        data_transformation.get_data_transformer_object(["password"]),
+    )
+    assert split_features(train) is train
+
+    model_trainer = ModelTrainer()
+    model_trainer.filepath_config = data_transformation.filepath_config
+    model_trainer.filepath_config.model_path = os.path.join(
+        data_transformation.filepath_config.features_dir, "model.pkl"
+    )
+    model_trainer.filepath_config.model_report_path = os.path.join(
+        data_transformation.filepath_config.features_dir, "model_report.json"
+    )
+    report = model_trainer.evaluate_models(train, test)
+    name, score = model_trainer.select_best_model(report, test)
+    assert score == pytest.approx(report[name])
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,150 @@
+"""
+This module contains test cases for the content-addressed feature store.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+
+from src.components.data_transformation import DataTransformation
+from src.utils.feature_store import FeatureStore, transformer_fingerprint
+
+
+def make_frame(start: int, stop: int) -> pd.DataFrame:
+    """Build a DataFrame of distinct passwords.
+
+    Args:
+        start (int): First password number.
+        stop (int): Password number after the last.
+
+    Returns:
+        pd.DataFrame: The passwords.
+    """
+    return pd.DataFrame(
+        {
+            "password": [
+                f"Pa{i}ss_w0rd" + "x" * (i % 5) for i in range(start, stop)
+            ]
+        }
+    )
+
+
+@pytest.fixture(name="transformer")  # type: ignore
+def transformer_fixture() -> ColumnTransformer:
+    """Fixture to create a fitted preprocessing object.
+
+    Returns:
+        ColumnTransformer: The fitted ColumnTransformer.
+    """
+    transformer = DataTransformation().get_data_transformer_object(
+        ["password"]
+    )
+    transformer.fit(make_frame(0, 1))
+    return transformer
+
+
+def test_exact_and_partial_hits(
+    transformer: ColumnTransformer, tmp_path: str
+) -> None:
+    """Test that stored rows are reused and only new rows are featurized.
+
+    Args:
+        transformer (ColumnTransformer): The fitted ColumnTransformer.
+        tmp_path (str): Pytest temporary directory.
+    """
+    feature_store = FeatureStore(os.path.join(tmp_path, "store"))
+    first = make_frame(0, 100)
+    features = feature_store.transform(transformer, first)
+    np.testing.assert_array_equal(features, transformer.transform(first))
+    assert feature_store.computed_rows == 100
+
+    again = feature_store.transform(transformer, first)
+    np.testing.assert_array_equal(again, features)
+    assert feature_store.computed_rows == 100
+
+    grown = make_frame(50, 150).sample(frac=1, random_state=0)
+    grown_features = feature_store.transform(transformer, grown)
+    np.testing.assert_array_equal(grown_features, transformer.transform(grown))
+    assert feature_store.computed_rows == 150
+    assert feature_store.reused_rows == 150
+
+
+def test_fingerprint_follows_transformers(
+    transformer: ColumnTransformer,
+) -> None:
+    """Test that a changed transformer set gets another fingerprint.
+
+    Args:
+        transformer (ColumnTransformer): The fitted ColumnTransformer.
+    """
+    fewer = DataTransformation().get_data_transformer_object(["password"])
+    fewer.transformers = fewer.transformers[:-1]
+    assert transformer_fingerprint(transformer) == transformer_fingerprint(
+        DataTransformation().get_data_transformer_object(["password"])
+    )
+    assert transformer_fingerprint(transformer) != transformer_fingerprint(
+        fewer
+    )
+
+
+def test_eviction_keeps_budget(
+    transformer: ColumnTransformer, tmp_path: str
+) -> None:
+    """Test that least recently used entries are evicted.
+
+    Args:
+        transformer (ColumnTransformer): The fitted ColumnTransformer.
+        tmp_path (str): Pytest temporary directory.
+    """
+    directory = os.path.join(tmp_path, "store")
+    feature_store = FeatureStore(directory, max_bytes=1)
+    feature_store.transform(transformer, make_frame(0, 10))
+    feature_store.transform(transformer, make_frame(100, 110))
+
+    entries = feature_store._read_index()
+    assert len(entries) == 1
+    files = [*entries, "index.json", "index.lock"]
+    assert sorted(os.listdir(directory)) == sorted(files)
+
+
+def test_transformation_uses_store(tmp_path: str) -> None:
+    """Test that the data transformation matches with and without store.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+    """
+    data_transformation = DataTransformation()
+    config = data_transformation.filepath_config
+    config.train_data_path = os.path.join(tmp_path, "train.parquet")
+    config.test_data_path = os.path.join(tmp_path, "test.parquet")
+    config.preprocessor_path = os.path.join(tmp_path, "preprocessor.pkl")
+    config.feature_store_dir = os.path.join(tmp_path, "feature_store")
+    data_frame = make_frame(0, 120).assign(strength=np.linspace(0, 1, 120))
+    data_frame.iloc[:100].to_parquet(config.train_data_path)
+    data_frame.iloc[100:].to_parquet(config.test_data_path)
+
+    results = []
+    for max_bytes in [0, 1 << 20, 1 << 20]:
+        data_transformation.transformation_config.feature_store_max_bytes = (
+            max_bytes
+        )
+        (
+            train_arr,
+            test_arr,
+            _,
+        ) = data_transformation.initiate_data_transformation(
+            "strength",
+            data_transformation.get_data_transformer_object(["password"]),
+        )
+        results.append((train_arr, test_arr))
+    for train_arr, test_arr in results[1:]:
+        np.testing.assert_array_equal(train_arr, results[0][0])
+        np.testing.assert_array_equal(test_arr, results[0][1])
+    # The train and test entries, the index and its lock
+    assert len(os.listdir(config.feature_store_dir)) == 4
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,123 @@
+"""
+This module contains test cases for incremental ingestion from the
+dataset store change feed.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from src.pipe.pipeline import Pipeline
+from src.store.base import DatasetStore
+from src.store.parquet_store import ParquetStore
+from src.store.sqlite_store import SQLiteStore
+from src.utils.file_manager import count_frame_rows
+
+
+def make_rows(start: int, stop: int) -> pd.DataFrame:
+    """Build labeled rows of distinct valid passwords.
+
+    Args:
+        start (int): First password number.
+        stop (int): Password number after the last.
+
+    Returns:
+        pd.DataFrame: The rows.
+    """
+    passwords = [f"Pass{i}word!" for i in range(start, stop)]
+    return pd.DataFrame(
+        {
+            "password": passwords,
+            "strength": [i / stop for i in range(start, stop)],
+        }
+    )
+
+
+@pytest.fixture(name="store", params=["parquet", "sqlite"])  # type: ignore
+def store_fixture(
+    request: pytest.FixtureRequest, tmp_path: str
+) -> DatasetStore:
+    """Fixture to create an empty local dataset store.
+
+    Args:
+        request (pytest.FixtureRequest): Selects the backend.
+        tmp_path (str): Pytest temporary directory.
+
+    Returns:
+        DatasetStore: The dataset store.
+    """
+    if request.param == "parquet":
+        return ParquetStore(os.path.join(tmp_path, "store"))
+    return SQLiteStore(os.path.join(tmp_path, "dataset.sqlite"), "dataset")
+
+
+def test_iter_changes(store: DatasetStore) -> None:
+    """Test that only rows added after a cursor are yielded.
+
+    Args:
+        store (DatasetStore): The dataset store.
+    """
+    store.write(make_rows(0, 30), chunk_size=10)
+    cursor = store.changes_cursor()
+    store.write(make_rows(30, 55), chunk_size=10)
+
+    changes = list(store.iter_changes(cursor, chunk_size=10))
+    added = pd.concat([chunk for chunk, _ in changes], ignore_index=True)
+    pd.testing.assert_frame_equal(added, make_rows(30, 55))
+    assert changes[-1][1] == store.changes_cursor()
+    assert not list(store.iter_changes(changes[-1][1]))
+
+
+def test_ingest_changes(tmp_path: str) -> None:
+    """Test that new rows are validated, labeled, split and appended.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+    """
+    pipeline = Pipeline()
+    pipeline.data_pusher.store_config.backend = "parquet"
+    pipeline.data_pusher.store_config.parquet_dir = os.path.join(
+        tmp_path, "store"
+    )
+    pipeline.filepath_config.ingest_cursor_path = os.path.join(
+        tmp_path, "cursor.json"
+    )
+    config = pipeline.data_ingestion.filepath_config
+    config.train_data_path = os.path.join(tmp_path, "train.parquet")
+    config.test_data_path = os.path.join(tmp_path, "test.parquet")
+    pipeline.data_transformation.filepath_config.feature_store_dir = (
+        os.path.join(tmp_path, "feature_store")
+    )
+
+    store = pipeline.data_pusher.dataset_store
+    store.write(make_rows(0, 100))
+    pipeline.data_ingestion.initiate_data_ingestion(make_rows(0, 100))
+    pipeline._save_ingest_cursor(store.changes_cursor())
+
+    new_rows = make_rows(100, 140).drop(columns=["strength"])
+    store.write(
+        pd.concat([new_rows, pd.DataFrame({"password": ["a b", "x"]})])
+    )
+
+    assert pipeline.ingest_changes() == 40
+    train_rows = count_frame_rows(config.train_data_path)
+    assert train_rows + count_frame_rows(config.test_data_path) == 140
+    assert pipeline.ingest_changes() == 0
+
+
+def test_ingest_changes_needs_cursor(tmp_path: str) -> None:
+    """Test that incremental ingestion requires an earlier full ingestion.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+    """
+    pipeline = Pipeline()
+    pipeline.filepath_config.ingest_cursor_path = os.path.join(
+        tmp_path, "cursor.json"
+    )
+    with pytest.raises(Exception, match="run push_data first"):
+        pipeline.ingest_changes()
+
+
+if __name__ == "__main__":
+    pytest.main()
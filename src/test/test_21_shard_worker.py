@@ -0,0 +1,157 @@
+"""
+This module contains test cases for lease-based distributed data
+preparation.
+"""
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.components.data_transformation import DataTransformation
+from src.components.shard_worker import ShardWorker
+from src.coordination.base import DONE, LEASED
+from src.coordination.sqlite_coordinator import SQLiteCoordinator
+from src.test.config import MockFilePathConfig
+from src.utils.data_split import holdout_mask
+from src.utils.raw_parser import parse_raw_file
+
+
+def make_worker(tmp_path: str, worker_id: str) -> ShardWorker:
+    """Create a worker over a local raw file and SQLite coordinator.
+
+    Args:
+        tmp_path (str): Directory shared by all workers.
+        worker_id (str): Identifier of the worker.
+
+    Returns:
+        ShardWorker: The configured worker.
+    """
+    worker = ShardWorker(worker_id)
+    filepath_config = worker.data_pusher.filepath_config
+    filepath_config.raw_data_path = os.path.join(tmp_path, "raw.txt")
+    filepath_config.raw_cache_dir = os.path.join(tmp_path, "raw_cache")
+    config = worker.coordination_config
+    config.sqlite_path = os.path.join(tmp_path, "coordination.sqlite")
+    config.results_dir = os.path.join(tmp_path, "shards")
+    config.num_shards = 8
+    config.lease_seconds = 1.0
+    config.poll_seconds = 0.1
+    return worker
+
+
+def run_worker(tmp_path: str, worker_id: str) -> None:
+    """Run a worker until all shards are done.
+
+    Args:
+        tmp_path (str): Directory shared by all workers.
+        worker_id (str): Identifier of the worker.
+    """
+    make_worker(tmp_path, worker_id).run()
+
+
+def test_lease_lifecycle(tmp_path: str) -> None:
+    """Test leasing, renewing, expiry and completion of shards.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+    """
+    coordinator = SQLiteCoordinator(os.path.join(tmp_path, "c.sqlite"))
+    assert coordinator.create_shards([(0, 10), (10, 20)]) == 2
+    assert coordinator.create_shards([(0, 10), (10, 20)]) == 0
+
+    first = coordinator.lease("a", 60)
+    second = coordinator.lease("b", 0.05)
+    assert first is not None and second is not None
+    assert (first.shard_id, second.shard_id) == (0, 1)
+    assert coordinator.lease("c", 60) is None
+    assert coordinator.renew(0, "a", 60)
+    assert not coordinator.renew(0, "b", 60)
+
+    time.sleep(0.1)
+    taken_over = coordinator.lease("c", 60)
+    assert taken_over is not None
+    assert (taken_over.shard_id, taken_over.attempts) == (1, 2)
+    assert not coordinator.complete(1, "b", "late.parquet")
+    assert coordinator.complete(1, "c", "done.parquet")
+    assert coordinator.progress() == {"pending": 0, LEASED: 1, DONE: 1}
+
+
+def test_workers_in_processes(tmp_path: str) -> None:
+    """Test that several processes prepare every shard exactly once, and
+    that the shard of a crashed worker is taken over.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+    """
+    rng = np.random.default_rng(0)
+    alphabet = np.array(list("abcdefXYZ0123!@# "))
+    lines = [
+        "".join(rng.choice(alphabet, rng.integers(2, 12))) for _ in range(3000)
+    ]
+    with open(
+        os.path.join(tmp_path, "raw.txt"), "w", encoding="utf-8"
+    ) as file:
+        file.write("\n".join(lines) + "\n")
+
+    planner = make_worker(str(tmp_path), "planner")
+    assert planner.plan_shards() == 8
+    assert planner.coordinator is planner.coordinator
+    # A worker that leases a shard and dies without completing it
+    assert planner.coordinator.lease("crashed", 0.5) is not None
+
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=run_worker, args=(str(tmp_path), f"w{i}"))
+        for i in range(3)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    shards = planner.coordinator.shards()
+    assert all(shard.status == DONE for shard in shards)
+    assert all(shard.owner != "crashed" for shard in shards)
+
+    prepared = planner.collect()
+    expected = [
+        password
+        for shard in parse_raw_file(
+            planner.data_pusher.ensure_password_cache(), num_workers=1
+        )
+        for password in shard.to_list()
+    ]
+    assert prepared["password"].tolist() == expected
+    assert prepared.shape[1] == 2 + 15
+    assert prepared["strength"].between(0, 1).all()
+
+    # The full corpus becomes the memory-mapped train and test arrays
+    transformation = DataTransformation()
+    transformation.filepath_config = MockFilePathConfig()
+    transformation.filepath_config.features_dir = os.path.join(
+        tmp_path, "features"
+    )
+    transformation.filepath_config.preprocessor_path = os.path.join(
+        tmp_path, "preprocessor.pkl"
+    )
+    transformer = transformation.get_data_transformer_object(["password"])
+    (
+        (X_train, y_train),
+        (X_test, y_test),
+        _,
+    ) = transformation.initiate_shard_transformation(
+        "strength", transformer, planner.coordinator.result_paths()
+    )
+    is_test = holdout_mask(prepared["password"], 0.2)
+    assert len(X_train) + len(X_test) == len(prepared)
+    assert np.array_equal(y_test, prepared["strength"][is_test])
+    assert np.allclose(
+        X_train, transformer.transform(prepared[~is_test][["password"]])
+    )
+
+
+if __name__ == "__main__":
+    pytest.main()
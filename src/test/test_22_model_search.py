@@ -0,0 +1,166 @@
+"""
+This module contains test cases for the budgeted successive halving search.
+"""
+import os
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+from src.components.model_trainer import ModelTrainer
+from src.middleware.exception import CustomException
+from src.utils.model_search import Array, dataset_fingerprint, successive_halving
+
+PARAM_GRID: Dict[str, List[Any]] = {
+    "max_depth": [1, 2, 4, 8],
+    "splitter": ["best", "random"],
+    "min_samples_leaf": [1, 5],
+}
+
+
+def test_halving_narrows_and_refits(
+    regression_data: Tuple[Array, Array]
+) -> None:
+    """Test that rungs shrink, samples grow and the winner is refit.
+
+    Args:
+        regression_data (Tuple[Array, Array]): The features and target.
+    """
+    X, y = regression_data
+    result = successive_halving(
+        DecisionTreeRegressor(random_state=0), PARAM_GRID, X, y
+    )
+    candidates = [rung["candidates"] for rung in result.rungs]
+    samples = [rung["n_samples"] for rung in result.rungs]
+    assert candidates == sorted(candidates, reverse=True)
+    assert candidates[0] == 16
+    assert samples == sorted(samples) and samples[-1] == len(X)
+    assert result.best_params["max_depth"] == 8
+    assert result.best_estimator.get_params()["max_depth"] == 8
+    assert result.best_estimator.score(X, y) > 0.9
+    assert result.trials_run == sum(candidates)
+
+
+def test_trials_are_cached(
+    regression_data: Tuple[Array, Array], tmp_path: str
+) -> None:
+    """Test that a repeated search reuses every trial and the refit model.
+
+    Args:
+        regression_data (Tuple[Array, Array]): The features and target.
+        tmp_path (str): Pytest temporary directory.
+    """
+    X, y = regression_data
+    first = successive_halving(
+        DecisionTreeRegressor(random_state=0),
+        PARAM_GRID,
+        X,
+        y,
+        cache_dir=str(tmp_path),
+    )
+    second = successive_halving(
+        DecisionTreeRegressor(random_state=0),
+        PARAM_GRID,
+        X,
+        y,
+        cache_dir=str(tmp_path),
+    )
+    assert second.trials_run == 0
+    assert second.trials_cached == first.trials_run
+    assert second.best_params == first.best_params
+
+    changed = successive_halving(
+        DecisionTreeRegressor(random_state=0),
+        PARAM_GRID,
+        X,
+        y[::-1].copy(),
+        cache_dir=str(tmp_path),
+    )
+    assert changed.trials_run > 0
+    assert dataset_fingerprint(X, y) != dataset_fingerprint(X, y[::-1])
+
+
+def test_budget_stops_after_first_rung(
+    regression_data: Tuple[Array, Array]
+) -> None:
+    """Test that a spent budget keeps the best of the first rung.
+
+    Args:
+        regression_data (Tuple[Array, Array]): The features and target.
+    """
+    X, y = regression_data
+    result = successive_halving(
+        DecisionTreeRegressor(random_state=0),
+        PARAM_GRID,
+        X,
+        y,
+        time_budget=1e-9,
+    )
+    assert len(result.rungs) == 1
+    assert result.trials_run == 16
+    assert result.best_estimator is not None
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")  # type: ignore
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")  # type: ignore
+def test_failed_candidates_rank_last(
+    regression_data: Tuple[Array, Array]
+) -> None:
+    """Test that failed fits lose and that a search with no fit fails.
+
+    Args:
+        regression_data (Tuple[Array, Array]): The features and target.
+    """
+    X, y = regression_data
+    # Poisson trees fail to fit negative targets and score NaN
+    y = y - y.mean()
+    result = successive_halving(
+        DecisionTreeRegressor(random_state=0),
+        {"criterion": ["poisson", "squared_error"], "max_depth": [4, 8]},
+        X,
+        y,
+    )
+    assert result.best_params["criterion"] == "squared_error"
+    assert np.isfinite(result.best_score)
+
+    with pytest.raises(CustomException, match="Every candidate failed"):
+        successive_halving(
+            DecisionTreeRegressor(random_state=0),
+            {"criterion": ["poisson"], "max_depth": [4, 8]},
+            X,
+            y,
+        )
+
+
+def test_model_trainer_halving_mode(
+    regression_data: Tuple[Array, Array], tmp_path: str
+) -> None:
+    """Test that the trainer keeps the refit estimator of its search.
+
+    Args:
+        regression_data (Tuple[Array, Array]): The features and target.
+        tmp_path (str): Pytest temporary directory.
+    """
+    X, y = regression_data
+    model_trainer = ModelTrainer()
+    model_trainer.trainer_config.search_mode = "halving"
+    model_trainer.filepath_config.search_cache_dir = str(tmp_path)
+    model_trainer.filepath_config.model_path = os.path.join(
+        tmp_path, "model.pkl"
+    )
+    model_trainer.filepath_config.model_report_path = os.path.join(
+        tmp_path, "model_report.json"
+    )
+    report = model_trainer.evaluate_models(
+        (X[:700], y[:700]), (X[700:], y[700:])
+    )
+    model = model_trainer.models["Decision Tree"]
+    assert hasattr(model, "tree_")
+    name, score = model_trainer.select_best_model(report, (X[700:], y[700:]))
+    assert name == max(report, key=lambda model_name: report[model_name])
+    assert score == pytest.approx(report[name])
+
+
+if __name__ == "__main__":
+    pytest.main()
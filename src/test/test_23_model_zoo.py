@@ -0,0 +1,149 @@
+"""
+This module contains test cases for model selection under serving budgets.
+"""
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+from src.components.model_trainer import ModelTrainer
+from src.test.config import MockFilePathConfig
+from src.utils.model_profile import profile_model
+
+SMALL_PARAMS: Dict[str, Dict[str, List[Any]]] = {
+    "Decision Tree": {"max_depth": [8]},
+    "Hist Gradient Boosting": {"max_iter": [20]},
+    "Random Forest": {"n_estimators": [5], "max_depth": [8]},
+    "Ridge": {"ridge__alpha": [1.0]},
+}
+
+Arrays = Tuple[np.ndarray[np.float64, Any], np.ndarray[np.float64, Any]]
+
+
+@pytest.fixture(name="arrays")  # type: ignore
+def arrays_fixture() -> Arrays:
+    """Fixture to create train and test arrays with the target last.
+
+    Returns:
+        Arrays: The train and test arrays.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 10, size=(600, 4)).astype(np.float64)
+    y = (X[:, 0] * 3 + X[:, 1] ** 2 + rng.normal(0, 0.1, 600)) / 100
+    data = np.column_stack([X, y])
+    return data[:450], data[450:]
+
+
+@pytest.fixture(name="trainer")  # type: ignore
+def trainer_fixture(tmp_path: str) -> ModelTrainer:
+    """Fixture to create a ModelTrainer with small grids and tmp paths.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+
+    Returns:
+        ModelTrainer: The model trainer.
+    """
+    trainer = ModelTrainer()
+    trainer.filepath_config = MockFilePathConfig()
+    trainer.filepath_config.model_path = os.path.join(tmp_path, "model.pkl")
+    trainer.filepath_config.model_report_path = os.path.join(
+        tmp_path, "model_report.json"
+    )
+    trainer.params = SMALL_PARAMS
+    return trainer
+
+
+def test_profile_model(arrays: Arrays) -> None:
+    """Test that profiling reports latency, size and load time.
+
+    Args:
+        arrays (Arrays): The train and test arrays.
+    """
+    train, test = arrays
+    model = DecisionTreeRegressor().fit(train[:, :-1], train[:, -1])
+    # Blocks that do not divide the rows still score every row once
+    metrics = profile_model(model, test[:, :-1], test[:, -1], block_rows=40)
+    assert metrics["r2"] == pytest.approx(
+        model.score(test[:, :-1], test[:, -1])
+    )
+    assert 0 < metrics["p50_ms"] <= metrics["p99_ms"]
+    assert metrics["batch_ms"] > 0 and metrics["load_ms"] > 0
+    assert metrics["size_bytes"] > 0
+
+
+def test_select_most_accurate_without_budgets(
+    trainer: ModelTrainer, arrays: Arrays
+) -> None:
+    """Test that all candidates are reported and the best r2 wins.
+
+    Args:
+        trainer (ModelTrainer): The model trainer.
+        arrays (Arrays): The train and test arrays.
+    """
+    train, test = arrays
+    test_report = trainer.evaluate_models(train, test)
+    assert list(test_report) == list(SMALL_PARAMS)
+    name, _ = trainer.select_best_model(test_report, test)
+    assert name == max(test_report, key=lambda name: test_report[name])
+
+    with open(
+        trainer.filepath_config.model_report_path, encoding="utf-8"
+    ) as file:
+        report = json.load(file)
+    assert report["selected"] == name
+    assert set(report["candidates"]) == set(SMALL_PARAMS)
+    for metrics in report["candidates"].values():
+        assert metrics["within_budget"]
+        assert {"r2", "p99_ms", "batch_ms", "size_bytes", "load_ms"} <= set(
+            metrics
+        )
+
+
+def test_select_within_size_budget(
+    trainer: ModelTrainer, arrays: Arrays
+) -> None:
+    """Test that candidates over the size budget are never selected.
+
+    Args:
+        trainer (ModelTrainer): The model trainer.
+        arrays (Arrays): The train and test arrays.
+    """
+    train, test = arrays
+    test_report = trainer.evaluate_models(train, test)
+    sizes = {
+        name: metrics["size_bytes"]
+        for name, metrics in trainer.model_report.items()
+    }
+    largest = max(sizes, key=lambda name: sizes[name])
+    trainer.trainer_config.max_artifact_bytes = sizes[largest] - 1
+    eligible = {
+        name: score
+        for name, score in test_report.items()
+        if sizes[name] < sizes[largest]
+    }
+    name, _ = trainer.select_best_model(test_report, test)
+    assert name != largest
+    assert name == max(eligible, key=lambda name: eligible[name])
+
+
+def test_no_model_within_budget(trainer: ModelTrainer, arrays: Arrays) -> None:
+    """Test that selection fails when no candidate meets the budgets.
+
+    Args:
+        trainer (ModelTrainer): The model trainer.
+        arrays (Arrays): The train and test arrays.
+    """
+    train, test = arrays
+    test_report = trainer.evaluate_models(train, test)
+    trainer.trainer_config.max_artifact_bytes = 1
+    with pytest.raises(Exception, match="serving budgets"):
+        trainer.select_best_model(test_report, test)
+    assert not os.path.exists(trainer.filepath_config.model_path)
+
+
+if __name__ == "__main__":
+    pytest.main()
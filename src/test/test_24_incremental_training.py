@@ -0,0 +1,165 @@
+"""
+This module contains test cases for out-of-core incremental training.
+"""
+import os
+from typing import Tuple
+
+import numpy as np
+import pytest
+
+from src.components.model_trainer import ModelTrainer
+from src.test.config import MockFilePathConfig
+from src.utils.incremental_model import (
+    Array,
+    IncrementalRegressor,
+    fit_out_of_core,
+    iter_blocks,
+)
+
+
+def save_arrays(
+    directory: str, name: str, X: Array, y: Array
+) -> Tuple[Array, Array]:
+    """Save features and target, and open them memory-mapped.
+
+    Args:
+        directory (str): The directory of the arrays.
+        name (str): The name of the split.
+        X (np.ndarray): The features.
+        y (np.ndarray): The target.
+
+    Returns:
+        Tuple[Array, Array]: Memmaps of the features and target.
+    """
+    features_path = os.path.join(directory, f"{name}_X.npy")
+    target_path = os.path.join(directory, f"{name}_y.npy")
+    np.save(features_path, X.astype(np.float32))
+    np.save(target_path, y)
+    return (
+        np.load(features_path, mmap_mode="r"),
+        np.load(target_path, mmap_mode="r"),
+    )
+
+
+@pytest.fixture(name="data")  # type: ignore
+def data_fixture() -> Tuple[Array, Array]:
+    """Fixture to create a linear regression problem.
+
+    Returns:
+        Tuple[Array, Array]: The features and target.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3000, 5)) * [1, 10, 100, 1, 1]
+    y = X @ [0.5, 0.02, 0.003, -0.4, 0.1] + rng.normal(0, 0.01, 3000)
+    return X, y
+
+
+@pytest.fixture(name="trainer")  # type: ignore
+def trainer_fixture(tmp_path: str) -> ModelTrainer:
+    """Fixture to create a ModelTrainer in the incremental mode.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+
+    Returns:
+        ModelTrainer: The model trainer.
+    """
+    trainer = ModelTrainer()
+    trainer.filepath_config = MockFilePathConfig()
+    trainer.filepath_config.model_path = os.path.join(tmp_path, "model.pkl")
+    trainer.filepath_config.model_report_path = os.path.join(
+        tmp_path, "model_report.json"
+    )
+    trainer.trainer_config.training_mode = "incremental"
+    trainer.trainer_config.incremental_block_rows = 500
+    return trainer
+
+
+def test_iter_blocks_bounded_and_complete(data: Tuple[Array, Array]) -> None:
+    """Test that blocks are bounded and cover every row once.
+
+    Args:
+        data (Tuple[Array, Array]): The features and target.
+    """
+    X, y = data
+    blocks = list(iter_blocks(X, y, 700, np.random.default_rng(0)))
+    assert max(len(X_block) for X_block, _ in blocks) == 700
+    rows = np.concatenate([X_block[:, 0] for X_block, _ in blocks])
+    assert np.array_equal(np.sort(rows), np.sort(X[:, 0]))
+
+
+@pytest.mark.parametrize("estimator", ["sgd", "mlp"])  # type: ignore
+def test_fit_out_of_core(
+    data: Tuple[Array, Array], tmp_path: str, estimator: str
+) -> None:
+    """Test that both estimators learn from memory-mapped blocks.
+
+    Args:
+        data (Tuple[Array, Array]): The features and target.
+        tmp_path (str): The pytest temporary directory.
+        estimator (str): The incremental estimator.
+    """
+    X, y = save_arrays(str(tmp_path), "train", *data)
+    model = fit_out_of_core(
+        IncrementalRegressor(estimator), X, y, block_rows=500, epochs=10
+    )
+    assert model.n_rows_seen_ == 10 * len(X)
+    assert model.score(X, y) > 0.9
+
+
+def test_trainer_incremental_mode(
+    trainer: ModelTrainer, data: Tuple[Array, Array], tmp_path: str
+) -> None:
+    """Test that the incremental model is profiled and selected.
+
+    Args:
+        trainer (ModelTrainer): The model trainer.
+        data (Tuple[Array, Array]): The features and target.
+        tmp_path (str): The pytest temporary directory.
+    """
+    X, y = data
+    train = save_arrays(str(tmp_path), "train", X[:2500], y[:2500])
+    test = save_arrays(str(tmp_path), "test", X[2500:], y[2500:])
+    report = trainer.evaluate_models(train, test)
+    assert list(report) == ["Incremental SGD"]
+    assert "p99_ms" in trainer.model_report["Incremental SGD"]
+    name, score = trainer.select_best_model(report, test)
+    assert name == "Incremental SGD" and score > 0.9
+    assert os.path.exists(trainer.filepath_config.model_path)
+
+
+def test_warm_start_learns_appended_rows(
+    trainer: ModelTrainer, data: Tuple[Array, Array], tmp_path: str
+) -> None:
+    """Test that a warm start continues on the appended rows only.
+
+    Args:
+        trainer (ModelTrainer): The model trainer.
+        data (Tuple[Array, Array]): The features and target.
+        tmp_path (str): The pytest temporary directory.
+    """
+    X, y = data
+    test = save_arrays(str(tmp_path), "test", X[2500:], y[2500:])
+    train = save_arrays(str(tmp_path), "train", X[:2000], y[:2000])
+    report = trainer.evaluate_models(train, test)
+    trainer.select_best_model(report, test)
+    first = trainer.models["Incremental SGD"]
+    seen = first.n_rows_seen_
+
+    trainer.trainer_config.warm_start = True
+    train = save_arrays(str(tmp_path), "train", X[:2500], y[:2500])
+    report = trainer.evaluate_models(train, test)
+    model = trainer.models["Incremental SGD"]
+    epochs = trainer.trainer_config.incremental_epochs
+    assert model.n_rows_seen_ == seen + 500 * epochs
+    assert model.n_train_rows_ == 2500
+    assert np.allclose(model.scaler_.mean_, first.scaler_.mean_)
+    assert report["Incremental SGD"] > 0.9
+
+    trainer.trainer_config.incremental_estimator = "mlp"
+    trainer.evaluate_models(train, test)
+    assert trainer.models["Incremental MLP"].n_rows_seen_ == 2500 * epochs
+
+
+if __name__ == "__main__":
+    pytest.main()
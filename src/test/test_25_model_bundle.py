@@ -0,0 +1,116 @@
+"""
+This module contains test cases for the versioned model bundle.
+"""
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+from src.utils.model_bundle import MANIFEST_FILE, MODEL_FILE, load_bundle, save_bundle
+
+Bundled = Tuple[ColumnTransformer, HistGradientBoostingRegressor, pd.DataFrame]
+
+
+@pytest.fixture(name="bundled")  # type: ignore
+def bundled_fixture(
+    fitted: Tuple[ColumnTransformer, np.ndarray[np.float64, Any], pd.DataFrame]
+) -> Bundled:
+    """Fixture to fit a model on the features of a few passwords.
+
+    Args:
+        fitted (Tuple[ColumnTransformer, np.ndarray, pd.DataFrame]): The
+        preprocessor, features and passwords.
+
+    Returns:
+        Bundled: The preprocessor, the model and the password frame.
+    """
+    transformer, features, frame = fitted
+    target = np.linspace(0, 1, len(frame))
+    model = HistGradientBoostingRegressor(max_iter=10, min_samples_leaf=5)
+    return transformer, model.fit(features, target), frame
+
+
+def test_roundtrip_matches_pickles(bundled: Bundled, tmp_path: str) -> None:
+    """Test that a bundle predicts like the model and preprocessor.
+
+    Args:
+        bundled (Bundled): The preprocessor, model and passwords.
+        tmp_path (str): The pytest temporary directory.
+    """
+    transformer, model, frame = bundled
+    directory = os.path.join(tmp_path, "bundle")
+    manifest = save_bundle(directory, model, transformer, {"score": 0.9})
+    assert manifest["features"][0] == "len"
+    assert len(manifest["features"]) == model.n_features_in_
+
+    bundle = load_bundle(directory)
+    expected = model.predict(transformer.transform(frame))
+    assert np.array_equal(bundle.predict(frame), expected)
+    assert np.array_equal(bundle.predict(frame["password"].tolist()), expected)
+    assert bundle.manifest["metadata"] == {"score": 0.9}
+    assert bundle.load_ms > 0
+    assert isinstance(bundle.model._predictors[0][0].nodes, np.memmap)
+
+
+def test_rejects_corrupt_bundle(bundled: Bundled, tmp_path: str) -> None:
+    """Test that modified files and manifests fail validation.
+
+    Args:
+        bundled (Bundled): The preprocessor, model and passwords.
+        tmp_path (str): The pytest temporary directory.
+    """
+    transformer, model, _ = bundled
+    directory = os.path.join(tmp_path, "bundle")
+    save_bundle(directory, model, transformer)
+
+    model_path = os.path.join(directory, MODEL_FILE)
+    with open(model_path, "r+b") as file:
+        file.seek(-1, os.SEEK_END)
+        last = file.read(1)
+        file.seek(-1, os.SEEK_END)
+        file.write(bytes([last[0] ^ 0xFF]))
+    with pytest.raises(Exception, match="Hash"):
+        load_bundle(directory)
+
+    save_bundle(directory, model, transformer)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    with open(manifest_path, encoding="utf-8") as file:
+        manifest = json.load(file)
+    manifest["features"].pop()
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+    with pytest.raises(Exception, match="modified"):
+        load_bundle(directory)
+
+
+def test_serving_does_not_import_pandas(
+    bundled: Bundled, tmp_path: str
+) -> None:
+    """Test that loading a bundle and predicting leaves pandas unloaded.
+
+    Args:
+        bundled (Bundled): The preprocessor, model and passwords.
+        tmp_path (str): The pytest temporary directory.
+    """
+    transformer, model, _ = bundled
+    directory = os.path.join(tmp_path, "bundle")
+    save_bundle(directory, model, transformer)
+    script = (
+        "import sys\n"
+        "from src.utils.model_bundle import load_bundle\n"
+        f"bundle = load_bundle({directory!r})\n"
+        "bundle.predict(['hunter2'])\n"
+        "assert 'pandas' not in sys.modules, 'pandas imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,85 @@
+"""
+This module contains test cases for sharing arrays with worker processes.
+"""
+import os
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pytest
+from joblib import Parallel, delayed
+
+from src.utils.shared_arrays import shared_arrays
+
+
+def describe(
+    X: np.ndarray[np.float64, Any]
+) -> Tuple[bool, Optional[str], float]:
+    """Describe an array as a worker process received it.
+
+    Args:
+        X (np.ndarray): The array.
+
+    Returns:
+        Tuple[bool, Optional[str], float]: Whether it is memory-mapped,
+        its file and its sum.
+    """
+    return (
+        isinstance(X, np.memmap),
+        getattr(X, "filename", None),
+        float(X.sum()),
+    )
+
+
+def test_arrays_are_copied_once(tmp_path: str) -> None:
+    """Test that arrays are shared as read-only memmaps and cleaned up.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    X = np.arange(12, dtype=np.float64).reshape(4, 3)
+    y = np.arange(4, dtype=np.float64)
+    with shared_arrays(
+        X[:, :-1], y, directory=str(tmp_path), dtypes=(np.float32, None)
+    ) as (X_shared, y_shared):
+        assert isinstance(X_shared, np.memmap)
+        assert X_shared.dtype == np.float32 and y_shared.dtype == np.float64
+        assert np.array_equal(X_shared, X[:, :-1])
+        assert np.array_equal(y_shared, y)
+        assert not X_shared.flags.writeable
+        assert len(os.listdir(tmp_path)) == 1
+    assert not os.listdir(tmp_path)
+
+
+def test_memmaps_pass_through(tmp_path: str) -> None:
+    """Test that memory-mapped arrays are not copied again.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    path = os.path.join(tmp_path, "X.npy")
+    np.save(path, np.ones((5, 2)))
+    X = np.load(path, mmap_mode="r")
+    with shared_arrays(X, directory=str(tmp_path)) as (X_shared,):
+        assert X_shared is X
+
+
+def test_workers_attach_without_copy(tmp_path: str) -> None:
+    """Test that loky workers receive the memmap, not a pickled copy.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    X = np.random.default_rng(0).random((300_000, 4))
+    with shared_arrays(X, directory=str(tmp_path)) as (X_shared,):
+        assert isinstance(X_shared, np.memmap)
+        results = Parallel(n_jobs=2, backend="loky")(
+            delayed(describe)(X_shared) for _ in range(2)
+        )
+    for is_memmap, filename, total in results:
+        assert is_memmap
+        assert filename == X_shared.filename
+        assert total == pytest.approx(X.sum())
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,136 @@
+"""
+This module contains test cases for the distributed search task server.
+"""
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+from src.components.model_trainer import ModelTrainer
+from src.coordination.task_server import TaskServer, distributed_search, run_worker
+from src.test.config import MockFilePathConfig
+from src.utils.model_search import Array
+
+PARAM_GRID: Dict[str, List[Any]] = {
+    "max_depth": [1, 2, 8],
+    "min_samples_leaf": [1, 5],
+}
+AUTHKEY = "test-key"
+
+
+@pytest.fixture(name="address")  # type: ignore
+def address_fixture() -> str:
+    """Fixture to pick a free local port for the task server.
+
+    Returns:
+        str: The "host:port" address.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return f"127.0.0.1:{probe.getsockname()[1]}"
+
+
+def test_in_process_without_authkey(
+    regression_data: Tuple[Array, Array]
+) -> None:
+    """Test that a search without auth key runs every task in process.
+
+    Args:
+        regression_data (Tuple[Array, Array]): The features and target.
+    """
+    X, y = regression_data
+    with TaskServer("127.0.0.1:1", "") as server:
+        assert not server.remote
+        result = distributed_search(
+            DecisionTreeRegressor(random_state=0), PARAM_GRID, X, y, server
+        )
+    assert result.trials_run == 6 * 3
+    assert result.best_params["max_depth"] == 8
+    assert result.best_estimator.score(X, y) > 0.9
+
+
+def test_workers_run_the_tasks(
+    regression_data: Tuple[Array, Array], address: str
+) -> None:
+    """Test that worker processes run all tasks of a served search.
+
+    Args:
+        regression_data (Tuple[Array, Array]): The features and target.
+        address (str): The task server address.
+    """
+    X, y = regression_data
+    with TaskServer(address, AUTHKEY) as server, ProcessPoolExecutor(
+        2
+    ) as pool:
+        assert server.remote and server.started
+        workers = [
+            pool.submit(run_worker, address, AUTHKEY, 1.0) for _ in range(2)
+        ]
+        result = distributed_search(
+            DecisionTreeRegressor(random_state=0),
+            PARAM_GRID,
+            X,
+            y,
+            server,
+            work_locally=False,
+        )
+        assert sum(worker.result() for worker in workers) == 6 * 3
+    assert result.best_params["max_depth"] == 8
+
+
+def test_silent_workers_are_taken_over(
+    regression_data: Tuple[Array, Array], address: str
+) -> None:
+    """Test that tasks nobody runs are run by the coordinator in the end.
+
+    Args:
+        regression_data (Tuple[Array, Array]): The features and target.
+        address (str): The task server address.
+    """
+    X, y = regression_data
+    with TaskServer(address, AUTHKEY) as server:
+        result = distributed_search(
+            DecisionTreeRegressor(random_state=0),
+            PARAM_GRID,
+            X,
+            y,
+            server,
+            task_timeout=0.2,
+            work_locally=False,
+        )
+    assert result.best_params["max_depth"] == 8
+
+
+def test_model_trainer_distributed_mode(
+    regression_data: Tuple[Array, Array], address: str, tmp_path: str
+) -> None:
+    """Test that the trainer searches all models over one task server.
+
+    Args:
+        regression_data (Tuple[Array, Array]): The features and target.
+        address (str): The task server address.
+        tmp_path (str): The pytest temporary directory.
+    """
+    X, y = regression_data
+    trainer = ModelTrainer()
+    trainer.filepath_config = MockFilePathConfig()
+    trainer.filepath_config.model_path = os.path.join(tmp_path, "model.pkl")
+    trainer.trainer_config.search_mode = "distributed"
+    trainer.trainer_config.task_server_address = address
+    trainer.trainer_config.task_server_authkey = AUTHKEY
+    trainer.params = {
+        "Decision Tree": {"max_depth": [2, 8]},
+        "Hist Gradient Boosting": {"max_iter": [20]},
+        "Random Forest": {"n_estimators": [5]},
+        "Ridge": {"ridge__alpha": [1.0]},
+    }
+    report = trainer.evaluate_models((X[:450], y[:450]), (X[450:], y[450:]))
+    assert set(report) == set(trainer.params)
+    assert trainer.models["Decision Tree"].get_params()["max_depth"] == 8
+
+
+if __name__ == "__main__":
+    pytest.main()
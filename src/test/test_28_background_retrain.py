@@ -0,0 +1,170 @@
+"""
+This module contains test cases for background retraining and the atomic
+swap of published model bundles.
+"""
+import os
+import time
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import Ridge
+
+import src.api.components as components
+from src.api.app import app
+from src.interface.config import RetrainConfig
+from src.pipe.retrain import retrain_status, start_retrain
+from src.utils.model_bundle import (
+    CURRENT_FILE,
+    LiveBundle,
+    current_bundle_dir,
+    live_bundle,
+    publish_bundle,
+)
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+def test_publish_swaps_live_bundle(
+    fitted: Tuple[
+        ColumnTransformer, np.ndarray[np.float64, Any], pd.DataFrame
+    ],
+    tmp_path: str,
+) -> None:
+    """Test that a published version replaces the live bundle, while a
+    bundle already handed out keeps predicting with the old model.
+
+    Args:
+        fitted (Tuple[ColumnTransformer, np.ndarray, pd.DataFrame]): The
+        preprocessor, features and passwords.
+        tmp_path (str): The pytest temporary directory.
+    """
+    transformer, features, frame = fitted
+    target = np.linspace(0, 1, len(frame))
+    root = os.path.join(tmp_path, "bundle")
+    live = LiveBundle(root)
+    assert live.get() is None
+
+    old_model = Ridge().fit(features, target)
+    old_version, _ = publish_bundle(root, old_model, transformer, keep=1)
+    in_flight = live.get()
+    assert in_flight is not None
+    assert in_flight.manifest["metadata"]["version"] == old_version
+    assert live.get() is in_flight
+
+    new_model = Ridge().fit(features, 1 - target)
+    new_version, _ = publish_bundle(root, new_model, transformer, keep=1)
+    assert new_version > old_version
+    assert current_bundle_dir(root) == os.path.join(root, new_version)
+    # The replaced version outlives `keep`
+    assert os.path.exists(os.path.join(root, old_version))
+    current = live.get()
+    assert current is not None
+    assert current.manifest["metadata"]["version"] == new_version
+    assert np.allclose(in_flight.predict(frame), old_model.predict(features))
+
+    # A corrupt version is skipped, the live bundle keeps serving
+    with open(os.path.join(root, CURRENT_FILE), "w", encoding="utf-8") as file:
+        file.write("missing")
+    assert live.get() is current
+
+    # A pinned version is never removed
+    third_version, _ = publish_bundle(
+        root, new_model, transformer, keep=1, pinned=[old_version]
+    )
+    assert os.path.exists(os.path.join(root, old_version))
+    publish_bundle(root, new_model, transformer, keep=1)
+    assert not os.path.exists(os.path.join(root, old_version))
+    assert os.path.exists(os.path.join(root, third_version))
+
+
+def test_retrain_in_background(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: str
+) -> None:
+    """Test that a retrain process publishes a bundle the server swaps to,
+    and that a second retrain is refused while the first runs.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+        tmp_path (str): The pytest temporary directory.
+    """
+    rng = np.random.default_rng(0)
+    passwords = [
+        "".join(rng.choice(list("abcXYZ123!@"), rng.integers(4, 20)))
+        for _ in range(600)
+    ]
+    frame = pd.DataFrame(
+        {
+            "password": passwords,
+            "strength": [len(password) / 20 for password in passwords],
+        }
+    )
+    os.makedirs(os.path.join(tmp_path, "artifacts"))
+    frame[:450].to_parquet(os.path.join(tmp_path, "artifacts/train.parquet"))
+    frame[450:].to_parquet(os.path.join(tmp_path, "artifacts/test.parquet"))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PYTHONPATH", REPO_DIR)
+    monkeypatch.setenv("DATASET_STORE", "parquet")
+    monkeypatch.setenv("TRAINING_MODE", "incremental")
+
+    assert retrain_status()["state"] == "idle"
+    started, status = start_retrain()
+    assert started and status["state"] == "running"
+    pid = status["pid"]
+    started, status = start_retrain()
+    assert not started and status["state"] == "running"
+    assert status["pid"] == pid
+
+    deadline = time.monotonic() + 120
+    while retrain_status()["state"] == "running":
+        assert time.monotonic() < deadline
+        time.sleep(0.2)
+    status = retrain_status()
+    assert status["state"] == "succeeded", status
+    bundle = live_bundle(os.path.join("artifacts", "bundle")).get()
+    assert bundle is not None
+    assert bundle.manifest["metadata"]["version"] == status["version"]
+    assert bundle.manifest["metadata"]["training_mode"] == "incremental"
+
+
+def test_admin_endpoints_require_token(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: str
+) -> None:
+    """Test that the admin endpoints are disabled without a token and
+    reject a wrong one.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+        tmp_path (str): The pytest temporary directory.
+    """
+    monkeypatch.chdir(tmp_path)
+    client = TestClient(app)
+    monkeypatch.setattr(
+        components, "RetrainConfig", lambda: RetrainConfig(admin_token="")
+    )
+    assert client.get("/admin/retrain").status_code == 403
+
+    monkeypatch.setattr(
+        components, "RetrainConfig", lambda: RetrainConfig(admin_token="key")
+    )
+    response = client.post(
+        "/admin/retrain", json={}, headers={"X-Admin-Token": "wrong"}
+    )
+    assert response.status_code == 401
+    response = client.get("/admin/retrain", headers={"X-Admin-Token": "key"})
+    assert response.status_code == 200
+    assert response.json()["state"] == "idle"
+
+    # Without the POSIX lock the retrain endpoint is unavailable
+    monkeypatch.setattr(components, "retrain_supported", lambda: False)
+    response = client.post(
+        "/admin/retrain", json={}, headers={"X-Admin-Token": "key"}
+    )
+    assert response.status_code == 501
+
+
+if __name__ == "__main__":
+    pytest.main()
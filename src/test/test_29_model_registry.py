@@ -0,0 +1,131 @@
+"""
+This module contains test cases for the model registry of the API and its
+shadow scoring.
+"""
+import os
+from typing import Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import Ridge
+
+import src.api.components as components
+from src.api.app import app
+from src.api.utils.model_registry import ModelRegistry
+from src.interface.config import RetrainConfig, ServingConfig
+from src.utils.model_bundle import publish_bundle
+
+
+@pytest.fixture(name="versions")  # type: ignore
+def versions_fixture(
+    fitted: Tuple[
+        ColumnTransformer, np.ndarray[np.float64, Any], pd.DataFrame
+    ],
+    tmp_path: str,
+) -> Tuple[str, str, str]:
+    """Fixture to publish a candidate version and then a primary version.
+
+    Args:
+        fitted (Tuple[ColumnTransformer, np.ndarray, pd.DataFrame]): The
+        preprocessor, features and passwords.
+        tmp_path (str): The pytest temporary directory.
+
+    Returns:
+        Tuple[str, str, str]: The bundle root and the candidate and
+        primary versions.
+    """
+    transformer, features, frame = fitted
+    target = np.linspace(0, 1, len(frame))
+    root = os.path.join(tmp_path, "bundle")
+    candidate, _ = publish_bundle(
+        root, Ridge().fit(features, target), transformer
+    )
+    primary, _ = publish_bundle(
+        root, Ridge(alpha=100).fit(features, target), transformer
+    )
+    return root, candidate, primary
+
+
+def test_shadow_scoring(
+    versions: Tuple[str, str, str], passwords: List[str]
+) -> None:
+    """Test that the primary serves and the candidate is compared with it.
+
+    Args:
+        versions (Tuple[str, str, str]): The bundle root and versions.
+        passwords (List[str]): The passwords.
+    """
+    root, candidate, primary = versions
+    registry = ModelRegistry(
+        root, ServingConfig(shadow_version=candidate, shadow_fraction=1.0)
+    )
+    served = [registry.predict(passwords) for _ in range(4)]
+    assert np.array_equal(served[0], registry.load(primary).predict(passwords))
+    registry.close()
+
+    summary = registry.summary()
+    assert summary["primary"] == primary
+    assert summary["candidate"] == candidate
+    assert summary["versions"][primary]["requests"] == 4
+    assert summary["versions"][primary]["compared"] == 0
+    stats = summary["versions"][candidate]
+    assert stats["requests"] == 4 and stats["errors"] == 0
+    assert stats["compared"] == 4 * len(passwords)
+    assert 0 <= stats["agreement"] <= 1
+    expected = np.abs(
+        registry.load(candidate).predict(passwords) - served[0]
+    ).mean()
+    assert stats["mean_abs_diff"] == pytest.approx(expected)
+    assert stats["p99_ms"] >= stats["p50_ms"] > 0
+
+    registry.set_candidate(None)
+    assert set(registry.bundles) == {primary}
+
+
+def test_shadow_fraction_and_failures(
+    versions: Tuple[str, str, str], passwords: List[str]
+) -> None:
+    """Test that no request is shadowed at fraction 0 and that a failing
+    candidate never fails the served request.
+
+    Args:
+        versions (Tuple[str, str, str]): The bundle root and versions.
+        passwords (List[str]): The passwords.
+    """
+    root, candidate, primary = versions
+    registry = ModelRegistry(
+        root, ServingConfig(shadow_version=candidate, shadow_fraction=0.0)
+    )
+    registry.predict(passwords)
+    registry.predict(passwords, shadow=False)
+    registry.set_candidate("missing", fraction=1.0)
+    registry.predict(passwords)
+    registry.close()
+
+    summary = registry.summary()
+    assert set(summary["versions"]) == {primary, "missing"}
+    assert summary["versions"][primary]["requests"] == 3
+    assert summary["versions"]["missing"]["errors"] == 1
+
+
+def test_model_stats_endpoint(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the model statistics require the admin token.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+    """
+    client = TestClient(app)
+    monkeypatch.setattr(
+        components, "RetrainConfig", lambda: RetrainConfig(admin_token="key")
+    )
+    assert client.get("/admin/models").status_code == 401
+    response = client.get("/admin/models", headers={"X-Admin-Token": "key"})
+    assert response.status_code == 200
+    assert response.json()["pid"] == os.getpid()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,101 @@
+"""
+This module contains test cases for the process-wide model cache.
+"""
+import os
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import Ridge
+
+from src.middleware.exception import CustomException
+from src.pipe.pipeline import Pipeline
+from src.test.config import MockFilePathConfig
+from src.utils.file_manager import save_object
+from src.utils.model_cache import ModelCache, model_cache
+
+
+def test_loads_once_and_reloads_on_change(tmp_path: str) -> None:
+    """Test that an artifact is loaded once and reloaded after a change.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    path = os.path.join(tmp_path, "model.pkl")
+    save_object(path, {"version": 1})
+    cache = ModelCache()
+    first = cache.get(path)
+    assert all(cache.get(path) is first for _ in range(5))
+    stats = cache.stats()[os.path.abspath(path)]
+    assert stats["loads"] == 1 and stats["hits"] == 5
+    assert stats["total_load_ms"] == stats["last_load_ms"] > 0
+
+    replacement = os.path.join(tmp_path, "model.pkl.tmp")
+    save_object(replacement, {"version": 2})
+    os.replace(replacement, path)
+    assert cache.get(path) == {"version": 2}
+    assert cache.stats()[os.path.abspath(path)]["loads"] == 2
+
+
+def test_keeps_artifact_on_failed_reload(tmp_path: str) -> None:
+    """Test that a corrupt or missing artifact keeps the loaded one.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    path = os.path.join(tmp_path, "model.pkl")
+    cache = ModelCache()
+    with pytest.raises(CustomException):
+        cache.get(path)
+
+    save_object(path, {"version": 1})
+    loaded = cache.get(path)
+    with open(path, "wb") as file:
+        file.write(b"partial")
+    assert cache.get(path) is loaded
+    os.remove(path)
+    assert cache.get(path) is loaded
+    assert cache.stats()[os.path.abspath(path)]["loads"] == 1
+
+
+def test_pipeline_predict_loads_pickles_once(
+    fitted: Tuple[
+        ColumnTransformer, np.ndarray[np.float64, Any], pd.DataFrame
+    ],
+    tmp_path: str,
+) -> None:
+    """Test that repeated predictions of the pipeline load no pickle again.
+
+    Args:
+        fitted (Tuple[ColumnTransformer, np.ndarray, pd.DataFrame]): The
+        preprocessor, features and passwords.
+        tmp_path (str): The pytest temporary directory.
+    """
+    transformer, features, frame = fitted
+    model = Ridge().fit(features, np.linspace(0, 1, len(frame)))
+
+    pipeline = Pipeline()
+    pipeline.filepath_config = MockFilePathConfig()
+    pipeline.filepath_config.model_path = os.path.join(tmp_path, "model.pkl")
+    pipeline.filepath_config.preprocessor_path = os.path.join(
+        tmp_path, "preprocessor.pkl"
+    )
+    pipeline.filepath_config.bundle_dir = os.path.join(tmp_path, "bundle")
+    save_object(pipeline.filepath_config.model_path, model)
+    save_object(pipeline.filepath_config.preprocessor_path, transformer)
+
+    for _ in range(3):
+        result = pipeline.predict(frame)
+    assert np.allclose(result, model.predict(features))
+    stats = model_cache().stats()
+    for path in (
+        pipeline.filepath_config.model_path,
+        pipeline.filepath_config.preprocessor_path,
+    ):
+        assert stats[os.path.abspath(path)]["loads"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main()
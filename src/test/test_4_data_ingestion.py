@@ -3,11 +3,11 @@ This module contains test cases for the DataIngestion class.
 """
 import os
 
-import pandas as pd
 import pytest
 
 from src.components.data_ingestion import DataIngestion
 from src.components.data_pusher import DataPusher
+from src.utils.file_manager import load_frame
 
 
 def test_initiate_data_ingestion(
@@ -53,8 +53,8 @@ def test_train_test_split_ratio(
     """
     dataframe = data_pusher.get_data_from_mongodb()
     train_path, test_path = data_ingestion.initiate_data_ingestion(dataframe)
-    train_df = pd.read_csv(train_path)
-    test_df = pd.read_csv(test_path)
+    train_df = load_frame(train_path)
+    test_df = load_frame(test_path)
     total_samples = len(train_df) + len(test_df)
     expected_train_ratio = len(train_df) / total_samples
     expected_test_ratio = len(test_df) / total_samples
@@ -74,8 +74,8 @@ def test_missing_values(
     """
     dataframe = data_pusher.get_data_from_mongodb()
     train_path, test_path = data_ingestion.initiate_data_ingestion(dataframe)
-    train_df = pd.read_csv(train_path)
-    test_df = pd.read_csv(test_path)
+    train_df = load_frame(train_path)
+    test_df = load_frame(test_path)
     assert not train_df.isnull().values.any()
     assert not test_df.isnull().values.any()
 
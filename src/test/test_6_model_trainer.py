@@ -15,14 +15,13 @@ def test_init(model_trainer: ModelTrainer) -> None:
         model_trainer (ModelTrainer): The ModelTrainer instance.
     """
     assert isinstance(model_trainer.models, dict)
-    assert len(model_trainer.models) == 1
+    assert len(model_trainer.models) == 4
     assert "Decision Tree" in model_trainer.models
     assert isinstance(
         model_trainer.models["Decision Tree"], DecisionTreeRegressor
     )
     assert isinstance(model_trainer.params, dict)
-    assert len(model_trainer.params) == 1
-    assert "Decision Tree" in model_trainer.params
+    assert set(model_trainer.params) == set(model_trainer.models)
     assert isinstance(model_trainer.params["Decision Tree"], dict)
 
 
@@ -47,9 +46,9 @@ def test_evaluate_models(
     )
     result = model_trainer.evaluate_models(train_array, test_array)
     assert isinstance(result, dict)
-    assert len(result) == 1
-    assert list(result.keys()) == ["Decision Tree"]
+    assert list(result.keys()) == list(model_trainer.models)
     assert isinstance(result["Decision Tree"], float)
+    assert set(model_trainer.model_report) == set(result)
 
 
 def test_select_best_model(
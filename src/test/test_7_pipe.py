@@ -24,6 +24,17 @@ def test_train(pipeline: Pipeline) -> None:
     pipeline.train()
 
 
+def test_run(pipeline: Pipeline) -> None:
+    """Test case for the end-to-end `run` method.
+
+    Args:
+        pipeline (Pipeline): The Pipeline instance.
+    """
+    name_model, score = pipeline.run()
+    assert isinstance(name_model, str)
+    assert score > 0.6
+
+
 def test_predict(pipeline: Pipeline, custom_data: CustomData) -> None:
     """Test case for the `predict` method.
 
@@ -0,0 +1,85 @@
+"""
+This module contains test cases for the raw dataset cache.
+"""
+import os
+
+import pytest
+
+from src.middleware.exception import CustomException
+from src.utils.dataset_cache import (
+    build_password_cache,
+    compute_checksum,
+    decode_passwords,
+    is_cache_valid,
+    load_password_cache,
+)
+
+
+@pytest.fixture(name="raw_file")  # type: ignore
+def raw_file_fixture(tmp_path: str) -> str:
+    """Fixture to create a small raw wordlist.
+
+    Args:
+        tmp_path (str): Pytest temporary directory.
+
+    Returns:
+        str: The path of the raw wordlist.
+    """
+    raw_path = os.path.join(tmp_path, "rockyou.txt")
+    with open(raw_path, "wb") as file:
+        file.write(b"123456\r\npassword\n\nm\xe9lanie\nabc\tdef\nlast")
+    return raw_path
+
+
+def test_build_and_load_cache(raw_file: str, tmp_path: str) -> None:
+    """Test that the cache round-trips the raw passwords.
+
+    Args:
+        raw_file (str): The raw wordlist path.
+        tmp_path (str): Pytest temporary directory.
+    """
+    cache_dir = os.path.join(tmp_path, "cache")
+    manifest = build_password_cache(raw_file, cache_dir)
+    assert manifest["num_passwords"] == 5
+    assert is_cache_valid(cache_dir, raw_file)
+
+    buffer, offsets = load_password_cache(cache_dir)
+    assert decode_passwords(buffer, offsets) == [
+        "123456",
+        "password",
+        "mélanie",
+        "abc\tdef",
+        "last",
+    ]
+
+
+def test_cache_invalidation(raw_file: str, tmp_path: str) -> None:
+    """Test that the cache is invalidated by a changed raw file or checksum.
+
+    Args:
+        raw_file (str): The raw wordlist path.
+        tmp_path (str): Pytest temporary directory.
+    """
+    cache_dir = os.path.join(tmp_path, "cache")
+    build_password_cache(raw_file, cache_dir)
+    assert is_cache_valid(cache_dir, raw_file, compute_checksum(raw_file))
+    assert not is_cache_valid(cache_dir, raw_file, "0" * 64)
+
+    with open(raw_file, "ab") as file:
+        file.write(b"\nappended")
+    assert not is_cache_valid(cache_dir, raw_file)
+
+
+def test_checksum_mismatch(raw_file: str, tmp_path: str) -> None:
+    """Test that a wrong expected checksum is rejected.
+
+    Args:
+        raw_file (str): The raw wordlist path.
+        tmp_path (str): Pytest temporary directory.
+    """
+    with pytest.raises(CustomException):
+        build_password_cache(raw_file, os.path.join(tmp_path, "cache"), "0")
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,263 @@
+"""
+Module for decoding raw BSON batches straight into columnar arrays.
+
+`find_raw_batches` hands out the undecoded bytes of a cursor batch. Walking
+those bytes and copying only the wanted fields avoids building one Python
+dict per document, and password bytes are copied into the column buffer
+without ever being decoded into Python strings.
+"""
+import struct
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.middleware.exception import CustomException
+from src.utils.string_column import OFFSET_DTYPE, PasswordColumn
+
+INT32 = struct.Struct("<i")
+INT64 = struct.Struct("<q")
+DOUBLE = struct.Struct("<d")
+
+BSON_DOUBLE = 0x01
+BSON_STRING = 0x02
+BSON_INT32 = 0x10
+BSON_INT64 = 0x12
+
+
+def _skip_cstring(data: bytes, position: int) -> int:
+    """Get the position after a null terminated string."""
+    return data.index(b"\x00", position) + 1
+
+
+def _skip_string(data: bytes, position: int) -> int:
+    """Get the position after a length prefixed string."""
+    return position + 4 + int(INT32.unpack_from(data, position)[0])
+
+
+def _skip_embedded(data: bytes, position: int) -> int:
+    """Get the position after a value that starts with its total size."""
+    return position + int(INT32.unpack_from(data, position)[0])
+
+
+def _skip_binary(data: bytes, position: int) -> int:
+    """Get the position after a binary value and its subtype byte."""
+    return position + 5 + int(INT32.unpack_from(data, position)[0])
+
+
+def _skip_regex(data: bytes, position: int) -> int:
+    """Get the position after a pattern and options pair of cstrings."""
+    return _skip_cstring(data, _skip_cstring(data, position))
+
+
+def _skip_db_pointer(data: bytes, position: int) -> int:
+    """Get the position after a namespace string and ObjectId."""
+    return _skip_string(data, position) + 12
+
+
+def _skip_fixed(size: int) -> Callable[[bytes, int], int]:
+    """Build a skipper for values of a fixed size."""
+    return lambda data, position: position + size
+
+
+# Size of the value of every BSON element type, as a function of its start
+SKIP_VALUE: Dict[int, Callable[[bytes, int], int]] = {
+    0x01: _skip_fixed(8),  # double
+    0x02: _skip_string,  # string
+    0x03: _skip_embedded,  # document
+    0x04: _skip_embedded,  # array
+    0x05: _skip_binary,  # binary
+    0x06: _skip_fixed(0),  # undefined
+    0x07: _skip_fixed(12),  # ObjectId
+    0x08: _skip_fixed(1),  # bool
+    0x09: _skip_fixed(8),  # UTC datetime
+    0x0A: _skip_fixed(0),  # null
+    0x0B: _skip_regex,  # regex
+    0x0C: _skip_db_pointer,  # DBPointer
+    0x0D: _skip_string,  # JavaScript code
+    0x0E: _skip_string,  # symbol
+    0x0F: _skip_embedded,  # JavaScript code with scope
+    0x10: _skip_fixed(4),  # int32
+    0x11: _skip_fixed(8),  # timestamp
+    0x12: _skip_fixed(8),  # int64
+    0x13: _skip_fixed(16),  # decimal128
+    0x7F: _skip_fixed(0),  # max key
+    0xFF: _skip_fixed(0),  # min key
+}
+
+
+def _gather(
+    data: np.ndarray[np.uint8, Any],
+    positions: np.ndarray[np.int64, Any],
+    dtype: str,
+) -> Any:
+    """Read one little-endian value of a fixed size at every position."""
+    size = np.dtype(dtype).itemsize
+    return data[positions[:, None] + np.arange(size)].view(dtype)[:, 0]
+
+
+def _find_element(
+    data: np.ndarray[np.uint8, Any],
+    positions: np.ndarray[np.int64, Any],
+    header: bytes,
+) -> np.ndarray[np.bool_, Any]:
+    """Check which positions hold the given element type and name."""
+    found = positions + len(header) <= len(data)
+    for index, byte in enumerate(header):
+        found[found] = data[positions[found] + index] == byte
+    return found
+
+
+def _decode_uniform_batch(
+    data: np.ndarray[np.uint8, Any], password_name: bytes, target_name: bytes
+) -> Optional[Tuple[PasswordColumn, np.ndarray[np.float64, Any]]]:
+    """Decode a batch whose documents all are `{password: str, target: double}`.
+
+    This is the layout of a two field projection of documents pushed by
+    this package. Every document is located with vectorized searches, and
+    the batch is only accepted if those documents tile it exactly.
+
+    Args:
+        data (np.ndarray): The uint8 bytes of the batch.
+        password_name (bytes): Name of the password field.
+        target_name (bytes): Name of the target field.
+
+    Returns:
+        Optional[Tuple[PasswordColumn, np.ndarray]]: The passwords and
+        float64 targets, or None if the batch has another layout.
+    """
+    password_header = bytes([BSON_STRING]) + password_name + b"\x00"
+    target_header = bytes([BSON_DOUBLE]) + target_name + b"\x00"
+
+    candidates = np.flatnonzero(data == BSON_STRING)
+    candidates = candidates[candidates >= 4]
+    elements = candidates[_find_element(data, candidates, password_header)]
+    if len(elements) == 0:
+        return None
+    starts = elements - 4
+    ends = starts + _gather(data, starts, "<i4")
+    # The documents must tile the batch exactly
+    contiguous = bool(np.all(starts[1:] == ends[:-1]))
+    if starts[0] != 0 or ends[-1] != len(data) or not contiguous:
+        return None
+
+    password_starts = elements + len(password_header) + 4
+    password_ends = password_starts + _gather(
+        data, elements + len(password_header), "<i4"
+    )
+    # The target element, its 8 byte value and the document terminator
+    # must fill the rest of every document.
+    if np.any(password_ends + len(target_header) + 8 != ends - 1):
+        return None
+    if not np.all(_find_element(data, password_ends, target_header)):
+        return None
+
+    targets = _gather(data, password_ends + len(target_header), "<f8")
+    column = PasswordColumn.from_segments(
+        data, password_starts, password_ends - 1
+    )
+    return column, targets
+
+
+def _walk_batch(
+    data: bytes, password_name: bytes, target_name: bytes
+) -> Tuple[PasswordColumn, np.ndarray[np.float64, Any]]:
+    """Decode a batch of any layout by walking its elements.
+
+    Args:
+        data (bytes): The batch.
+        password_name (bytes): Name of the password field.
+        target_name (bytes): Name of the target field.
+
+    Returns:
+        Tuple[PasswordColumn, np.ndarray]: The passwords and float64
+        targets.
+    """
+    buffer = bytearray()
+    offsets: List[int] = [0]
+    targets: List[float] = []
+
+    document = 0
+    while document < len(data):
+        end = document + INT32.unpack_from(data, document)[0]
+        position = document + 4
+        password = None
+        target = float("nan")
+        # The last byte of a document terminates its element list
+        while position < end - 1:
+            kind = data[position]
+            name_end = data.index(b"\x00", position + 1)
+            name = data[position + 1 : name_end]
+            position = name_end + 1
+            if name == password_name and kind == BSON_STRING:
+                size = INT32.unpack_from(data, position)[0]
+                password = data[position + 4 : position + 3 + size]
+            elif name == target_name:
+                if kind == BSON_DOUBLE:
+                    target = DOUBLE.unpack_from(data, position)[0]
+                elif kind == BSON_INT32:
+                    target = INT32.unpack_from(data, position)[0]
+                elif kind == BSON_INT64:
+                    target = INT64.unpack_from(data, position)[0]
+            position = SKIP_VALUE[kind](data, position)
+        if password is not None:
+            buffer += password
+            offsets.append(len(buffer))
+            targets.append(target)
+        document = end
+
+    column = PasswordColumn(
+        np.frombuffer(bytes(buffer), dtype=np.uint8),
+        np.array(offsets, dtype=OFFSET_DTYPE),
+    )
+    return column, np.array(targets, dtype=np.float64)
+
+
+def decode_password_batches(
+    batches: Iterable[bytes],
+    password_field: str = "password",
+    target_field: str = "strength",
+) -> Tuple[PasswordColumn, np.ndarray[np.float32, Any]]:
+    """Decode raw BSON batches into a password column and a target array.
+
+    Batches of the usual two field projection are decoded with vectorized
+    searches; any other layout is walked element by element. Documents
+    without a string password are skipped, and a missing or non-numeric
+    target becomes NaN.
+
+    Args:
+        batches (Iterable[bytes]): Raw batches of `find_raw_batches`.
+        password_field (str, optional): Field holding the password.
+        Defaults to "password".
+        target_field (str, optional): Field holding the target.
+        Defaults to "strength".
+
+    Raises:
+        CustomException: If a batch is not valid BSON.
+
+    Returns:
+        Tuple[PasswordColumn, np.ndarray]: The UTF-8 password column and
+        the float32 targets.
+    """
+    try:
+        password_name = password_field.encode("utf-8")
+        target_name = target_field.encode("utf-8")
+        columns = []
+        targets = []
+        for data in batches:
+            decoded = _decode_uniform_batch(
+                np.frombuffer(data, dtype=np.uint8), password_name, target_name
+            )
+            if decoded is None:
+                decoded = _walk_batch(data, password_name, target_name)
+            columns.append(decoded[0])
+            targets.append(decoded[1].astype(np.float32))
+
+        if not columns:
+            return PasswordColumn.from_strings([]), np.array(
+                [], dtype=np.float32
+            )
+        return PasswordColumn.concat(columns), np.concatenate(targets)
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
@@ -1,6 +1,7 @@
 """Build Model"""
 import argparse
 import json
+from typing import Optional
 
 from src.interface.config import config
 from src.pipe.pipeline import Pipeline
@@ -24,11 +25,16 @@ def generate_json(values: dict[str, str]) -> None:
         json.dump(values, file)
 
 
-def process_and_train() -> None:
-    """This function utilizes the Pipeline class to perform data pushing and training."""
+def process_and_train(run_id: Optional[str] = None) -> None:
+    """This function utilizes the Pipeline class to perform data pushing and training.
+
+    Args:
+        run_id (Optional[str], optional): Identifier of a resumable run.
+        Defaults to None.
+    """
     pipeline = Pipeline()
-    pipeline.push_data()
-    pipeline.train()
+    pipeline.push_data(run_id)
+    pipeline.train(run_id)
 
 
 if __name__ == "__main__":
@@ -38,9 +44,14 @@ if __name__ == "__main__":
         action="store_true",
         help="Whether to process and train the model",
     )
+    parser.add_argument(
+        "--run-id",
+        default=None,
+        help="Resume or checkpoint the run with this identifier",
+    )
     args = parser.parse_args()
 
     generate_json(kaggle_credentials)
 
     if args.train:
-        process_and_train()
+        process_and_train(args.run_id)
@@ -0,0 +1,204 @@
+"""
+Module for checkpointing long-running pipeline stages.
+
+A run keeps a JSON manifest of stage progress next to the frames and
+arrays persisted by its stages, so re-invoking the same run continues from
+the last checkpoint instead of starting over.
+"""
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+
+MANIFEST_FILE = "manifest.json"
+MmapMode = Literal["r+", "r", "w+", "c"]
+
+
+class RunCheckpoint:
+    """Run manifest plus the intermediate results of its stages."""
+
+    def __init__(self, run_id: str, checkpoint_dir: str) -> None:
+        """Open or create the checkpoint of a run.
+
+        Args:
+            run_id (str): Identifier of the run.
+            checkpoint_dir (str): Directory holding all run checkpoints.
+        """
+        self.run_id = run_id
+        self.directory = os.path.join(checkpoint_dir, run_id)
+        self.manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        os.makedirs(self.directory, exist_ok=True)
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as file:
+                self.manifest: Dict[str, Any] = json.load(file)
+            logger.info("Resuming run %s", run_id)
+        else:
+            self.manifest = {
+                "run_id": run_id,
+                "created": datetime.now().isoformat(),
+                "stages": {},
+            }
+            self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        """Atomically write the manifest to disk."""
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.manifest, file, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def stage(self, name: str) -> Dict[str, Any]:
+        """Get the recorded state of a stage.
+
+        Args:
+            name (str): The stage name.
+
+        Returns:
+            Dict[str, Any]: The stage state, empty if never recorded.
+        """
+        state: Dict[str, Any] = self.manifest["stages"].get(name, {})
+        return state
+
+    def is_done(self, name: str) -> bool:
+        """Check whether a stage has completed.
+
+        Args:
+            name (str): The stage name.
+
+        Returns:
+            bool: True if the stage was marked done.
+        """
+        return bool(self.stage(name).get("done", False))
+
+    def update(self, name: str, **state: Any) -> None:
+        """Record progress of a stage without completing it.
+
+        Args:
+            name (str): The stage name.
+            **state (Any): JSON serializable progress values.
+        """
+        stage = self.manifest["stages"].setdefault(name, {})
+        stage.update(state, updated=datetime.now().isoformat())
+        self._write_manifest()
+
+    def mark_done(self, name: str, **state: Any) -> None:
+        """Mark a stage as completed.
+
+        Args:
+            name (str): The stage name.
+            **state (Any): JSON serializable result values.
+        """
+        self.update(name, done=True, **state)
+        logger.info("Checkpointed stage %s of run %s", name, self.run_id)
+
+    def _path(self, name: str, extension: str) -> str:
+        """Build the path of a persisted result."""
+        return os.path.join(self.directory, f"{name}{extension}")
+
+    def has_frame(self, name: str) -> bool:
+        """Check whether a DataFrame was persisted.
+
+        Args:
+            name (str): The frame name.
+
+        Returns:
+            bool: True if the frame exists.
+        """
+        return os.path.exists(self._path(name, ".parquet"))
+
+    def save_frame(self, name: str, data_frame: pd.DataFrame) -> None:
+        """Persist a DataFrame atomically.
+
+        Args:
+            name (str): The frame name.
+            data_frame (pd.DataFrame): The DataFrame to persist.
+
+        Raises:
+            CustomException: If the frame cannot be written.
+        """
+        try:
+            path = self._path(name, ".parquet")
+            data_frame.to_parquet(f"{path}.tmp", index=False)
+            os.replace(f"{path}.tmp", path)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def load_frame(self, name: str) -> pd.DataFrame:
+        """Load a persisted DataFrame.
+
+        Args:
+            name (str): The frame name.
+
+        Raises:
+            CustomException: If the frame cannot be read.
+
+        Returns:
+            pd.DataFrame: The persisted DataFrame.
+        """
+        try:
+            return pd.read_parquet(self._path(name, ".parquet"))
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def has_array(self, name: str) -> bool:
+        """Check whether an array was persisted.
+
+        Args:
+            name (str): The array name.
+
+        Returns:
+            bool: True if the array exists.
+        """
+        return os.path.exists(self._path(name, ".npy"))
+
+    def save_array(
+        self, name: str, array: np.ndarray[np.float64, Any]
+    ) -> None:
+        """Persist a NumPy array atomically.
+
+        Args:
+            name (str): The array name.
+            array (np.ndarray): The array to persist.
+
+        Raises:
+            CustomException: If the array cannot be written.
+        """
+        try:
+            path = self._path(name, ".npy")
+            with open(f"{path}.tmp", "wb") as file:
+                np.save(file, array)
+            os.replace(f"{path}.tmp", path)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def load_array(
+        self, name: str, mmap_mode: Optional[MmapMode] = "r"
+    ) -> np.ndarray[np.float64, Any]:
+        """Load a persisted NumPy array.
+
+        Args:
+            name (str): The array name.
+            mmap_mode (Optional[MmapMode], optional): Memory-map mode passed to
+            `np.load`. Defaults to "r".
+
+        Raises:
+            CustomException: If the array cannot be read.
+
+        Returns:
+            np.ndarray: The persisted array.
+        """
+        try:
+            array: np.ndarray[np.float64, Any] = np.load(
+                self._path(name, ".npy"), mmap_mode=mmap_mode
+            )
+            return array
+        except Exception as error:
+            raise CustomException(error, sys) from error
@@ -0,0 +1,215 @@
+"""
+Module for single-pass, streaming dataset reports.
+
+Statistics are merged chunk by chunk, so a report costs one pass over the
+data and constant memory, and the result is plain JSON that can be
+compared between runs.
+"""
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from src.middleware.exception import CustomException
+
+
+class ColumnStats:
+    """Running count, missing count, min, max, mean and std of a column."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.count = 0
+        self.missing = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.mean = 0.0
+        self.sum_squares = 0.0
+
+    def update(self, values: pd.Series) -> None:
+        """Merge the values of one chunk.
+
+        Means and squared deviations are combined pairwise (Chan et al.),
+        which stays numerically stable over many chunks.
+
+        Args:
+            values (pd.Series): The numeric values of the chunk.
+        """
+        self.missing += int(values.isna().sum())
+        values = values.dropna().to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return
+        count = len(values)
+        mean = float(values.mean())
+        sum_squares = float(((values - mean) ** 2).sum())
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.sum_squares += (
+            sum_squares + delta**2 * self.count * count / total
+        )
+        self.mean += delta * count / total
+        self.count = total
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the statistics as JSON serializable values.
+
+        Returns:
+            Dict[str, Any]: The statistics, None where undefined.
+        """
+        has_values = self.count > 0
+        return {
+            "count": self.count,
+            "missing": self.missing,
+            "min": self.minimum if has_values else None,
+            "max": self.maximum if has_values else None,
+            "mean": self.mean if has_values else None,
+            "std": (
+                (self.sum_squares / (self.count - 1)) ** 0.5
+                if self.count > 1
+                else None
+            ),
+        }
+
+
+class DatasetReport:
+    """Streaming report of a password dataset.
+
+    Covers row count, the first rows, statistics of strength and password
+    length, a strength histogram over fixed bins and the distribution of
+    password lengths.
+    """
+
+    def __init__(
+        self,
+        num_bins: int = 5,
+        low: float = 0.0,
+        high: float = 1.0,
+        head_rows: int = 5,
+    ) -> None:
+        """Initialize an empty report.
+
+        Args:
+            num_bins (int, optional): Bins of the strength histogram.
+            Defaults to 5.
+            low (float, optional): Lower edge of the histogram.
+            Defaults to 0.0.
+            high (float, optional): Upper edge of the histogram.
+            Defaults to 1.0.
+            head_rows (int, optional): Leading rows kept in the report.
+            Defaults to 5.
+        """
+        self.rows = 0
+        self.head_rows = head_rows
+        self.head: List[Dict[str, Any]] = []
+        self.strength = ColumnStats()
+        self.length = ColumnStats()
+        self.edges = np.linspace(low, high, num_bins + 1)
+        self.strength_histogram = np.zeros(num_bins, dtype=np.int64)
+        self.length_counts = np.zeros(0, dtype=np.int64)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Merge one chunk into the report.
+
+        Args:
+            chunk (pd.DataFrame): Rows with "password" and "strength"
+            columns.
+        """
+        self.rows += len(chunk)
+        if len(self.head) < self.head_rows:
+            missing = self.head_rows - len(self.head)
+            self.head.extend(
+                json.loads(chunk.head(missing).to_json(orient="records"))
+            )
+
+        strengths = chunk["strength"]
+        self.strength.update(strengths)
+        # Values outside [low, high] are counted in the outer bins
+        bins = np.searchsorted(self.edges, strengths.dropna(), side="right")
+        bins = np.clip(bins - 1, 0, len(self.strength_histogram) - 1)
+        self.strength_histogram += np.bincount(
+            bins, minlength=len(self.strength_histogram)
+        )
+
+        lengths = chunk["password"].dropna().str.len()
+        self.length.update(lengths)
+        counts = np.bincount(lengths.to_numpy(dtype=np.int64))
+        if len(counts) > len(self.length_counts):
+            counts[: len(self.length_counts)] += self.length_counts
+            self.length_counts = counts
+        else:
+            self.length_counts[: len(counts)] += counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the report as JSON serializable values.
+
+        Returns:
+            Dict[str, Any]: The report.
+        """
+        return {
+            "rows": self.rows,
+            "head": self.head,
+            "strength": self.strength.to_dict(),
+            "strength_histogram": [
+                {"bin": f"{lower:.2f}-{upper:.2f}", "count": int(count)}
+                for lower, upper, count in zip(
+                    self.edges, self.edges[1:], self.strength_histogram
+                )
+            ],
+            "password_length": self.length.to_dict(),
+            "length_counts": {
+                str(length): int(count)
+                for length, count in enumerate(self.length_counts)
+                if count
+            },
+        }
+
+
+def build_report(
+    chunks: Iterable[pd.DataFrame], num_bins: int = 5
+) -> Dict[str, Any]:
+    """Build the report of a dataset in one pass over its chunks.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): The dataset in chunks.
+        num_bins (int, optional): Bins of the strength histogram.
+        Defaults to 5.
+
+    Raises:
+        CustomException: If the report cannot be built.
+
+    Returns:
+        Dict[str, Any]: The report.
+    """
+    try:
+        report = DatasetReport(num_bins)
+        for chunk in chunks:
+            report.update(chunk)
+        return report.to_dict()
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def save_report(file_path: str, report: Dict[str, Any]) -> None:
+    """Atomically write a report as JSON.
+
+    Args:
+        file_path (str): The path of the JSON artifact.
+        report (Dict[str, Any]): The report.
+
+    Raises:
+        CustomException: If the report cannot be written.
+    """
+    try:
+        dir_path = os.path.dirname(file_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        with open(f"{file_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        os.replace(f"{file_path}.tmp", file_path)
+    except Exception as error:
+        raise CustomException(error, sys) from error
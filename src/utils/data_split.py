@@ -0,0 +1,161 @@
+"""
+Module for deterministic, hash-based train/test splits.
+
+Every row is assigned by a stable hash of its password, so the split needs
+no shuffle, works chunk by chunk over a stream, and a row keeps its side
+when the dataset grows. That keeps rows of earlier test sets out of later
+training sets.
+"""
+import sys
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.middleware.exception import CustomException
+from src.utils.hashing import password_key
+
+HASH_BITS = 64
+
+
+def holdout_mask(
+    passwords: Iterable[str], test_size: float = 0.2
+) -> np.ndarray[np.bool_, Any]:
+    """Mark the passwords that belong to the test set.
+
+    A password is in the test set if the first 64 bits of its stable key,
+    read as a fraction of the key space, are below `test_size`.
+
+    Args:
+        passwords (Iterable[str]): The passwords.
+        test_size (float, optional): Share of passwords in the test set.
+        Defaults to 0.2.
+
+    Raises:
+        CustomException: If `test_size` is not between 0 and 1.
+
+    Returns:
+        np.ndarray: A boolean mask, True for test passwords.
+    """
+    try:
+        if not 0 <= test_size <= 1:
+            raise ValueError(f"test_size must be in [0, 1], not {test_size}")
+        threshold = int(test_size * 2**HASH_BITS)
+        return np.array(
+            [
+                int(password_key(password)[: HASH_BITS // 4], 16) < threshold
+                for password in passwords
+            ],
+            dtype=bool,
+        )
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def hash_split(
+    data_frame: pd.DataFrame,
+    test_size: float = 0.2,
+    key_column: str = "password",
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Split a DataFrame into train and test rows by password hash.
+
+    Args:
+        data_frame (pd.DataFrame): Input DataFrame.
+        test_size (float, optional): Share of rows in the test set.
+        Defaults to 0.2.
+        key_column (str, optional): Column hashed for the assignment.
+        Defaults to "password".
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The train and test rows, in
+        input order.
+    """
+    is_test = holdout_mask(data_frame[key_column], test_size)
+    return data_frame[~is_test], data_frame[is_test]
+
+
+def iter_hash_split(
+    chunks: Iterable[pd.DataFrame],
+    test_size: float = 0.2,
+    key_column: str = "password",
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Split a stream of DataFrame chunks by password hash.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): The input chunks.
+        test_size (float, optional): Share of rows in the test set.
+        Defaults to 0.2.
+        key_column (str, optional): Column hashed for the assignment.
+        Defaults to "password".
+
+    Yields:
+        Tuple[pd.DataFrame, pd.DataFrame]: The train and test rows of the
+        next chunk.
+    """
+    for chunk in chunks:
+        yield hash_split(chunk, test_size, key_column)
+
+
+class StrengthBinCounter:
+    """Running train/test counts per fixed-width strength bin.
+
+    The hash is independent of strength, so every bin receives the test
+    share in expectation. Bins have fixed edges over `[low, high]`, unlike
+    `pd.cut`, so the counts of a growing dataset stay comparable.
+    """
+
+    def __init__(
+        self, num_bins: int = 10, low: float = 0.0, high: float = 1.0
+    ) -> None:
+        """Initialize empty counts.
+
+        Args:
+            num_bins (int, optional): Number of bins. Defaults to 10.
+            low (float, optional): Lower edge of the first bin.
+            Defaults to 0.0.
+            high (float, optional): Upper edge of the last bin.
+            Defaults to 1.0.
+        """
+        self.edges = np.linspace(low, high, num_bins + 1)
+        self.train = np.zeros(num_bins, dtype=np.int64)
+        self.test = np.zeros(num_bins, dtype=np.int64)
+
+    def _bins(self, strengths: pd.Series) -> np.ndarray[np.int64, Any]:
+        """Get the bin of every strength, clipped to the outer bins."""
+        bins = np.searchsorted(self.edges, strengths, side="right") - 1
+        clipped: np.ndarray[np.int64, Any] = np.clip(
+            bins, 0, len(self.train) - 1
+        )
+        return clipped
+
+    def update(self, train: pd.DataFrame, test: pd.DataFrame) -> None:
+        """Add the rows of one split chunk.
+
+        Args:
+            train (pd.DataFrame): Train rows with a "strength" column.
+            test (pd.DataFrame): Test rows with a "strength" column.
+        """
+        minlength = len(self.train)
+        self.train += np.bincount(
+            self._bins(train["strength"]), minlength=minlength
+        )
+        self.test += np.bincount(
+            self._bins(test["strength"]), minlength=minlength
+        )
+
+    def test_shares(self) -> Dict[str, Optional[float]]:
+        """Get the test share of every bin.
+
+        Returns:
+            Dict[str, Optional[float]]: Test shares by bin range, None for
+            empty bins.
+        """
+        totals = self.train + self.test
+        return {
+            f"{lower:.2f}-{upper:.2f}": (
+                float(test / total) if total else None
+            )
+            for lower, upper, test, total in zip(
+                self.edges, self.edges[1:], self.test, totals
+            )
+        }
@@ -2,8 +2,16 @@
 Module for password data validation.
 """
 import sys
+from typing import Any
+
+import numpy as np
 
 from src.middleware.exception import CustomException
+from src.utils.string_column import PasswordColumn
+
+VALID_CHARS = "qwertyuiopasdfghjklzxcvbnm1234567890!@#$%^&*"
+VALID_BYTES = np.zeros(256, dtype=bool)
+VALID_BYTES[list((VALID_CHARS + VALID_CHARS.upper()).encode())] = True
 
 
 def is_valid_password(text: str) -> int:
@@ -24,8 +32,34 @@ def is_valid_password(text: str) -> int:
             return 0
 
         text_set = set(text.lower())
-        valid_set = set("qwertyuiopasdfghjklzxcvbnm1234567890!@#$%^&*")
+        valid_set = set(VALID_CHARS)
 
         return 0 if text_set.difference(valid_set) else 1
     except Exception as error:
         raise CustomException(error, sys) from error
+
+
+def valid_password_mask(column: PasswordColumn) -> np.ndarray[np.bool_, Any]:
+    """Vectorized `is_valid_password` over a whole password column.
+
+    Valid passwords only contain ASCII characters, so byte lengths and
+    byte lookups give the same answer as the per-string check.
+
+    Args:
+        column (PasswordColumn): The passwords to validate.
+
+    Raises:
+        CustomException: If the column cannot be validated.
+
+    Returns:
+        np.ndarray: A boolean mask, True for valid passwords.
+    """
+    try:
+        lengths = column.lengths()
+        invalid_bytes = column.count_bytes(~VALID_BYTES)
+        mask: np.ndarray[np.bool_, Any] = (
+            (lengths >= 4) & (lengths <= 64) & (invalid_bytes == 0)
+        )
+        return mask
+    except Exception as error:
+        raise CustomException(error, sys) from error
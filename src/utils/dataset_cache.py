@@ -0,0 +1,230 @@
+"""
+Module for caching the raw password list in a compact binary layout.
+
+The raw wordlist is converted once into one contiguous, normalized bytes
+buffer (one password per "\n" terminated line, no carriage returns or empty
+lines) plus an array of line offsets. Later runs memory-map both files
+instead of re-downloading and re-parsing the text file, and the buffer can
+be split into newline aligned byte ranges for parallel parsing.
+"""
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+
+BUFFER_FILE = "passwords.txt"
+OFFSETS_FILE = "offsets.npy"
+MANIFEST_FILE = "manifest.json"
+CACHE_VERSION = 2
+ENCODING = "ISO-8859-1"
+
+
+def compute_checksum(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """Compute the SHA-256 checksum of a file.
+
+    Args:
+        file_path (str): The path of the file to hash.
+        chunk_size (int, optional): Bytes read per step. Defaults to 1 MiB.
+
+    Raises:
+        CustomException: If the file cannot be read.
+
+    Returns:
+        str: The hex digest of the file contents.
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(chunk_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def read_manifest(cache_dir: str) -> Optional[Dict[str, Any]]:
+    """Read the manifest of a password cache.
+
+    Args:
+        cache_dir (str): The cache directory.
+
+    Returns:
+        Optional[Dict[str, Any]]: The manifest, or None if there is no cache.
+    """
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, encoding="utf-8") as file:
+        manifest: Dict[str, Any] = json.load(file)
+    return manifest
+
+
+def is_cache_valid(
+    cache_dir: str, raw_path: Optional[str] = None, checksum: str = ""
+) -> bool:
+    """Check whether a password cache can be loaded.
+
+    The cache is valid when its manifest and data files exist, it matches
+    the expected checksum (if given) and, if the raw file is still present,
+    the raw file has not changed since the cache was built.
+
+    Args:
+        cache_dir (str): The cache directory.
+        raw_path (Optional[str], optional): The raw wordlist path.
+        Defaults to None.
+        checksum (str, optional): Expected SHA-256 of the raw file.
+        Defaults to "".
+
+    Returns:
+        bool: True if the cache is usable.
+    """
+    manifest = read_manifest(cache_dir)
+    if manifest is None or manifest.get("version") != CACHE_VERSION:
+        return False
+    for file_name in (BUFFER_FILE, OFFSETS_FILE):
+        if not os.path.exists(os.path.join(cache_dir, file_name)):
+            return False
+    if checksum and manifest["sha256"] != checksum:
+        return False
+    if raw_path is not None and os.path.exists(raw_path):
+        stat = os.stat(raw_path)
+        if (stat.st_size, int(stat.st_mtime)) != (
+            manifest["raw_size"],
+            manifest["raw_mtime"],
+        ):
+            return False
+    return True
+
+
+def build_password_cache(
+    raw_path: str, cache_dir: str, checksum: str = ""
+) -> Dict[str, Any]:
+    """Convert a newline separated wordlist into the binary cache layout.
+
+    Empty lines are dropped and trailing carriage returns are stripped.
+    The manifest is written last so a partially written cache is never
+    considered valid.
+
+    Args:
+        raw_path (str): The raw wordlist path.
+        cache_dir (str): The cache directory.
+        checksum (str, optional): Expected SHA-256 of the raw file.
+        Defaults to "".
+
+    Raises:
+        CustomException: If the checksum does not match or the cache
+        cannot be written.
+
+    Returns:
+        Dict[str, Any]: The manifest of the new cache.
+    """
+    try:
+        logger.info("Started verifying raw data checksum")
+        raw_checksum = compute_checksum(raw_path)
+        if checksum and raw_checksum != checksum:
+            raise ValueError(
+                f"Checksum mismatch for {raw_path}: "
+                f"expected {checksum}, got {raw_checksum}"
+            )
+        logger.info("Done verifying raw data checksum")
+
+        logger.info("Started building password cache")
+        data = np.fromfile(raw_path, dtype=np.uint8)
+        newlines = np.flatnonzero(data == ord("\n"))
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [data.size]))
+
+        keep_bytes = np.ones(data.size, dtype=bool)
+        has_cr = (ends > starts) & (data[np.maximum(ends - 1, 0)] == ord("\r"))
+        keep_bytes[ends[has_cr] - 1] = False
+        lengths = ends - starts - has_cr
+        is_empty = lengths == 0
+        keep_bytes[ends[is_empty & (ends < data.size)]] = False
+        lengths = lengths[~is_empty]
+        buffer = data[keep_bytes]
+        if lengths.size and (buffer.size == 0 or buffer[-1] != ord("\n")):
+            buffer = np.append(buffer, np.uint8(ord("\n")))
+
+        offsets = np.zeros(lengths.size + 1, dtype=np.int64)
+        np.cumsum(lengths + 1, out=offsets[1:])
+
+        os.makedirs(cache_dir, exist_ok=True)
+        buffer.tofile(os.path.join(cache_dir, BUFFER_FILE))
+        np.save(os.path.join(cache_dir, OFFSETS_FILE), offsets)
+
+        stat = os.stat(raw_path)
+        manifest = {
+            "version": CACHE_VERSION,
+            "raw_path": raw_path,
+            "raw_size": stat.st_size,
+            "raw_mtime": int(stat.st_mtime),
+            "sha256": raw_checksum,
+            "encoding": ENCODING,
+            "num_passwords": int(lengths.size),
+        }
+        manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+        with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+        logger.info(
+            "Done building password cache with %s passwords", lengths.size
+        )
+        return manifest
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def load_password_cache(
+    cache_dir: str,
+) -> Tuple[np.ndarray[np.uint8, Any], np.ndarray[np.int64, Any]]:
+    """Memory-map the bytes buffer and offsets of a password cache.
+
+    Args:
+        cache_dir (str): The cache directory.
+
+    Raises:
+        CustomException: If the cache files cannot be opened.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The uint8 buffer and int64 offsets.
+    """
+    try:
+        buffer_path = os.path.join(cache_dir, BUFFER_FILE)
+        if os.path.getsize(buffer_path) == 0:
+            buffer = np.zeros(0, dtype=np.uint8)
+        else:
+            buffer = np.memmap(buffer_path, dtype=np.uint8, mode="r")
+        offsets = np.load(os.path.join(cache_dir, OFFSETS_FILE), mmap_mode="r")
+        return buffer, offsets
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def decode_passwords(
+    buffer: np.ndarray[np.uint8, Any], offsets: np.ndarray[np.int64, Any]
+) -> List[str]:
+    """Decode a cache buffer into a list of passwords.
+
+    The encoding is single-byte and every password is newline terminated,
+    so the whole buffer is decoded and split in one call.
+
+    Args:
+        buffer (np.ndarray): The uint8 bytes buffer.
+        offsets (np.ndarray): The line offsets, one longer than the result.
+
+    Returns:
+        List[str]: The decoded passwords.
+    """
+    if len(offsets) < 2:
+        return []
+    text = buffer.tobytes().decode(ENCODING)
+    return text[:-1].split("\n")
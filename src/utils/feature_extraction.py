@@ -4,13 +4,21 @@ Module for password strength calculation.
 This module provides a function for calculating the strength of a password
 based on certain criteria.
 """
-from typing import Any, Optional
+from __future__ import annotations
+
+import string
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 import numpy as np
-import pandas as pd
 from password_strength import PasswordStats
 from sklearn.base import BaseEstimator, TransformerMixin
 
+from src.utils.string_column import PasswordColumn
+
+if TYPE_CHECKING:
+    # Only for annotations, so serving the features does not import pandas
+    import pandas as pd
+
 
 def calculate_strength(text: str) -> float:
     """
@@ -25,6 +33,87 @@ def calculate_strength(text: str) -> float:
     return float(PasswordStats(text).strength())
 
 
+Passwords = Union["pd.DataFrame", PasswordColumn]
+
+
+def _byte_table(chars: str) -> np.ndarray[np.bool_, Any]:
+    """Build a 256 entry lookup table selecting the given ASCII chars."""
+    table = np.zeros(256, dtype=bool)
+    table[list(chars.encode("ascii"))] = True
+    return table
+
+
+ANY_BYTE = np.ones(256, dtype=bool)
+UPPER_BYTES = _byte_table(string.ascii_uppercase)
+LOWER_BYTES = _byte_table(string.ascii_lowercase)
+DIGIT_BYTES = _byte_table(string.digits)
+SYMBOL_BYTES = _byte_table("!@#$%^&*")
+
+
+def _password_column(X: Passwords) -> PasswordColumn:
+    """Get the passwords of the input as a password column.
+
+    Args:
+        X (Passwords): Input data containing a "password" column, or a
+        password column.
+
+    Returns:
+        PasswordColumn: The passwords.
+    """
+    if isinstance(X, PasswordColumn):
+        return X
+    return PasswordColumn.from_strings(X["password"])
+
+
+def _apply(
+    X: Passwords, func: Callable[[str], int]
+) -> np.ndarray[np.int64, Any]:
+    """Apply a per-password feature function.
+
+    Args:
+        X (Passwords): Input data containing a "password" column, or a
+        password column.
+        func (Callable[[str], int]): The feature of one password.
+
+    Returns:
+        np.ndarray: The features as a 2D array with one column.
+    """
+    texts = X.to_list() if isinstance(X, PasswordColumn) else X["password"]
+    return np.fromiter(
+        (func(text) for text in texts), dtype=np.int64, count=len(texts)
+    ).reshape(-1, 1)
+
+
+def _count_chars(
+    X: Passwords,
+    func: Callable[[str], int],
+    table: np.ndarray[np.bool_, Any],
+    skip_ends: int = 0,
+) -> np.ndarray[np.int64, Any]:
+    """Count the characters of every password that are in a byte table.
+
+    ASCII passwords are counted directly on the column buffer, any other
+    input falls back to the per-password function.
+
+    Args:
+        X (Passwords): Input data containing a "password" column, or a
+        password column.
+        func (Callable[[str], int]): The same count for one password.
+        table (np.ndarray): 256 booleans, True for the bytes to count.
+        skip_ends (int, optional): Characters to leave out at both ends of
+        every password. Defaults to 0.
+
+    Returns:
+        np.ndarray: The counts as a 2D array with one column.
+    """
+    passwords = _password_column(X)
+    if not passwords.is_ascii():
+        return _apply(passwords, func)
+    return passwords.segment_sums(
+        table[passwords.data], skip_ends, skip_ends
+    ).reshape(-1, 1)
+
+
 class LenTransform(BaseEstimator, TransformerMixin):  # type: ignore
     """Transformer that calculates the length of the input text."""
 
@@ -42,19 +131,18 @@ class LenTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the length of each password.
         """
-        X["len"] = X["password"].apply(self._lenTransform)
-        transformed_X = X["len"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _count_chars(X, self._lenTransform, ANY_BYTE)
 
     def _lenTransform(self, text: str) -> int:
         """Calculate the length of the input text.
@@ -86,19 +174,18 @@ class AlphaUCTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of uppercase alphabetic characters in each password.
         """
-        X["alphaUC"] = X["password"].apply(self._alphaUCTransform)
-        transformed_X = X["alphaUC"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _count_chars(X, self._alphaUCTransform, UPPER_BYTES)
 
     def _alphaUCTransform(self, text: str) -> int:
         """Calculate the count of uppercase alphabetic characters in the input text.
@@ -130,19 +217,18 @@ class AlphaLCTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of lowercase alphabetic characters in each password.
         """
-        X["alphaLC"] = X["password"].apply(self._alphaLCTransform)
-        transformed_X = X["alphaLC"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _count_chars(X, self._alphaLCTransform, LOWER_BYTES)
 
     def _alphaLCTransform(self, text: str) -> int:
         """Calculate the count of lowercase alphabetic characters in the input text.
@@ -173,19 +259,18 @@ class NumberTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of numeric characters in each password.
         """
-        X["number"] = X["password"].apply(self._numberTransform)
-        transformed_X = X["number"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _count_chars(X, self._numberTransform, DIGIT_BYTES)
 
     def _numberTransform(self, text: str) -> int:
         """Calculate the count of numeric characters in the input text.
@@ -216,19 +301,18 @@ class SymbolTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of special symbol characters in each password.
         """
-        X["symbol"] = X["password"].apply(self._symbolTransform)
-        transformed_X = X["symbol"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _count_chars(X, self._symbolTransform, SYMBOL_BYTES)
 
     def _symbolTransform(self, text: str) -> int:
         """Calculate the count of special symbol characters in the input text.
@@ -260,20 +344,21 @@ class MidCharTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of special symbol or numeric characters
             in the middle of each password.
         """
-        X["midChar"] = X["password"].apply(self._midCharTransform)
-        transformed_X = X["midChar"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _count_chars(
+            X, self._midCharTransform, DIGIT_BYTES | SYMBOL_BYTES, skip_ends=1
+        )
 
     def _midCharTransform(self, text: str) -> int:
         """Calculate the count of special symbol or numeric
@@ -308,19 +393,18 @@ class RepCharTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of repeated characters in each password.
         """
-        X["repChar"] = X["password"].apply(self._repCharTransform)
-        transformed_X = X["repChar"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _apply(X, self._repCharTransform)
 
     def _repCharTransform(self, text: str) -> int:
         """Calculate the count of repeated characters in the input text.
@@ -351,19 +435,18 @@ class UniqueCharTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of unique characters in each password.
         """
-        X["uniqueChar"] = X["password"].apply(self._uniqueCharTransform)
-        transformed_X = X["uniqueChar"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _apply(X, self._uniqueCharTransform)
 
     def _uniqueCharTransform(self, text: str) -> int:
         """Calculate the count of unique characters in the input text.
@@ -395,19 +478,18 @@ class ConsecAlphaUCTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of consecutive uppercase alphabetic characters in each password.
         """
-        X["consecAlphaUC"] = X["password"].apply(self._consecAlphaUCTransform)
-        transformed_X = X["consecAlphaUC"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _apply(X, self._consecAlphaUCTransform)
 
     def _consecAlphaUCTransform(self, text: str) -> int:
         """Calculate the count of consecutive uppercase alphabetic characters in the input text.
@@ -446,19 +528,18 @@ class ConsecAlphaLCTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of consecutive lowercase alphabetic characters in each password.
         """
-        X["consecAlphaLC"] = X["password"].apply(self._consecAlphaLCTransform)
-        transformed_X = X["consecAlphaLC"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _apply(X, self._consecAlphaLCTransform)
 
     def _consecAlphaLCTransform(self, text: str) -> int:
         """Calculate the count of consecutive lowercase alphabetic characters in the input text.
@@ -496,19 +577,18 @@ class ConsecNumberTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of consecutive numeric characters in each password.
         """
-        X["consecNumber"] = X["password"].apply(self._consecNumberTransform)
-        transformed_X = X["consecNumber"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _apply(X, self._consecNumberTransform)
 
     def _consecNumberTransform(self, text: str) -> int:
         """Calculate the count of consecutive numeric characters in the input text.
@@ -547,19 +627,18 @@ class ConsecSymbolTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of consecutive special symbol characters in each password.
         """
-        X["consecSymbol"] = X["password"].apply(self._consecSymbolTransform)
-        transformed_X = X["consecSymbol"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _apply(X, self._consecSymbolTransform)
 
     def _consecSymbolTransform(self, text: str) -> int:
         """Calculate the count of consecutive special symbol characters in the input text.
@@ -598,19 +677,18 @@ class SeqAlphaTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of sequential alphabetic characters in each password.
         """
-        X["seqAlpha"] = X["password"].apply(self._seqAlphaTransform)
-        transformed_X = X["seqAlpha"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _apply(X, self._seqAlphaTransform)
 
     def _seqAlphaTransform(self, text: str) -> int:
         """Calculate the count of sequential alphabetic characters in the input text.
@@ -648,19 +726,18 @@ class SeqNumberTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of sequential numeric characters in each password.
         """
-        X["seqNumber"] = X["password"].apply(self._seqNumberTransform)
-        transformed_X = X["seqNumber"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _apply(X, self._seqNumberTransform)
 
     def _seqNumberTransform(self, text: str) -> int:
         """Calculate the count of sequential numeric characters in the input text.
@@ -698,19 +775,18 @@ class SeqKeyboardTransform(BaseEstimator, TransformerMixin):  # type: ignore
         """
         return self
 
-    def transform(self, X: pd.DataFrame) -> np.ndarray[np.int64, Any]:
+    def transform(self, X: Passwords) -> np.ndarray[np.int64, Any]:
         """Transform the input data.
 
         Args:
-            X (pd.DataFrame): Input data containing a "password" column.
+            X (Passwords): Input data containing a "password" column, or a
+            password column.
 
         Returns:
             np.ndarray: Transformed data as a 2D NumPy array with one column
             representing the count of sequential keyboard characters in each password.
         """
-        X["seqKeyboard"] = X["password"].apply(self._seqKeyboardTransform)
-        transformed_X = X["seqKeyboard"].to_numpy()
-        return np.array(transformed_X).reshape(-1, 1)
+        return _apply(X, self._seqKeyboardTransform)
 
     def _seqKeyboardTransform(self, text: str) -> int:
         """Calculate the count of sequential keyboard characters in the input text.
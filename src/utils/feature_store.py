@@ -0,0 +1,296 @@
+"""
+Module for a local, content-addressed store of feature matrices.
+
+Entries are keyed by a fingerprint of the transformer set plus a hash of
+the input passwords. A retrain on unchanged data loads the features from
+disk, and a retrain on grown data only featurizes the rows that no stored
+entry of the same transformer set holds yet. Least recently used entries
+are evicted once the store outgrows its size budget. Processes sharing a
+store update its index under a file lock.
+"""
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+from src.utils.hashing import password_key
+
+INDEX_FILE = "index.json"
+LOCK_FILE = "index.lock"
+KEYS_FILE = "keys.npy"
+FEATURES_FILE = "features.npy"
+
+Features = np.ndarray[np.float64, Any]
+Keys = np.ndarray[np.bytes_, Any]
+
+
+def transformer_fingerprint(transformer: ColumnTransformer) -> str:
+    """Fingerprint the code and parameters of a transformer set.
+
+    The source of every module defining one of the transformers is hashed
+    along with their parameters, so editing a feature invalidates the
+    features stored for it.
+
+    Args:
+        transformer (ColumnTransformer): The preprocessing object.
+
+    Returns:
+        str: A 32 character hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    modules = set()
+    for name, estimator, columns in transformer.transformers:
+        digest.update(f"{name}|{type(estimator).__qualname__}|".encode())
+        digest.update(f"{estimator.get_params()}|{columns}\n".encode())
+        modules.add(type(estimator).__module__)
+    for module in sorted(modules):
+        digest.update(inspect.getsource(sys.modules[module]).encode())
+    return digest.hexdigest()
+
+
+class FeatureStore:
+    """Feature matrices on disk, keyed by transformer and data content."""
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30) -> None:
+        """Open or create a feature store.
+
+        Args:
+            directory (str): Directory holding the entries.
+            max_bytes (int, optional): Size budget of all entries.
+            Defaults to 1 GiB.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.reused_rows = 0
+        self.computed_rows = 0
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """Read the entry index."""
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, encoding="utf-8") as file:
+            entries: Dict[str, Dict[str, Any]] = json.load(file)
+        return entries
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the index lock, so updates of other processes are not lost.
+
+        Yields:
+            None: While the lock is held.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        lock_path = os.path.join(self.directory, LOCK_FILE)
+        with open(lock_path, "w", encoding="utf-8") as file:
+            try:
+                import fcntl  # pylint: disable=import-outside-toplevel
+            except ImportError:
+                # Without POSIX file locks the index is updated unlocked
+                yield
+                return
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def _write_index(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Atomically write the entry index."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{self.index_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(entries, file, indent=2)
+        os.replace(f"{self.index_path}.tmp", self.index_path)
+
+    def _entry_path(self, entry_id: str, file_name: str) -> str:
+        """Build the path of a file of an entry."""
+        return os.path.join(self.directory, entry_id, file_name)
+
+    def transform(
+        self, transformer: ColumnTransformer, data_frame: pd.DataFrame
+    ) -> Features:
+        """Featurize a DataFrame, reusing stored features where possible.
+
+        Args:
+            transformer (ColumnTransformer): The fitted preprocessing object.
+            data_frame (pd.DataFrame): Input data with a "password" column.
+
+        Raises:
+            CustomException: If the features cannot be computed or stored.
+
+        Returns:
+            np.ndarray: The feature matrix, one row per input row.
+        """
+        try:
+            fingerprint = transformer_fingerprint(transformer)
+            keys = np.array(
+                [
+                    password_key(password)
+                    for password in data_frame["password"]
+                ],
+                dtype="S32",
+            )
+            data_hash = hashlib.blake2b(
+                keys.tobytes(), digest_size=16
+            ).hexdigest()
+            entry_id = f"{fingerprint[:16]}-{data_hash[:16]}"
+            entries = self._read_index()
+
+            if entry_id in entries:
+                logger.info("Feature store hit %s", entry_id)
+                features: Features = np.load(
+                    self._entry_path(entry_id, FEATURES_FILE)
+                )
+                self.reused_rows += len(features)
+                with self._locked():
+                    self._touch(self._read_index(), [entry_id])
+                return features
+
+            features, reused = self._assemble(
+                transformer, data_frame, keys, fingerprint, entries
+            )
+            with self._locked():
+                # Another process may have stored the same entry meanwhile
+                entries = self._read_index()
+                if entry_id not in entries:
+                    self._save(entries, entry_id, fingerprint, keys, features)
+                self._touch(entries, [entry_id, *reused])
+                self._evict(entries, keep=entry_id)
+            return features
+
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def _assemble(
+        self,
+        transformer: ColumnTransformer,
+        data_frame: pd.DataFrame,
+        keys: Keys,
+        fingerprint: str,
+        entries: Dict[str, Dict[str, Any]],
+    ) -> Tuple[Features, List[str]]:
+        """Gather stored feature rows and featurize only the missing ones.
+
+        Entries of the same fingerprint are consulted most recently used
+        first.
+
+        Returns:
+            Tuple[np.ndarray, List[str]]: The features and the ids of the
+            entries rows were reused from.
+        """
+        features = None
+        missing = np.ones(len(keys), dtype=bool)
+        reused = []
+        candidates = sorted(
+            (
+                entry_id
+                for entry_id, entry in entries.items()
+                if entry["fingerprint"] == fingerprint
+            ),
+            key=lambda entry_id: -entries[entry_id]["last_used"],
+        )
+        for entry_id in candidates:
+            if not missing.any():
+                break
+            stored_keys = np.load(self._entry_path(entry_id, KEYS_FILE))
+            unique_keys, first_rows = np.unique(stored_keys, return_index=True)
+            positions = np.flatnonzero(missing)
+            found = pd.Index(unique_keys).get_indexer(keys[positions])
+            hits = found >= 0
+            if not hits.any():
+                continue
+            stored = np.load(
+                self._entry_path(entry_id, FEATURES_FILE), mmap_mode="r"
+            )
+            if features is None:
+                features = np.empty((len(keys), stored.shape[1]), stored.dtype)
+            features[positions[hits]] = stored[first_rows[found[hits]]]
+            missing[positions[hits]] = False
+            reused.append(entry_id)
+
+        num_missing = int(missing.sum())
+        logger.info(
+            "Feature store reuses %s rows, featurizes %s rows",
+            len(keys) - num_missing,
+            num_missing,
+        )
+        self.reused_rows += len(keys) - num_missing
+        self.computed_rows += num_missing
+        if num_missing:
+            computed = np.asarray(
+                transformer.transform(data_frame.iloc[np.flatnonzero(missing)])
+            )
+            if features is None:
+                features = np.empty(
+                    (len(keys), computed.shape[1]), computed.dtype
+                )
+            features[missing] = computed
+        if features is None:
+            features = np.empty((0, 0))
+        return features, reused
+
+    def _save(
+        self,
+        entries: Dict[str, Dict[str, Any]],
+        entry_id: str,
+        fingerprint: str,
+        keys: Keys,
+        features: Features,
+    ) -> None:
+        """Persist a new entry and add it to the index."""
+        os.makedirs(os.path.join(self.directory, entry_id), exist_ok=True)
+        arrays: Dict[str, np.ndarray[Any, Any]] = {
+            KEYS_FILE: keys,
+            FEATURES_FILE: features,
+        }
+        for file_name, array in arrays.items():
+            path = self._entry_path(entry_id, file_name)
+            with open(f"{path}.tmp", "wb") as file:
+                np.save(file, array)
+            os.replace(f"{path}.tmp", path)
+        entries[entry_id] = {
+            "fingerprint": fingerprint,
+            "rows": len(keys),
+            "bytes": int(keys.nbytes + features.nbytes),
+            "last_used": time.time(),
+        }
+
+    def _touch(
+        self, entries: Dict[str, Dict[str, Any]], entry_ids: List[str]
+    ) -> None:
+        """Mark entries as used now and persist the index.
+
+        Entries another process evicted meanwhile are skipped.
+        """
+        now = time.time()
+        for entry_id in entry_ids:
+            if entry_id in entries:
+                entries[entry_id]["last_used"] = now
+        self._write_index(entries)
+
+    def _evict(self, entries: Dict[str, Dict[str, Any]], keep: str) -> None:
+        """Remove least recently used entries until the budget is met."""
+        by_age = sorted(
+            entries, key=lambda entry_id: entries[entry_id]["last_used"]
+        )
+        total = sum(entry["bytes"] for entry in entries.values())
+        for entry_id in by_age:
+            if total <= self.max_bytes:
+                break
+            if entry_id == keep:
+                continue
+            total -= entries.pop(entry_id)["bytes"]
+            shutil.rmtree(os.path.join(self.directory, entry_id), True)
+            logger.info("Evicted feature store entry %s", entry_id)
+        self._write_index(entries)
@@ -1,13 +1,69 @@
-"""This module provides functions for saving and loading objects using joblib."""
+"""This module provides functions for saving and loading objects using joblib,
+and DataFrames in a columnar format picked by the file extension.
+
+Rows appended to a Parquet or Feather frame are written as part files in a
+`<path>.parts` directory next to it, which every reader here includes, so
+an append costs as much as the new rows. Saving the frame again replaces
+the file and its parts.
+"""
 
 import os
+import shutil
 import sys
-from typing import Any
+from typing import Any, Iterator, List, Optional
 
 import joblib
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 
 from src.middleware.exception import CustomException
 
+MAX_FRAME_PARTS = 64
+
+
+def _parts_dir(file_path: str) -> str:
+    """The directory of the appended parts of a frame."""
+    return f"{file_path}.parts"
+
+
+def frame_paths(file_path: str) -> List[str]:
+    """List the files holding a saved DataFrame, the file first and then
+    its appended parts in order.
+
+    Args:
+        file_path (str): The path of the saved DataFrame.
+
+    Returns:
+        List[str]: The files.
+    """
+    paths = [file_path]
+    parts_dir = _parts_dir(file_path)
+    if os.path.isdir(parts_dir):
+        paths += [
+            os.path.join(parts_dir, name)
+            for name in sorted(os.listdir(parts_dir))
+            if not name.endswith(".tmp")
+        ]
+    return paths
+
+
+def _read_file(path: str, columns: Optional[List[str]] = None) -> pa.Table:
+    """Memory-map one Parquet or Feather file as a table."""
+    if os.path.splitext(path)[1] == ".parquet":
+        return pq.read_table(path, columns=columns, memory_map=True)
+    return feather.read_table(path, columns=columns, memory_map=True)
+
+
+def _read_table(
+    file_path: str, columns: Optional[List[str]] = None
+) -> pa.Table:
+    """Memory-map a Parquet or Feather file and its parts as one table."""
+    return pa.concat_tables(
+        [_read_file(path, columns) for path in frame_paths(file_path)]
+    )
+
 
 def save_object(file_path: str, obj: Any) -> None:
     """Save an object to a file using joblib.
@@ -45,3 +101,326 @@ def load_object(file_path: str) -> Any:
 
     except Exception as error:
         raise CustomException(error, sys) from error
+
+
+def save_frame(file_path: str, data_frame: pd.DataFrame) -> None:
+    """Save a DataFrame in the format given by the file extension.
+
+    ".parquet" writes zstd compressed Parquet, ".feather" uncompressed
+    Arrow IPC that can be memory-mapped without decoding, and ".csv" text.
+    The file is written to a temporary path and then moved into place,
+    replacing any appended parts.
+
+    Args:
+        file_path (str): The path of the file to save the DataFrame to.
+        data_frame (pd.DataFrame): The DataFrame to be saved.
+
+    Raises:
+        CustomException: If the extension is not supported or the
+        DataFrame cannot be saved.
+    """
+    try:
+        dir_path = os.path.dirname(file_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        temp_path = f"{file_path}.tmp"
+        extension = os.path.splitext(file_path)[1]
+
+        if extension == ".parquet":
+            table = pa.Table.from_pandas(data_frame, preserve_index=False)
+            pq.write_table(table, temp_path, compression="zstd")
+        elif extension == ".feather":
+            table = pa.Table.from_pandas(data_frame, preserve_index=False)
+            feather.write_feather(table, temp_path, compression="uncompressed")
+        elif extension == ".csv":
+            data_frame.to_csv(temp_path, index=False, header=True)
+        else:
+            raise ValueError(f"Unsupported frame format: {file_path}")
+        os.replace(temp_path, file_path)
+        shutil.rmtree(_parts_dir(file_path), ignore_errors=True)
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def load_frame(
+    file_path: str, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Load a DataFrame saved by `save_frame`.
+
+    Parquet and Feather files and their appended parts are memory-mapped,
+    so no text is parsed.
+
+    Args:
+        file_path (str): The path of the file to load the DataFrame from.
+        columns (Optional[List[str]], optional): Columns to load, all when
+        None. Defaults to None.
+
+    Raises:
+        CustomException: If the extension is not supported or the
+        DataFrame cannot be loaded.
+
+    Returns:
+        pd.DataFrame: The loaded DataFrame.
+    """
+    try:
+        extension = os.path.splitext(file_path)[1]
+        columnar = extension in (".parquet", ".feather")
+        if columnar and len(frame_paths(file_path)) > 1:
+            return _read_table(file_path, columns).to_pandas()
+        if extension == ".parquet":
+            return pd.read_parquet(file_path, columns=columns, memory_map=True)
+        if extension == ".feather":
+            return feather.read_table(
+                file_path, columns=columns, memory_map=True
+            ).to_pandas()
+        if extension == ".csv":
+            return pd.read_csv(file_path, usecols=columns)
+        raise ValueError(f"Unsupported frame format: {file_path}")
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def append_frame(file_path: str, data_frame: pd.DataFrame) -> None:
+    """Append rows to a DataFrame saved by `save_frame`.
+
+    CSV files are appended in place. Parquet and Feather files are not
+    appendable, so the rows are written as the next part file, leaving
+    the stored rows untouched. Once there are more than
+    `MAX_FRAME_PARTS` parts they are merged into one, which reads only
+    the appended rows.
+
+    Args:
+        file_path (str): The path of the saved DataFrame, created if it
+        does not exist.
+        data_frame (pd.DataFrame): The rows to append.
+
+    Raises:
+        CustomException: If the rows cannot be appended.
+    """
+    try:
+        if not os.path.exists(file_path):
+            save_frame(file_path, data_frame)
+            return
+        extension = os.path.splitext(file_path)[1]
+        if extension == ".csv":
+            data_frame.to_csv(file_path, mode="a", index=False, header=False)
+            return
+        if extension not in (".parquet", ".feather"):
+            raise ValueError(f"Unsupported frame format: {file_path}")
+
+        parts = frame_paths(file_path)[1:]
+        schema = (
+            pq.read_schema(file_path)
+            if extension == ".parquet"
+            else _read_file(file_path).schema
+        )
+        table = pa.Table.from_pandas(
+            data_frame, schema=schema, preserve_index=False
+        )
+        merged = parts if len(parts) >= MAX_FRAME_PARTS else []
+        if merged:
+            table = pa.concat_tables(
+                [_read_file(part) for part in merged] + [table]
+            )
+        number = int(os.path.basename(parts[-1])[5:11]) + 1 if parts else 0
+        parts_dir = _parts_dir(file_path)
+        os.makedirs(parts_dir, exist_ok=True)
+        part_path = os.path.join(parts_dir, f"part-{number:06d}{extension}")
+        if extension == ".parquet":
+            pq.write_table(table, f"{part_path}.tmp", compression="zstd")
+        else:
+            feather.write_feather(
+                table, f"{part_path}.tmp", compression="uncompressed"
+            )
+        os.replace(f"{part_path}.tmp", part_path)
+        # The new part holds the rows of the merged ones
+        for part in merged:
+            os.remove(part)
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def iter_frame_chunks(
+    file_path: str, chunk_size: int = 100_000
+) -> Iterator[pd.DataFrame]:
+    """Iterate over a DataFrame saved by `save_frame` in chunks of rows.
+
+    Chunks do not span the appended parts of a frame, so the chunks at
+    the end of every part may be shorter.
+
+    Args:
+        file_path (str): The path of the file to read.
+        chunk_size (int, optional): Rows per chunk. Defaults to 100_000.
+
+    Raises:
+        CustomException: If the DataFrame cannot be read.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows.
+    """
+    try:
+        extension = os.path.splitext(file_path)[1]
+        if extension == ".csv":
+            yield from pd.read_csv(file_path, chunksize=chunk_size)
+            return
+        for path in frame_paths(file_path):
+            if extension == ".parquet":
+                parquet_file = pq.ParquetFile(path, memory_map=True)
+                for batch in parquet_file.iter_batches(chunk_size):
+                    yield batch.to_pandas()
+            else:
+                for batch in _read_file(path).to_batches(chunk_size):
+                    yield batch.to_pandas()
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def count_frame_rows(file_path: str) -> int:
+    """Count the rows of a DataFrame saved by `save_frame`.
+
+    Parquet and Feather row counts come from the metadata of the file and
+    its parts.
+
+    Args:
+        file_path (str): The path of the file.
+
+    Raises:
+        CustomException: If the file cannot be read.
+
+    Returns:
+        int: The number of rows.
+    """
+    try:
+        extension = os.path.splitext(file_path)[1]
+        if extension == ".parquet":
+            return sum(
+                int(pq.ParquetFile(path).metadata.num_rows)
+                for path in frame_paths(file_path)
+            )
+        if extension == ".feather":
+            return sum(
+                int(_read_file(path).num_rows)
+                for path in frame_paths(file_path)
+            )
+        return sum(len(chunk) for chunk in iter_frame_chunks(file_path))
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+class FrameChunkWriter:
+    """Write a DataFrame to a file chunk by chunk.
+
+    Parquet files are streamed row group by row group, other formats are
+    collected and saved with `save_frame` on close. The file only appears
+    at its path once it is complete.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """Initialize the writer.
+
+        Args:
+            file_path (str): The path of the file to write.
+        """
+        self.file_path = file_path
+        self.temp_path = f"{file_path}.tmp"
+        self.rows = 0
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._chunks: List[pd.DataFrame] = []
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        """Append a chunk of rows.
+
+        Args:
+            chunk (pd.DataFrame): The rows to append.
+
+        Raises:
+            CustomException: If the chunk cannot be written.
+        """
+        try:
+            self.rows += len(chunk)
+            if os.path.splitext(self.file_path)[1] != ".parquet":
+                self._chunks.append(chunk)
+                return
+            if self._writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                dir_path = os.path.dirname(self.file_path)
+                if dir_path:
+                    os.makedirs(dir_path, exist_ok=True)
+                self._writer = pq.ParquetWriter(
+                    self.temp_path, table.schema, compression="zstd"
+                )
+            else:
+                table = pa.Table.from_pandas(
+                    chunk, schema=self._writer.schema, preserve_index=False
+                )
+            self._writer.write_table(table)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def close(self) -> None:
+        """Finish the file and move it into place.
+
+        Raises:
+            CustomException: If the file cannot be finished.
+        """
+        try:
+            if self._writer is not None:
+                self._writer.close()
+                os.replace(self.temp_path, self.file_path)
+                shutil.rmtree(_parts_dir(self.file_path), ignore_errors=True)
+            else:
+                data_frame = (
+                    pd.concat(self._chunks, ignore_index=True)
+                    if self._chunks
+                    else pd.DataFrame()
+                )
+                save_frame(self.file_path, data_frame)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def abort(self) -> None:
+        """Discard the written rows, leaving nothing at the path."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+        self._chunks = []
+
+    def __enter__(self) -> "FrameChunkWriter":
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *_: Any) -> None:
+        # A failed write must not publish a truncated file
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def export_csv(file_path: str, csv_path: Optional[str] = None) -> str:
+    """Export a saved DataFrame as CSV, for tools that need text files.
+
+    Args:
+        file_path (str): The path of the saved DataFrame.
+        csv_path (Optional[str], optional): The CSV path, next to the
+        source file when None. Defaults to None.
+
+    Raises:
+        CustomException: If the DataFrame cannot be exported.
+
+    Returns:
+        str: The path of the CSV file.
+    """
+    try:
+        csv_path = csv_path or f"{os.path.splitext(file_path)[0]}.csv"
+        save_frame(csv_path, load_frame(file_path))
+        return csv_path
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
@@ -0,0 +1,36 @@
+"""
+Module for stable content hashes of passwords and dataset rows.
+
+The hashes are persisted (as dataset keys), so they must not depend on
+Python's randomized `hash` or on library versions.
+"""
+import hashlib
+from typing import Iterable
+
+
+def password_key(password: str) -> str:
+    """Compute the stable key of a password.
+
+    Args:
+        password (str): The password.
+
+    Returns:
+        str: A 32 character hex digest identifying the password.
+    """
+    return hashlib.blake2b(
+        password.encode("utf-8", "surrogatepass"), digest_size=16
+    ).hexdigest()
+
+
+def row_digest(values: Iterable[str]) -> str:
+    """Compute the content hash of a row from its string values.
+
+    Args:
+        values (Iterable[str]): The row values, already converted to str.
+
+    Returns:
+        str: A 32 character hex digest of the row contents.
+    """
+    return hashlib.blake2b(
+        "\x1f".join(values).encode("utf-8", "surrogatepass"), digest_size=16
+    ).hexdigest()
@@ -0,0 +1,165 @@
+"""
+Module for training regressors out of core.
+
+Features are streamed from (memory-mapped) arrays in row blocks, so at most
+one block is held in memory whatever the size of the corpus. A standard
+scaler is fitted in a first pass and an SGD or MLP regressor learns with
+`partial_fit` over shuffled blocks.
+"""
+import sys
+from typing import Any, Iterator, Optional, Tuple
+
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.linear_model import SGDRegressor
+from sklearn.neural_network import MLPRegressor
+from sklearn.preprocessing import StandardScaler
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+
+Array = np.ndarray[np.float64, Any]
+
+
+class IncrementalRegressor(BaseEstimator, RegressorMixin):  # type: ignore
+    """A standard scaler and a regressor that both learn incrementally."""
+
+    def __init__(self, estimator: str = "sgd", random_state: int = 42) -> None:
+        """Initialize the regressor.
+
+        Args:
+            estimator (str, optional): "sgd" for a linear `SGDRegressor`
+            or "mlp" for a small `MLPRegressor`. Defaults to "sgd".
+            random_state (int, optional): Seed of the regressor.
+            Defaults to 42.
+        """
+        self.estimator = estimator
+        self.random_state = random_state
+
+    def _new_regressor(self) -> Any:
+        """Create the untrained regressor."""
+        if self.estimator == "sgd":
+            return SGDRegressor(random_state=self.random_state)
+        if self.estimator == "mlp":
+            return MLPRegressor(
+                hidden_layer_sizes=(32, 16), random_state=self.random_state
+            )
+        raise ValueError(f"Unknown incremental estimator: {self.estimator}")
+
+    def partial_fit_scaler(self, X: Array) -> "IncrementalRegressor":
+        """Update the scaler statistics with a block of features.
+
+        Args:
+            X (np.ndarray): A block of features.
+
+        Returns:
+            IncrementalRegressor: The regressor itself.
+        """
+        if not hasattr(self, "scaler_"):
+            self.scaler_ = StandardScaler()
+        self.scaler_.partial_fit(X)
+        return self
+
+    def partial_fit(self, X: Array, y: Array) -> "IncrementalRegressor":
+        """Learn from a block of scaled features.
+
+        Args:
+            X (np.ndarray): A block of features.
+            y (np.ndarray): The target of the block.
+
+        Returns:
+            IncrementalRegressor: The regressor itself.
+        """
+        if not hasattr(self, "regressor_"):
+            self.regressor_ = self._new_regressor()
+            self.n_rows_seen_ = 0
+        self.regressor_.partial_fit(self.scaler_.transform(X), y)
+        self.n_rows_seen_ += len(X)
+        return self
+
+    def predict(self, X: Array) -> Array:
+        """Predict the target of scaled features.
+
+        Args:
+            X (np.ndarray): The features.
+
+        Returns:
+            np.ndarray: The predictions.
+        """
+        return np.asarray(
+            self.regressor_.predict(self.scaler_.transform(X)),
+            dtype=np.float64,
+        )
+
+
+def iter_blocks(
+    X: Array,
+    y: Array,
+    block_rows: int,
+    rng: Optional[np.random.Generator] = None,
+) -> Iterator[Tuple[Array, Array]]:
+    """Yield row blocks of features and target copied into memory.
+
+    Args:
+        X (np.ndarray): The features, typically memory-mapped.
+        y (np.ndarray): The target.
+        block_rows (int): Rows per block.
+        rng (Optional[np.random.Generator], optional): Shuffles the block
+        order and the rows of every block when given. Defaults to None.
+
+    Yields:
+        Iterator[Tuple[np.ndarray, np.ndarray]]: The blocks.
+    """
+    starts = np.arange(0, len(X), block_rows)
+    if rng is not None:
+        starts = rng.permutation(starts)
+    for start in starts:
+        X_block = np.asarray(X[start : start + block_rows], dtype=np.float64)
+        y_block = np.asarray(y[start : start + block_rows], dtype=np.float64)
+        if rng is not None:
+            order = rng.permutation(len(X_block))
+            X_block, y_block = X_block[order], y_block[order]
+        yield X_block, y_block
+
+
+def fit_out_of_core(
+    model: IncrementalRegressor,
+    X: Array,
+    y: Array,
+    block_rows: int = 50_000,
+    epochs: int = 5,
+    random_state: int = 42,
+) -> IncrementalRegressor:
+    """Fit a regressor over row blocks of arrays that may not fit in memory.
+
+    A model that already has a scaler, such as a warm-started one, keeps
+    it: rescaling its inputs would invalidate what it learned.
+
+    Args:
+        model (IncrementalRegressor): The regressor, fitted or not.
+        X (np.ndarray): The features, typically memory-mapped.
+        y (np.ndarray): The target.
+        block_rows (int, optional): Rows held in memory at a time.
+        Defaults to 50_000.
+        epochs (int, optional): Passes over the data. Defaults to 5.
+        random_state (int, optional): Seed of the shuffles.
+        Defaults to 42.
+
+    Raises:
+        CustomException: If the model cannot be fitted.
+
+    Returns:
+        IncrementalRegressor: The fitted regressor.
+    """
+    try:
+        if not hasattr(model, "scaler_"):
+            for X_block, _ in iter_blocks(X, y, block_rows):
+                model.partial_fit_scaler(X_block)
+        rng = np.random.default_rng(random_state)
+        for epoch in range(epochs):
+            for X_block, y_block in iter_blocks(X, y, block_rows, rng):
+                model.partial_fit(X_block, y_block)
+            logger.info("Done epoch %s of %s", epoch + 1, epochs)
+        return model
+    except Exception as error:
+        raise CustomException(error, sys) from error
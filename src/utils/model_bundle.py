@@ -0,0 +1,434 @@
+"""
+Module for the versioned model bundle.
+
+A bundle is a directory holding everything needed to serve predictions:
+
+- `model.joblib`, the model dumped uncompressed, so the arrays it keeps
+  as numpy attributes (boosting predictors, linear and network weights)
+  are memory-mapped on load instead of read and copied. Scikit-learn
+  trees copy their node arrays into native buffers on load either way;
+- `manifest.json`, the bundle format, the preprocessor config and feature
+  list, training metadata, and the size and hash of every file together
+  with a content hash of the whole bundle.
+
+The preprocessor is stored as config rather than as a pickled
+`ColumnTransformer`, and served by a `Featurizer` that encodes a batch of
+passwords once and runs every feature on it, without pandas.
+
+Published bundles are versions under a root directory whose `CURRENT`
+file names the serving version. It is replaced atomically, and every
+serving process swaps to the version it names on its next prediction.
+"""
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+from src.utils.model_cache import model_cache
+from src.utils.string_column import PasswordColumn
+
+BUNDLE_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "model.joblib"
+CURRENT_FILE = "CURRENT"
+PROBE_PASSWORD = "Probe#Passw0rd"
+KEEP_VERSIONS = 3
+
+
+def preprocessor_config(transformer: Any) -> List[Dict[str, Any]]:
+    """Describe the transformers of a `ColumnTransformer` as config.
+
+    Args:
+        transformer (Any): The `ColumnTransformer`.
+
+    Returns:
+        List[Dict[str, Any]]: Name, class path, parameters and columns of
+        every transformer, in feature order.
+    """
+    return [
+        {
+            "name": name,
+            "class": f"{type(step).__module__}:{type(step).__qualname__}",
+            "params": step.get_params(),
+            "columns": list(columns),
+        }
+        for name, step, columns in transformer.transformers
+    ]
+
+
+class Featurizer:
+    """The features of a bundle, computed on raw passwords."""
+
+    def __init__(self, config: List[Dict[str, Any]]) -> None:
+        """Build the feature transformers from their config.
+
+        Args:
+            config (List[Dict[str, Any]]): The preprocessor config.
+        """
+        self.config = config
+        self.steps = []
+        for step in config:
+            module_name, class_name = step["class"].split(":")
+            step_class = getattr(
+                importlib.import_module(module_name), class_name
+            )
+            self.steps.append(step_class(**step["params"]))
+
+    @property
+    def feature_names(self) -> List[str]:
+        """The names of the features, in column order."""
+        return [step["name"] for step in self.config]
+
+    def transform(self, X: Any) -> np.ndarray[np.float64, Any]:
+        """Compute the features of a batch of passwords.
+
+        Args:
+            X (Any): The passwords, a password
+            column, or a data frame with a "password" column.
+
+        Returns:
+            np.ndarray: One row of features per password.
+        """
+        if not isinstance(X, PasswordColumn):
+            X = PasswordColumn.from_strings(
+                X["password"] if hasattr(X, "columns") else X
+            )
+        return np.hstack([step.transform(X) for step in self.steps])
+
+
+@dataclass
+class ModelBundle:
+    """A loaded model bundle."""
+
+    model: Any
+    featurizer: Featurizer
+    manifest: Dict[str, Any]
+    load_ms: float
+
+    def predict(self, X: Any) -> np.ndarray[np.float64, Any]:
+        """Predict the strength of a batch of passwords.
+
+        Args:
+            X (Any): The passwords, a password
+            column, or a data frame with a "password" column.
+
+        Returns:
+            np.ndarray: The predicted strengths.
+        """
+        predicted: np.ndarray[np.float64, Any] = self.model.predict(
+            self.featurizer.transform(X)
+        )
+        return predicted
+
+
+def _file_digest(file_path: str) -> str:
+    """Hash a file in blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _content_hash(manifest: Dict[str, Any]) -> str:
+    """Hash the manifest, which includes the hash of every file."""
+    content = {key: value for key, value in manifest.items() if key != "hash"}
+    return hashlib.blake2b(
+        json.dumps(content, sort_keys=True, default=str).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+def save_bundle(
+    directory: str,
+    model: Any,
+    transformer: Any,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Write a model bundle.
+
+    The bundle is written next to `directory` and moved into place once
+    complete, replacing any previous bundle there.
+
+    Args:
+        directory (str): The bundle directory.
+        model (Any): The fitted model.
+        transformer (Any): The fitted `ColumnTransformer`.
+        metadata (Optional[Dict[str, Any]], optional): Training metadata
+        such as the model name and score. Defaults to None.
+
+    Raises:
+        CustomException: If the bundle cannot be written.
+
+    Returns:
+        Dict[str, Any]: The manifest.
+    """
+    try:
+        staging = f"{directory}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        joblib.dump(model, os.path.join(staging, MODEL_FILE))
+
+        config = preprocessor_config(transformer)
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "created": time.time(),
+            "model_class": (
+                f"{type(model).__module__}:{type(model).__qualname__}"
+            ),
+            "features": [step["name"] for step in config],
+            "preprocessor": config,
+            "metadata": metadata or {},
+            "files": {
+                MODEL_FILE: {
+                    "size": os.path.getsize(os.path.join(staging, MODEL_FILE)),
+                    "hash": _file_digest(os.path.join(staging, MODEL_FILE)),
+                }
+            },
+        }
+        manifest["hash"] = _content_hash(manifest)
+        with open(
+            os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8"
+        ) as file:
+            json.dump(manifest, file, indent=2, default=str)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(staging, directory)
+        return manifest
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def load_bundle(
+    directory: str, mmap_mode: Optional[str] = "r", verify: bool = True
+) -> ModelBundle:
+    """Load and validate a model bundle.
+
+    The manifest, the recorded file sizes and the feature count of the
+    model are always checked, and a probe password must predict a finite
+    value. With `verify` the files are also hashed against the manifest,
+    which reads them whole.
+
+    Args:
+        directory (str): The bundle directory.
+        mmap_mode (Optional[str], optional): Memory-map mode of the model
+        arrays, None to read them into memory. Defaults to "r".
+        verify (bool, optional): Check the file hashes. Defaults to True.
+
+    Raises:
+        CustomException: If the bundle is missing, corrupt or invalid.
+
+    Returns:
+        ModelBundle: The model, featurizer, manifest and the cold-load
+        time in milliseconds.
+    """
+    try:
+        started = time.perf_counter()
+        with open(
+            os.path.join(directory, MANIFEST_FILE), encoding="utf-8"
+        ) as file:
+            manifest = json.load(file)
+        if manifest.get("format") != BUNDLE_FORMAT:
+            raise ValueError(
+                f"Unsupported bundle format {manifest.get('format')}"
+            )
+        if manifest.get("hash") != _content_hash(manifest):
+            raise ValueError(f"Manifest of {directory} was modified")
+        for file_name, recorded in manifest["files"].items():
+            file_path = os.path.join(directory, file_name)
+            if os.path.getsize(file_path) != recorded["size"]:
+                raise ValueError(f"Size of {file_path} does not match")
+            if verify and _file_digest(file_path) != recorded["hash"]:
+                raise ValueError(f"Hash of {file_path} does not match")
+
+        model = joblib.load(
+            os.path.join(directory, MODEL_FILE), mmap_mode=mmap_mode
+        )
+        featurizer = Featurizer(manifest["preprocessor"])
+        num_features = getattr(model, "n_features_in_", None)
+        if num_features not in (None, len(manifest["features"])):
+            raise ValueError(
+                f"Model expects {num_features} features, bundle has "
+                f"{len(manifest['features'])}"
+            )
+        bundle = ModelBundle(model, featurizer, manifest, 0.0)
+        if not np.all(np.isfinite(bundle.predict([PROBE_PASSWORD]))):
+            raise ValueError(f"Model of {directory} predicts non-finite")
+
+        bundle.load_ms = (time.perf_counter() - started) * 1000
+        logger.info("Loaded bundle %s in %.1f ms", directory, bundle.load_ms)
+        return bundle
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def current_bundle_dir(root: str) -> Optional[str]:
+    """Resolve the serving bundle under a root directory.
+
+    Args:
+        root (str): The root of the bundle versions.
+
+    Returns:
+        Optional[str]: The directory of the version `CURRENT` names, the
+        root itself if it holds an unversioned bundle, or None.
+    """
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding="utf-8") as file:
+            return os.path.join(root, file.read().strip())
+    except FileNotFoundError:
+        if os.path.exists(os.path.join(root, MANIFEST_FILE)):
+            return root
+        return None
+
+
+def publish_bundle(
+    root: str,
+    model: Any,
+    transformer: Any,
+    metadata: Optional[Dict[str, Any]] = None,
+    keep: int = KEEP_VERSIONS,
+    pinned: Sequence[str] = (),
+) -> Tuple[str, Dict[str, Any]]:
+    """Write a new bundle version and make it the serving one.
+
+    Versions are named by their UTC creation time in nanoseconds, so they
+    sort oldest first. Only the `keep` newest versions are kept, besides
+    the version being replaced and the pinned ones; a process still
+    serving a removed one keeps its loaded model until it swaps.
+
+    Args:
+        root (str): The root of the bundle versions.
+        model (Any): The fitted model.
+        transformer (Any): The fitted `ColumnTransformer`.
+        metadata (Optional[Dict[str, Any]], optional): Training metadata
+        such as the model name and score. Defaults to None.
+        keep (int, optional): Versions to keep. Defaults to KEEP_VERSIONS.
+        pinned (Sequence[str], optional): Versions never removed, such as
+        a shadow candidate. Defaults to ().
+
+    Raises:
+        CustomException: If the bundle cannot be written or published.
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: The version and its manifest.
+    """
+    try:
+        os.makedirs(root, exist_ok=True)
+        replaced = current_bundle_dir(root)
+        now = time.time_ns()
+        version = time.strftime("%Y%m%d-%H%M%S", time.gmtime(now // 10**9))
+        version = f"{version}-{now % 10**9:09d}"
+        manifest = save_bundle(
+            os.path.join(root, version),
+            model,
+            transformer,
+            metadata={**(metadata or {}), "version": version},
+        )
+
+        pointer = os.path.join(root, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(pointer, "w", encoding="utf-8") as file:
+            file.write(version)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(pointer, os.path.join(root, CURRENT_FILE))
+        logger.info("Published bundle version %s", version)
+
+        versions = sorted(
+            name
+            for name in os.listdir(root)
+            if os.path.exists(os.path.join(root, name, MANIFEST_FILE))
+        )
+        kept = {version, *pinned}
+        if replaced is not None:
+            kept.add(os.path.basename(replaced))
+        for name in versions[: max(len(versions) - keep, 0)]:
+            if name not in kept:
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+        return version, manifest
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+class LiveBundle:
+    """The serving bundle under a root, swapped when a new one is published.
+
+    The bundle is held in the process-wide model cache, keyed by the
+    `CURRENT` file, so every `get` costs one `stat`. One caller loads a
+    new version while the others keep getting the loaded one, so no
+    request waits for a swap, and a request holding a bundle finishes on
+    it. A version that fails to load is skipped.
+    """
+
+    def __init__(self, root: str) -> None:
+        """Initialize the live bundle.
+
+        Args:
+            root (str): The root of the bundle versions.
+        """
+        self.root = root
+
+    def _key(self) -> Optional[str]:
+        """The file whose changes swap the bundle, None without a bundle."""
+        for file_name in (CURRENT_FILE, MANIFEST_FILE):
+            path = os.path.join(self.root, file_name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _load(self) -> ModelBundle:
+        """Load the current bundle."""
+        directory = current_bundle_dir(self.root)
+        if directory is None:
+            raise ValueError(f"No bundle published under {self.root}")
+        bundle = load_bundle(directory, verify=False)
+        logger.info("Swapped to bundle %s", directory)
+        return bundle
+
+    @property
+    def bundle(self) -> Optional[ModelBundle]:
+        """The loaded bundle, without checking for a new one."""
+        key = self._key()
+        return model_cache().peek(key) if key is not None else None
+
+    def get(self) -> Optional[ModelBundle]:
+        """Get the serving bundle, loading it if a new one is current.
+
+        Raises:
+            CustomException: If no bundle was loaded yet and the current
+            one cannot be loaded.
+
+        Returns:
+            Optional[ModelBundle]: The bundle, None if none was published.
+        """
+        key = self._key()
+        if key is None:
+            return None
+        bundle: ModelBundle = model_cache().get(key, self._load)
+        return bundle
+
+
+_LIVE_BUNDLES: Dict[str, LiveBundle] = {}
+
+
+def live_bundle(root: str) -> LiveBundle:
+    """Get the live bundle of a root, shared by the whole process.
+
+    Args:
+        root (str): The root of the bundle versions.
+
+    Returns:
+        LiveBundle: The live bundle.
+    """
+    return _LIVE_BUNDLES.setdefault(
+        os.path.abspath(root), LiveBundle(os.path.abspath(root))
+    )
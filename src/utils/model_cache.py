@@ -0,0 +1,154 @@
+"""
+Module for the process-wide cache of loaded model artifacts.
+
+Every artifact is loaded once per process and the same object is returned
+until its file changes. A change is detected by the modification time,
+size and inode of the file, so both a file replaced by rename and one
+rewritten in place are reloaded. One caller reloads a changed artifact
+while the others keep getting the loaded one; an artifact that fails to
+load, such as a file caught mid-write, is skipped until it changes again.
+"""
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import joblib
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+
+Signature = Tuple[int, int, int]
+
+
+@dataclass
+class CachedArtifact:
+    """A loaded artifact and its load statistics."""
+
+    value: Any = None
+    signature: Optional[Signature] = None
+    failed: Optional[Signature] = None
+    loads: int = 0
+    hits: int = 0
+    last_load_ms: float = 0.0
+    total_load_ms: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelCache:
+    """Loaded model artifacts, reloaded when their file changes."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: Dict[str, CachedArtifact] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, path: str) -> CachedArtifact:
+        """Get the entry of a path, creating it on first use."""
+        with self._lock:
+            if path not in self._entries:
+                self._entries[path] = CachedArtifact()
+            return self._entries[path]
+
+    def get(
+        self, path: str, loader: Optional[Callable[[], Any]] = None
+    ) -> Any:
+        """Get a loaded artifact, loading it if its file changed.
+
+        Args:
+            path (str): The file of the artifact, whose changes trigger a
+            reload.
+            loader (Optional[Callable[[], Any]], optional): Loads the
+            artifact, `joblib.load(path)` when None. Defaults to None.
+
+        Raises:
+            CustomException: If the artifact was never loaded and cannot be.
+
+        Returns:
+            Any: The loaded artifact.
+        """
+        path = os.path.abspath(path)
+        entry = self._entry(path)
+        try:
+            stats = os.stat(path)
+            signature = (stats.st_mtime_ns, stats.st_size, stats.st_ino)
+        except FileNotFoundError as error:
+            if entry.signature is None:
+                raise CustomException(error, sys) from error
+            # Keep serving an artifact that is being replaced
+            signature = entry.signature
+        if signature in (entry.signature, entry.failed):
+            entry.hits += 1
+            return entry.value
+        # Only the first load waits, later reloads run in one caller
+        if not entry.lock.acquire(blocking=entry.signature is None):
+            entry.hits += 1
+            return entry.value
+        try:
+            if signature != entry.signature:
+                started = time.perf_counter()
+                value = loader() if loader else joblib.load(path)
+                load_ms = (time.perf_counter() - started) * 1000
+                entry.value, entry.signature = value, signature
+                entry.loads += 1
+                entry.last_load_ms = load_ms
+                entry.total_load_ms += load_ms
+                logger.info("Loaded %s in %.1f ms", path, load_ms)
+        except Exception as error:  # pylint: disable=broad-except
+            if entry.signature is None:
+                raise CustomException(error, sys) from error
+            entry.failed = signature
+            logger.error("Keeping the loaded %s: %s", path, error)
+        finally:
+            entry.lock.release()
+        return entry.value
+
+    def peek(self, path: str) -> Any:
+        """Get the loaded artifact of a path without checking its file.
+
+        Args:
+            path (str): The file of the artifact.
+
+        Returns:
+            Any: The loaded artifact, None if it was never loaded.
+        """
+        entry = self._entries.get(os.path.abspath(path))
+        return entry.value if entry is not None else None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Summarize the loads of every artifact.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The number of loads and cache hits
+            and the last and total load time in milliseconds, by path.
+        """
+        with self._lock:
+            entries = dict(self._entries)
+        return {
+            path: {
+                "loads": entry.loads,
+                "hits": entry.hits,
+                "last_load_ms": entry.last_load_ms,
+                "total_load_ms": entry.total_load_ms,
+            }
+            for path, entry in entries.items()
+        }
+
+    def clear(self) -> None:
+        """Forget every loaded artifact."""
+        with self._lock:
+            self._entries.clear()
+
+
+_MODEL_CACHE = ModelCache()
+
+
+def model_cache() -> ModelCache:
+    """Get the model cache shared by the whole process.
+
+    Returns:
+        ModelCache: The model cache.
+    """
+    return _MODEL_CACHE
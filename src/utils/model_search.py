@@ -0,0 +1,314 @@
+"""
+Module for budgeted hyperparameter search by successive halving.
+
+All candidates are cross-validated on a small sample first, and only the
+best `1 / factor` of them advance to a `factor` times larger sample, until
+the survivors are scored on the full data. Trials are cached on disk by
+dataset fingerprint and parameter grid, so a repeated search only runs the
+trials it has not finished before.
+"""
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import KFold, ParameterGrid, cross_val_score
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+
+Array = np.ndarray[np.float64, Any]
+
+
+def dataset_fingerprint(X: Array, y: Array, block_rows: int = 100_000) -> str:
+    """Hash the content of a feature matrix and its target.
+
+    The arrays are hashed in row blocks, so memory-mapped arrays are never
+    copied whole.
+
+    Args:
+        X (np.ndarray): The features.
+        y (np.ndarray): The target.
+        block_rows (int, optional): Rows hashed at a time.
+        Defaults to 100_000.
+
+    Returns:
+        str: A 32 character hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{X.shape}|{X.dtype}|{y.shape}|{y.dtype}".encode())
+    for start in range(0, len(X), block_rows):
+        digest.update(np.ascontiguousarray(X[start : start + block_rows]).data)
+        digest.update(np.ascontiguousarray(y[start : start + block_rows]).data)
+    return digest.hexdigest()
+
+
+def _trial_key(params: Dict[str, Any], n_samples: int) -> str:
+    """Build the cache key of one trial."""
+    return f"{json.dumps(params, sort_keys=True)}|{n_samples}"
+
+
+class TrialCache:
+    """Scores of finished trials and the refit estimator of a search."""
+
+    def __init__(self, cache_dir: str, search_key: str) -> None:
+        """Open or create the cache of one search.
+
+        Args:
+            cache_dir (str): Directory holding all search caches.
+            search_key (str): Identifier of the dataset, estimator, grid and
+            search settings.
+        """
+        self.trials_path = os.path.join(cache_dir, f"{search_key}.json")
+        self.estimator_path = os.path.join(cache_dir, f"{search_key}.joblib")
+        self.trials: Dict[str, float] = {}
+        if os.path.exists(self.trials_path):
+            with open(self.trials_path, encoding="utf-8") as file:
+                self.trials = json.load(file)
+
+    def get(self, params: Dict[str, Any], n_samples: int) -> Optional[float]:
+        """Get the score of a finished trial, if any."""
+        return self.trials.get(_trial_key(params, n_samples))
+
+    def put(
+        self, params: Dict[str, Any], n_samples: int, score: float
+    ) -> None:
+        """Record the score of a trial and persist the cache."""
+        self.trials[_trial_key(params, n_samples)] = score
+        os.makedirs(os.path.dirname(self.trials_path), exist_ok=True)
+        with open(f"{self.trials_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(self.trials, file, indent=2)
+        os.replace(f"{self.trials_path}.tmp", self.trials_path)
+
+    def load_estimator(self, params: Dict[str, Any]) -> Any:
+        """Load the refit estimator if it was fitted with these params."""
+        if not os.path.exists(self.estimator_path):
+            return None
+        cached = joblib.load(self.estimator_path)
+        return cached["estimator"] if cached["params"] == params else None
+
+    def save_estimator(self, params: Dict[str, Any], estimator: Any) -> None:
+        """Persist the refit estimator and its params."""
+        joblib.dump(
+            {"params": params, "estimator": estimator},
+            f"{self.estimator_path}.tmp",
+        )
+        os.replace(f"{self.estimator_path}.tmp", self.estimator_path)
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a successive halving search."""
+
+    best_params: Dict[str, Any]
+    best_score: float
+    best_estimator: Any
+    n_samples: int
+    trials_run: int = 0
+    trials_cached: int = 0
+    rungs: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _cross_val_score(
+    model: Any, X: Array, y: Array, folds: KFold, n_jobs: int
+) -> float:
+    """Score a candidate by cross-validation, -inf if its fits fail.
+
+    Args:
+        model (Any): The unfitted candidate.
+        X (np.ndarray): The training features.
+        y (np.ndarray): The training target.
+        folds (KFold): The cross-validation folds.
+        n_jobs (int): Folds fitted in parallel, -1 for all cores.
+
+    Returns:
+        float: The mean score of the folds.
+    """
+    try:
+        score = float(
+            cross_val_score(model, X, y, cv=folds, n_jobs=n_jobs).mean()
+        )
+    except ValueError as error:
+        # Raised when every fold fails to fit
+        logger.info("Candidate %s failed: %s", model, error)
+        return -math.inf
+    # Some folds failed and scored NaN
+    return score if math.isfinite(score) else -math.inf
+
+
+def successive_halving(
+    estimator: Any,
+    param_grid: Dict[str, List[Any]],
+    X: Array,
+    y: Array,
+    cv: int = 3,
+    factor: int = 3,
+    time_budget: float = 0.0,
+    cache_dir: Optional[str] = None,
+    random_state: int = 42,
+    n_jobs: int = -1,
+) -> SearchResult:
+    """Search a parameter grid by successive halving on sample size.
+
+    Rung `i` scores its candidates on the first `min_samples * factor**i`
+    rows of one fixed shuffle, so every rung's sample contains the smaller
+    ones and trial scores are reproducible. The first rung always runs in
+    full. Once `time_budget` seconds have passed no further trial starts,
+    and the best candidate of the largest sample scored so far wins. The
+    winner is refit once on all rows. Candidates whose fits fail rank last.
+
+    Args:
+        estimator (Any): The scikit-learn estimator to tune.
+        param_grid (Dict[str, List[Any]]): The parameter grid.
+        X (np.ndarray): The training features.
+        y (np.ndarray): The training target.
+        cv (int, optional): Cross-validation folds. Defaults to 3.
+        factor (int, optional): Candidate reduction and sample growth per
+        rung. Defaults to 3.
+        time_budget (float, optional): Wall-clock seconds for the trials,
+        0 for no limit. Defaults to 0.0.
+        cache_dir (Optional[str], optional): Directory of the trial cache,
+        no caching when None. Defaults to None.
+        random_state (int, optional): Seed of the shuffle and folds.
+        Defaults to 42.
+        n_jobs (int, optional): Folds fitted in parallel, -1 for all
+        cores. Defaults to -1.
+
+    Raises:
+        CustomException: If the search fails or every candidate of a rung
+        fails to fit.
+
+    Returns:
+        SearchResult: The best candidate, its refit estimator and the
+        trial counts.
+    """
+    try:
+        started = time.monotonic()
+        candidates = list(ParameterGrid(param_grid))
+        num_rungs = max(1, math.ceil(math.log(len(candidates), factor)) + 1)
+        min_samples = max(2 * cv, len(X) // factor ** (num_rungs - 1))
+        order = np.random.default_rng(random_state).permutation(len(X))
+        folds = KFold(cv, shuffle=True, random_state=random_state)
+
+        cache = None
+        if cache_dir is not None:
+            search_key = hashlib.blake2b(
+                json.dumps(
+                    [
+                        dataset_fingerprint(X, y),
+                        type(estimator).__qualname__,
+                        {
+                            name: value
+                            for name, value in estimator.get_params().items()
+                            if name not in param_grid
+                        },
+                        param_grid,
+                        cv,
+                        factor,
+                        random_state,
+                    ],
+                    sort_keys=True,
+                    default=str,
+                ).encode(),
+                digest_size=16,
+            ).hexdigest()
+            cache = TrialCache(cache_dir, search_key)
+
+        result = SearchResult({}, -np.inf, None, 0)
+        reserve: List[Dict[str, Any]] = []
+        for rung in range(num_rungs):
+            n_samples = min(len(X), min_samples * factor**rung)
+            if rung == num_rungs - 1:
+                n_samples = len(X)
+            if n_samples == len(X):
+                # Keep shared memory-mapped arrays shared on the last rung
+                X_rung, y_rung = X, y
+            else:
+                rows = np.sort(order[:n_samples])
+                X_rung, y_rung = X[rows], y[rows]
+
+            scores: List[Tuple[float, Dict[str, Any]]] = []
+            pending, out_of_budget = candidates, False
+            while pending:
+                for params in pending:
+                    elapsed = time.monotonic() - started
+                    out_of_budget = 0 < time_budget < elapsed
+                    if rung > 0 and out_of_budget:
+                        break
+                    score = cache.get(params, n_samples) if cache else None
+                    if score is None:
+                        score = _cross_val_score(
+                            clone(estimator).set_params(**params),
+                            X_rung,
+                            y_rung,
+                            folds,
+                            n_jobs,
+                        )
+                        result.trials_run += 1
+                        if cache:
+                            cache.put(params, n_samples, score)
+                    else:
+                        result.trials_cached += 1
+                    scores.append((score, params))
+                out_of_budget = out_of_budget and rung > 0
+                if out_of_budget or any(
+                    score > -math.inf for score, _ in scores
+                ):
+                    break
+                # Every candidate failed on this sample, try runners-up
+                pending = reserve[: len(candidates)]
+                reserve = reserve[len(candidates) :]
+
+            if not scores:
+                logger.info("Search budget spent before rung %s", rung)
+                break
+            scores.sort(key=lambda pair: pair[0], reverse=True)
+            if scores[0][0] == -math.inf:
+                if out_of_budget:
+                    logger.info("Search budget spent during rung %s", rung)
+                    break
+                raise ValueError(
+                    f"Every candidate failed to fit on {n_samples} rows"
+                )
+            result.best_score, result.best_params = scores[0]
+            result.n_samples = n_samples
+            result.rungs.append(
+                {"n_samples": n_samples, "candidates": len(scores)}
+            )
+            logger.info(
+                "Rung %s: %s candidates on %s rows, best %.4f",
+                rung,
+                len(scores),
+                n_samples,
+                result.best_score,
+            )
+            if out_of_budget:
+                logger.info("Search budget spent during rung %s", rung)
+                break
+            # Failed candidates are dropped, the others are runners-up
+            # ahead of those eliminated on smaller samples
+            ranked = [params for score, params in scores if score > -math.inf]
+            survivors = math.ceil(len(candidates) / factor)
+            candidates = ranked[:survivors]
+            reserve = ranked[survivors:] + reserve
+
+        best_estimator = (
+            cache.load_estimator(result.best_params) if cache else None
+        )
+        if best_estimator is None:
+            best_estimator = clone(estimator).set_params(**result.best_params)
+            best_estimator.fit(X, y)
+            if cache:
+                cache.save_estimator(result.best_params, best_estimator)
+        result.best_estimator = best_estimator
+        return result
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
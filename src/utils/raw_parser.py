@@ -0,0 +1,167 @@
+"""
+Module for parsing newline separated wordlists on several cores.
+
+The file is memory-mapped and split into byte ranges aligned to newline
+boundaries. Every range is parsed, validated and filtered in its own
+process, and the per-shard results are returned in original line order.
+"""
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+from src.utils.data_validation import valid_password_mask
+from src.utils.dataset_cache import ENCODING
+from src.utils.string_column import PasswordColumn
+
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+
+
+def split_byte_ranges(
+    file_path: str, num_shards: int
+) -> List[Tuple[int, int]]:
+    """Split a file into byte ranges that start at line boundaries.
+
+    Args:
+        file_path (str): The newline separated file.
+        num_shards (int): The desired number of ranges.
+
+    Raises:
+        CustomException: If the file cannot be read.
+
+    Returns:
+        List[Tuple[int, int]]: Non-empty `(start, end)` ranges covering the
+        whole file, in file order.
+    """
+    try:
+        size = os.path.getsize(file_path)
+        if size == 0:
+            return []
+        num_shards = max(1, min(num_shards, size))
+
+        boundaries = [0]
+        with open(file_path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            for shard in range(1, num_shards):
+                target = max(shard * size // num_shards, boundaries[-1])
+                newline = mapped.find(b"\n", target)
+                boundary = size if newline == -1 else newline + 1
+                if boundary >= size:
+                    break
+                if boundary > boundaries[-1]:
+                    boundaries.append(boundary)
+        boundaries.append(size)
+        return list(zip(boundaries, boundaries[1:]))
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def parse_byte_range(
+    file_path: str, start: int, end: int, validate: bool = True
+) -> PasswordColumn:
+    """Parse the lines of one byte range into a password column.
+
+    Carriage returns at line ends and empty lines are dropped. Splitting
+    and validation run on the raw bytes, so no Python string is created.
+
+    Args:
+        file_path (str): The newline separated file.
+        start (int): First byte of the range, at a line boundary.
+        end (int): Byte after the range, at a line boundary or file end.
+        validate (bool, optional): Keep only valid passwords.
+        Defaults to True.
+
+    Raises:
+        CustomException: If the range cannot be parsed.
+
+    Returns:
+        PasswordColumn: The passwords of the range in file order.
+    """
+    try:
+        with open(file_path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            data = np.frombuffer(mapped[start:end], dtype=np.uint8)
+
+        newlines = np.flatnonzero(data == NEWLINE)
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [len(data)]))
+        carriage = ends > starts
+        carriage[carriage] = data[ends[carriage] - 1] == CARRIAGE_RETURN
+        ends = ends - carriage
+        non_empty = ends > starts
+
+        lines = PasswordColumn.from_segments(
+            data, starts[non_empty], ends[non_empty], ENCODING
+        )
+        if validate:
+            return lines.take(np.flatnonzero(valid_password_mask(lines)))
+        return lines
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+
+def parse_raw_file(
+    file_path: str,
+    num_workers: Optional[int] = None,
+    num_shards: Optional[int] = None,
+    validate: bool = True,
+) -> List[PasswordColumn]:
+    """Parse a newline separated file in parallel byte range shards.
+
+    Args:
+        file_path (str): The newline separated file.
+        num_workers (Optional[int], optional): Worker processes, all cores
+        when None. Defaults to None.
+        num_shards (Optional[int], optional): Byte ranges to split into,
+        one per worker when None. Defaults to None.
+        validate (bool, optional): Keep only valid passwords.
+        Defaults to True.
+
+    Raises:
+        CustomException: If parsing fails.
+
+    Returns:
+        List[PasswordColumn]: The passwords of every shard, in file order.
+    """
+    try:
+        num_workers = num_workers or os.cpu_count() or 1
+        ranges = split_byte_ranges(file_path, num_shards or num_workers)
+        logger.info(
+            "Started parsing %s in %s shards on %s workers",
+            file_path,
+            len(ranges),
+            num_workers,
+        )
+        if num_workers == 1 or len(ranges) <= 1:
+            shards = [
+                parse_byte_range(file_path, start, end, validate)
+                for start, end in ranges
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=num_workers) as pool:
+                shards = list(
+                    pool.map(
+                        parse_byte_range,
+                        [file_path] * len(ranges),
+                        [start for start, _ in ranges],
+                        [end for _, end in ranges],
+                        [validate] * len(ranges),
+                    )
+                )
+        logger.info(
+            "Done parsing %s passwords", sum(len(shard) for shard in shards)
+        )
+        return shards
+
+    except Exception as error:
+        raise CustomException(error, sys) from error
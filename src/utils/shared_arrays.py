@@ -0,0 +1,99 @@
+"""
+Module for sharing training arrays with parallel worker processes.
+
+Joblib pickles an array that is backed by a memory-mapped file as its file
+name and offset, so loky workers attach to the same pages instead of
+receiving a copy each. Arrays are therefore written once to a memory-mapped
+file, preferably in shared memory (`/dev/shm`), before a parallel search.
+"""
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from numpy.typing import DTypeLike
+
+from src.middleware.exception import CustomException
+from src.middleware.logger import logger
+
+SHARED_MEMORY_DIR = "/dev/shm"
+
+
+def _pick_directory(nbytes: int) -> str:
+    """Pick shared memory if it can hold the arrays, else the temp dir.
+
+    Args:
+        nbytes (int): The total size of the arrays.
+
+    Returns:
+        str: The directory for the memory-mapped files.
+    """
+    if os.path.isdir(SHARED_MEMORY_DIR):
+        stats = os.statvfs(SHARED_MEMORY_DIR)
+        if stats.f_bavail * stats.f_frsize > 2 * nbytes:
+            return SHARED_MEMORY_DIR
+    return tempfile.gettempdir()
+
+
+@contextmanager
+def shared_arrays(
+    *arrays: np.ndarray[Any, Any],
+    directory: Optional[str] = None,
+    dtypes: Optional[Tuple[Optional[DTypeLike], ...]] = None,
+) -> Iterator[Tuple[np.ndarray[Any, Any], ...]]:
+    """Place arrays in memory-mapped files for zero-copy worker access.
+
+    Arrays that already are memory-mapped are passed through as is. The
+    files are removed on exit; views still held by then stay valid until
+    released.
+
+    Args:
+        *arrays (np.ndarray): The arrays to share.
+        directory (Optional[str], optional): Directory of the files.
+        Shared memory when it has room, else the temp dir, when None.
+        Defaults to None.
+        dtypes (Optional[Tuple[Optional[DTypeLike], ...]], optional):
+        Dtype of every shared array, None to keep an array's dtype.
+        Defaults to None.
+
+    Raises:
+        CustomException: If the arrays cannot be shared.
+
+    Yields:
+        Iterator[Tuple[np.ndarray, ...]]: Read-only memmaps of the arrays.
+    """
+    try:
+        dtypes = dtypes or (None,) * len(arrays)
+        nbytes = sum(
+            array.size * np.dtype(dtype or array.dtype).itemsize
+            for array, dtype in zip(arrays, dtypes)
+            if not isinstance(array, np.memmap)
+        )
+        created = tempfile.mkdtemp(
+            prefix="passwordometer-", dir=directory or _pick_directory(nbytes)
+        )
+    except Exception as error:
+        raise CustomException(error, sys) from error
+
+    try:
+        shared: List[np.ndarray[Any, Any]] = []
+        for position, (array, dtype) in enumerate(zip(arrays, dtypes)):
+            if isinstance(array, np.memmap):
+                shared.append(array)
+                continue
+            path = os.path.join(created, f"array-{position}.npy")
+            target = open_memmap(  # type: ignore[no-untyped-call]
+                path, mode="w+", dtype=dtype or array.dtype, shape=array.shape
+            )
+            target[:] = array
+            target.flush()
+            del target
+            shared.append(np.load(path, mmap_mode="r"))
+        logger.info("Shared %s bytes of arrays under %s", nbytes, created)
+        yield tuple(shared)
+    finally:
+        shutil.rmtree(created, ignore_errors=True)
@@ -0,0 +1,302 @@
+"""
+Module for a compact, Arrow-style column of passwords.
+
+All passwords live in one contiguous byte buffer, delimited by an int32
+offsets array with one more entry than there are passwords. Slicing a
+column shares both arrays, so stages can hand train/test views to each
+other without copying, and feature transformers can work on the raw bytes
+instead of boxed Python strings.
+"""
+import sys
+from typing import Any, Iterable, List, Sequence, Union, overload
+
+import numpy as np
+
+from src.middleware.exception import CustomException
+
+OFFSET_DTYPE = np.int32
+
+
+class PasswordColumn:
+    """Passwords stored as a byte buffer plus offsets.
+
+    Password `i` is `buffer[offsets[i]:offsets[i + 1]]`. The offsets of a
+    slice keep pointing into the shared buffer, so they need not start at 0.
+    """
+
+    def __init__(
+        self,
+        buffer: np.ndarray[np.uint8, Any],
+        offsets: np.ndarray[np.int32, Any],
+        encoding: str = "utf-8",
+    ) -> None:
+        """Wrap an existing buffer and its offsets without copying.
+
+        Args:
+            buffer (np.ndarray): The uint8 byte buffer.
+            offsets (np.ndarray): The int32 password boundaries.
+            encoding (str, optional): Encoding of the buffer.
+            Defaults to "utf-8".
+        """
+        self.buffer = buffer
+        self.offsets = offsets
+        self.encoding = encoding
+
+    @classmethod
+    def from_strings(
+        cls, passwords: Iterable[str], encoding: str = "utf-8"
+    ) -> "PasswordColumn":
+        """Build a column from Python strings.
+
+        Args:
+            passwords (Iterable[str]): The passwords.
+            encoding (str, optional): Encoding of the buffer.
+            Defaults to "utf-8".
+
+        Raises:
+            CustomException: If a password cannot be encoded or the buffer
+            outgrows int32 offsets.
+
+        Returns:
+            PasswordColumn: The new column.
+        """
+        try:
+            encoded = [
+                password.encode(encoding, "surrogateescape")
+                for password in passwords
+            ]
+            lengths = np.fromiter(
+                (len(value) for value in encoded),
+                dtype=np.int64,
+                count=len(encoded),
+            )
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            if offsets[-1] > np.iinfo(OFFSET_DTYPE).max:
+                raise ValueError("Buffer is too large for int32 offsets")
+            buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            return cls(buffer, offsets.astype(OFFSET_DTYPE), encoding)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    @classmethod
+    def from_segments(
+        cls,
+        buffer: np.ndarray[np.uint8, Any],
+        starts: np.ndarray[np.int64, Any],
+        ends: np.ndarray[np.int64, Any],
+        encoding: str = "utf-8",
+    ) -> "PasswordColumn":
+        """Gather arbitrary byte ranges of a buffer into a new column.
+
+        Args:
+            buffer (np.ndarray): The uint8 source buffer.
+            starts (np.ndarray): First byte of every password.
+            ends (np.ndarray): Byte after every password.
+            encoding (str, optional): Encoding of the buffer.
+            Defaults to "utf-8".
+
+        Raises:
+            CustomException: If a range is out of bounds or the buffer
+            outgrows int32 offsets.
+
+        Returns:
+            PasswordColumn: The compacted column.
+        """
+        try:
+            starts = np.asarray(starts, dtype=np.int64)
+            lengths = np.asarray(ends, dtype=np.int64) - starts
+            offsets = np.zeros(len(starts) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            if offsets[-1] > np.iinfo(OFFSET_DTYPE).max:
+                raise ValueError("Buffer is too large for int32 offsets")
+
+            # Source position of every output byte: start of its password
+            # plus its distance from the start of its output slot.
+            slots = np.repeat(starts - offsets[:-1], lengths)
+            positions = slots + np.arange(offsets[-1], dtype=np.int64)
+            return cls(
+                buffer[positions], offsets.astype(OFFSET_DTYPE), encoding
+            )
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    @classmethod
+    def concat(cls, columns: Sequence["PasswordColumn"]) -> "PasswordColumn":
+        """Concatenate columns into one new column.
+
+        Args:
+            columns (Sequence[PasswordColumn]): Columns of the same encoding.
+
+        Raises:
+            CustomException: If the encodings differ or the buffer outgrows
+            int32 offsets.
+
+        Returns:
+            PasswordColumn: The concatenated column.
+        """
+        try:
+            if not columns:
+                return cls.from_strings([])
+            encoding = columns[0].encoding
+            if any(column.encoding != encoding for column in columns):
+                raise ValueError("Cannot concat columns of other encodings")
+
+            lengths = np.concatenate(
+                [column.lengths() for column in columns]
+            ).astype(np.int64)
+            offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            if offsets[-1] > np.iinfo(OFFSET_DTYPE).max:
+                raise ValueError("Buffer is too large for int32 offsets")
+            buffer = np.concatenate([column.data for column in columns])
+            return cls(buffer, offsets.astype(OFFSET_DTYPE), encoding)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def __len__(self) -> int:
+        """Get the number of passwords."""
+        return max(len(self.offsets) - 1, 0)
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "PasswordColumn":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        """Get one password, or a zero-copy view of a contiguous range.
+
+        Args:
+            index (Union[int, slice]): A position or a step-less slice.
+
+        Raises:
+            ValueError: If the slice has a step.
+
+        Returns:
+            Any: The password as str, or a PasswordColumn view.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Use take() for strided selections")
+            stop = max(start, stop)
+            return PasswordColumn(
+                self.buffer, self.offsets[start : stop + 1], self.encoding
+            )
+        position = range(len(self))[index]
+        start, stop = self.offsets[position], self.offsets[position + 1]
+        return bytes(self.buffer[start:stop]).decode(
+            self.encoding, "surrogateescape"
+        )
+
+    @property
+    def data(self) -> np.ndarray[np.uint8, Any]:
+        """The bytes of the passwords of this column, without copying."""
+        if len(self.offsets) == 0:
+            return self.buffer[:0]
+        return self.buffer[self.offsets[0] : self.offsets[-1]]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the passwords and offsets of this column."""
+        return int(self.data.nbytes + self.offsets.nbytes)
+
+    def is_ascii(self) -> bool:
+        """Check whether every password is plain ASCII.
+
+        Returns:
+            bool: True if byte positions equal character positions.
+        """
+        data = self.data
+        return bool(len(data) == 0 or data.max() < 0x80)
+
+    def lengths(self) -> np.ndarray[np.int32, Any]:
+        """Get the byte length of every password.
+
+        Returns:
+            np.ndarray: The int32 lengths.
+        """
+        return np.diff(self.offsets).astype(OFFSET_DTYPE)
+
+    def take(
+        self, indices: Union[Sequence[int], np.ndarray[np.int64, Any]]
+    ) -> "PasswordColumn":
+        """Gather passwords into a new, compacted column.
+
+        Args:
+            indices (Union[Sequence[int], np.ndarray]): Positions to
+            gather, in output order.
+
+        Raises:
+            CustomException: If an index is out of range.
+
+        Returns:
+            PasswordColumn: The gathered column.
+        """
+        try:
+            positions = np.asarray(indices, dtype=np.int64)
+            starts = self.offsets[:-1][positions]
+            ends = self.offsets[1:][positions]
+            return self.from_segments(self.buffer, starts, ends, self.encoding)
+        except Exception as error:
+            raise CustomException(error, sys) from error
+
+    def count_bytes(
+        self, table: np.ndarray[np.bool_, Any]
+    ) -> np.ndarray[np.int64, Any]:
+        """Count, per password, the bytes selected by a lookup table.
+
+        Args:
+            table (np.ndarray): 256 booleans, True for the bytes to count.
+
+        Returns:
+            np.ndarray: The int64 count of every password.
+        """
+        return self.segment_sums(table[self.data])
+
+    def segment_sums(
+        self,
+        values: np.ndarray[np.int64, Any],
+        skip_first: int = 0,
+        skip_last: int = 0,
+    ) -> np.ndarray[np.int64, Any]:
+        """Sum per-byte values over every password.
+
+        Args:
+            values (np.ndarray): One value per byte of `data`.
+            skip_first (int, optional): Leading bytes of every password to
+            leave out. Defaults to 0.
+            skip_last (int, optional): Trailing bytes of every password to
+            leave out. Defaults to 0.
+
+        Returns:
+            np.ndarray: The int64 sum of every password.
+        """
+        cumulative = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(values, out=cumulative[1:])
+        starts = (self.offsets[:-1] - self.offsets[0]).astype(np.int64)
+        ends = (self.offsets[1:] - self.offsets[0]).astype(np.int64)
+        starts = np.minimum(starts + skip_first, ends)
+        ends = np.maximum(ends - skip_last, starts)
+        sums: np.ndarray[np.int64, Any] = cumulative[ends] - cumulative[starts]
+        return sums
+
+    def to_list(self) -> List[str]:
+        """Decode the passwords into Python strings.
+
+        Returns:
+            List[str]: The passwords.
+        """
+        data = bytes(self.data)
+        ends = (self.offsets - self.offsets[0]).tolist() if len(self) else []
+        return [
+            data[start:end].decode(self.encoding, "surrogateescape")
+            for start, end in zip(ends, ends[1:])
+        ]
+
+    def __repr__(self) -> str:
+        """Describe the column."""
+        return f"PasswordColumn(rows={len(self)}, nbytes={self.nbytes})"